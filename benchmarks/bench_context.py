@@ -0,0 +1,109 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+# Per-node cost of a Context node: the dict rebuild the Context modules did
+# before (two Python walks over the field table plus a get per output) versus
+# core.context new_context/context_return_tuple. Each node in a chain either
+# passes its parent through or overrides one field, and returns its outputs.
+#
+#   python benchmarks/bench_context.py
+#   python benchmarks/bench_context.py --fields 60 --depth 20
+
+import argparse
+import importlib
+import sys
+import time
+import types
+
+from pathlib import Path
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "core"
+
+
+def load_context():
+    # core/__init__.py needs the full ComfyUI runtime; context doesn't
+    package = types.ModuleType("rvtools_core")
+    package.__path__ = [str(CORE_DIR)]
+    sys.modules["rvtools_core"] = package
+    return importlib.import_module("rvtools_core.context")
+
+
+def old_node(table):
+    # new_context + get_context_return_tuple as the Context modules had them
+
+    def new_context(pipe=None, **kwargs):
+        if isinstance(pipe, tuple):
+            context = pipe[0] if pipe else {}
+        elif isinstance(pipe, dict):
+            context = pipe
+        else:
+            context = {}
+        new_ctx = {}
+        for key in table:
+            if key == "pipe":
+                continue
+            if key in context:
+                new_ctx[key] = context[key]
+        for key in table:
+            if key == "pipe":
+                continue
+            v = kwargs.get(key, None)
+            if v is not None:
+                new_ctx[key] = v
+        return new_ctx
+
+    def get_context_return_tuple(ctx):
+        tup_list = [ctx]
+        for key in table.keys():
+            if key == "pipe":
+                continue
+            tup_list.append(ctx.get(key, None))
+        return tuple(tup_list)
+
+    def node(pipe, **kwargs):
+        return get_context_return_tuple(new_context(pipe, **kwargs))
+    return node
+
+
+def new_node(table, context):
+    fields = context.context_fields(table)
+
+    def node(pipe, **kwargs):
+        return context.context_return_tuple(context.new_context(pipe, fields, kwargs), fields)
+    return node
+
+
+def measure(name: str, node, first, overrides, depth: int, repeat: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = node(None, **first)
+        for _ in range(depth):
+            out = node(out[0], **overrides)
+    elapsed = time.perf_counter() - start
+    per_node = elapsed / (repeat * (depth + 1)) * 1e6
+    print(f"{name:<28} {per_node:8.2f} us/node")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fields", type=int, default=40)
+    parser.add_argument("--depth", type=int, default=10, help="Context nodes chained after the first one")
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    context = load_context()
+    table = {"pipe": None}
+    table.update((f"field_{i:02d}", None) for i in range(args.fields))
+    first = {key: object() for key in table if key != "pipe"}
+    nodes = (("before", old_node(table)), ("after", new_node(table, context)))
+
+    print(f"{args.fields} fields, chain of {args.depth + 1} nodes, {args.repeat} passes")
+    for case, overrides in (("pass-through", {}), ("one override", {"field_00": object()})):
+        for name, node in nodes:
+            measure(f"{name}: {case}", node, first, overrides, args.depth, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
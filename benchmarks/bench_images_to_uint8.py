@@ -0,0 +1,95 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+# IMAGE batch -> uint8 frames: the per-image loop the image nodes used before
+# (np.clip(255. * image.cpu().numpy(), 0, 255).astype(np.uint8)) versus
+# core.image_utils.images_to_uint8 on the whole batch. Each method runs in its
+# own process so the reported peak RSS growth is not shared between them.
+#
+#   python benchmarks/bench_images_to_uint8.py
+#   python benchmarks/bench_images_to_uint8.py --frames 16 --height 2160 --width 3840 --device cuda
+
+import argparse
+import importlib
+import json
+import resource
+import subprocess
+import sys
+import time
+import types
+
+from pathlib import Path
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "core"
+METHODS = ("per-image loop", "images_to_uint8")
+
+
+def load_image_utils():
+    # core/__init__.py needs the full ComfyUI runtime; image_utils doesn't
+    package = types.ModuleType("rvtools_core")
+    package.__path__ = [str(CORE_DIR)]
+    sys.modules["rvtools_core"] = package
+    return importlib.import_module("rvtools_core.image_utils")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(args) -> None:
+    import numpy as np
+    import torch
+
+    images_to_uint8 = load_image_utils().images_to_uint8
+    images = torch.rand(args.frames, args.height, args.width, 3, device=args.device)
+
+    if args.child == METHODS[0]:
+        def convert():
+            return [np.clip(255. * image.cpu().numpy(), 0, 255).astype(np.uint8) for image in images]
+    else:
+        def convert():
+            return list(images_to_uint8(images))
+
+    base = peak_rss_mb()
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        frames = convert()
+        if args.device != "cpu":
+            torch.cuda.synchronize()
+        times.append(time.perf_counter() - start)
+        del frames
+    print(json.dumps({"ms": min(times) * 1000, "peak_mb": peak_rss_mb() - base}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=8)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--child", choices=METHODS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+        return
+
+    batch_mb = args.frames * args.height * args.width * 3 * 4 / (1024 * 1024)
+    print(f"{args.frames} x {args.width}x{args.height} float32 batch ({batch_mb:.0f} MB) on {args.device}, best of {args.repeat}")
+    for method in METHODS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", method] + sys.argv[1:],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(f"{method:<16} {result['ms']:9.1f} ms {result['ms'] / args.frames:8.1f} ms/frame  "
+              f"peak RSS +{result['peak_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+# Model list cost of one /object_info pass over the eight Checkpoint Loader
+# classes: folder_paths.get_filename_list per input (before) versus
+# core.model_index (after). Reports time and os.stat calls per pass, the
+# latter being what hurts on network-mounted model folders.
+#
+# Run from the ComfyUI root so folder_paths is importable:
+#   python custom_nodes/ComfyUI-RvTools-X/benchmarks/bench_model_lists.py
+#   python custom_nodes/ComfyUI-RvTools-X/benchmarks/bench_model_lists.py --synthetic 2000
+# --synthetic N benchmarks a temporary tree with N files per folder type
+# instead of the configured model folders.
+
+import argparse
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+from pathlib import Path
+
+import folder_paths
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "core"
+
+# Folder type of every list input, per loader class, as INPUT_TYPES read them
+# before the index (one get_filename_list call per input).
+SMALL = ("checkpoints", "vae")
+V3 = ("checkpoints", "diffusion_models", "clip", "clip", "clip", "vae")
+V4 = ("checkpoints", "diffusion_models", "clip", "clip", "clip", "clip", "vae")
+LOADERS = (SMALL, SMALL, SMALL, SMALL, V3, V3, V4, V4)
+FOLDER_TYPES = ("checkpoints", "diffusion_models", "clip", "vae")
+
+
+def load_model_index():
+    # core/__init__.py needs the full ComfyUI runtime; model_index doesn't
+    package = types.ModuleType("rvtools_core")
+    package.__path__ = [str(CORE_DIR)]
+    sys.modules["rvtools_core"] = package
+    return importlib.import_module("rvtools_core.model_index")
+
+
+def build_synthetic(root: str, files: int) -> None:
+    for folder_type in FOLDER_TYPES:
+        base = os.path.join(root, folder_type)
+        for i in range(files):
+            sub = os.path.join(base, f"family_{i % 20:02d}", f"set_{i % 7}")
+            os.makedirs(sub, exist_ok=True)
+            open(os.path.join(sub, f"model_{i:05d}.safetensors"), "wb").close()
+        folder_paths.folder_names_and_paths[folder_type] = ([base], {".safetensors"})
+    folder_paths.filename_list_cache.clear()
+
+
+class StatCounter:
+    def __init__(self):
+        self.calls = 0
+        self._stat = os.stat
+
+    def __enter__(self):
+        def counting_stat(*args, **kwargs):
+            self.calls += 1
+            return self._stat(*args, **kwargs)
+        os.stat = counting_stat
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._stat
+
+
+def measure(name: str, one_pass, passes: int) -> None:
+    one_pass()  # warm up: first listing of every folder
+    with StatCounter() as stats:
+        start = time.perf_counter()
+        for _ in range(passes):
+            one_pass()
+        elapsed = time.perf_counter() - start
+    print(f"{name:<34} {elapsed / passes * 1000:9.3f} ms/pass {stats.calls / passes:9.1f} stat/pass")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--passes", type=int, default=50)
+    parser.add_argument("--synthetic", type=int, default=0, metavar="FILES")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.synthetic:
+        tmp = tempfile.mkdtemp(prefix="rvtools-bench-")
+        build_synthetic(tmp, args.synthetic)
+    model_index = load_model_index()
+    index = model_index.model_file_index
+
+    def before():
+        for loader in LOADERS:
+            for folder_type in loader:
+                folder_paths.get_filename_list(folder_type)
+
+    def after():
+        for loader in LOADERS:
+            for folder_type in dict.fromkeys(loader):
+                index.filenames(folder_type)
+
+    try:
+        for folder_type in FOLDER_TYPES:
+            print(f"{folder_type}: {len(folder_paths.get_filename_list(folder_type))} files")
+        measure("before: get_filename_list", before, args.passes)
+        interval = model_index.VALIDATE_INTERVAL
+        model_index.VALIDATE_INTERVAL = 0.0
+        measure("after: index, revalidated per call", after, args.passes)
+        model_index.VALIDATE_INTERVAL = interval
+        measure(f"after: index, {interval:g}s validate interval", after, args.passes)
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+# A1111 "parameters" parsing: the per-field str.find extraction the image
+# loaders used before (handle_comfyui plus the prompt/negative split in
+# Load Image) versus core.metadata_parsers.handle_comfyui, which is built on
+# the single-pass parse_parameters. Reports time per parse and the number of
+# typed fields each side recovers from a small corpus of parameter strings.
+#
+# Run from the ComfyUI root so comfy is importable (core.common needs it):
+#   python custom_nodes/ComfyUI-RvTools-X/benchmarks/bench_parameters.py
+#   python custom_nodes/ComfyUI-RvTools-X/benchmarks/bench_parameters.py --repeat 20000
+
+import argparse
+import importlib
+import json
+import sys
+import time
+import types
+
+from pathlib import Path
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "core"
+FIELDS = ("steps", "sampler", "scheduler", "cfg_scale", "seed", "width_param", "height_param", "model_hashes", "version")
+
+CORPUS = (
+    # Save Images with hashes and a negative prompt
+    "masterpiece, best quality, a lighthouse on a cliff at dusk, dramatic sky, <lora:film_grain:0.6>\n"
+    "Negative prompt: lowres, blurry, watermark, text\n"
+    "Steps: 30, Sampler: dpmpp_2m karras, CFG scale: 6.5, Seed: 1234567890, Size: 1024x1024, "
+    "Model hash: 31e35c80fc, Model: sd_xl_base_1.0, "
+    "Hashes: {\"model\": \"31e35c80fc\", \"Model:sd_xl_base_1.0\": \"31e35c80fc\", \"lora:film_grain\": \"8a2f1c3d4e\"}, "
+    "Version: ComfyUI",
+    # A1111 without a negative prompt, quoted Lora hashes
+    "portrait of an old fisherman, weathered skin, 85mm, shallow depth of field\n"
+    "Steps: 25, Sampler: DPM++ 2M, Schedule type: Karras, CFG scale: 7, Seed: 42, Size: 832x1216, "
+    "Model hash: 6ce0161689, Model: v1-5-pruned-emaonly, Lora hashes: \"detail: 1a2b3c4d5e6f, style: 0f9e8d7c6b5a\", "
+    "Version: v1.10.1",
+    # Short prompt, sampler with a scheduler suffix, no hashes
+    "a cat\n"
+    "Negative prompt: dog\n"
+    "Steps: 20, Sampler: euler_ancestral normal, CFG scale: 8.0, Seed: 7, Size: 512x768",
+    # Long multi-line prompt
+    "\n".join(f"line {i}: intricate details, volumetric lighting, cinematic composition" for i in range(12)) + "\n"
+    "Negative prompt: " + ", ".join(f"bad_{i}" for i in range(40)) + "\n"
+    "Steps: 40, Sampler: dpmpp_sde exponential, CFG scale: 4.5, Seed: 98765, Size: 1344x768, Version: ComfyUI",
+)
+
+
+def load_metadata_parsers():
+    # core/__init__.py needs the full ComfyUI runtime; only comfy is needed here
+    package = types.ModuleType("rvtools_core")
+    package.__path__ = [str(CORE_DIR)]
+    sys.modules["rvtools_core"] = package
+    return importlib.import_module("rvtools_core.metadata_parsers")
+
+
+def old_handle_comfyui(params, schedulers):
+    # The loaders' parser before core.metadata_parsers, trimmed to the
+    # "parameters" handling (workflow and lora_weights are unchanged)
+    gen_data = {"parameters": params["parameters"]}
+    params_str = gen_data["parameters"]
+    if "Steps:" in params_str:
+        try:
+            if "Steps: " in params_str:
+                steps_start = params_str.find("Steps: ") + 7
+                steps_end = params_str.find(",", steps_start)
+                if steps_end == -1:
+                    steps_end = params_str.find("\n", steps_start)
+                gen_data["steps"] = int(params_str[steps_start:steps_end].strip())
+
+            if "Sampler: " in params_str:
+                sampler_start = params_str.find("Sampler: ") + 9
+                sampler_end = params_str.find(",", sampler_start)
+                if sampler_end == -1:
+                    sampler_end = params_str.find("\n", sampler_start)
+                gen_data["sampler"] = params_str[sampler_start:sampler_end].strip()
+
+            if "sampler" in gen_data and gen_data["sampler"]:
+                sampler_full = gen_data["sampler"]
+                for sched in schedulers:
+                    if sampler_full.lower().endswith(' ' + sched.lower()):
+                        sched_start = sampler_full.lower().rfind(' ' + sched.lower())
+                        if sched_start >= 0:
+                            gen_data["sampler"] = sampler_full[:sched_start].strip()
+                            gen_data["scheduler"] = sampler_full[sched_start + 1:]
+                            break
+                    elif sampler_full.lower().endswith(sched.lower()):
+                        sched_start = sampler_full.lower().rfind(sched.lower())
+                        if sched_start >= 0:
+                            gen_data["sampler"] = sampler_full[:sched_start].strip()
+                            gen_data["scheduler"] = sampler_full[sched_start:]
+                            break
+
+            if "CFG scale: " in params_str:
+                cfg_start = params_str.find("CFG scale: ") + 11
+                cfg_end = params_str.find(",", cfg_start)
+                if cfg_end == -1:
+                    cfg_end = params_str.find("\n", cfg_start)
+                gen_data["cfg_scale"] = float(params_str[cfg_start:cfg_end].strip())
+
+            if "Seed: " in params_str:
+                seed_start = params_str.find("Seed: ") + 6
+                seed_end = params_str.find(",", seed_start)
+                if seed_end == -1:
+                    seed_end = params_str.find("\n", seed_start)
+                gen_data["seed"] = int(params_str[seed_start:seed_end].strip())
+
+            if "Size: " in params_str:
+                size_start = params_str.find("Size: ") + 6
+                size_end = params_str.find(",", size_start)
+                if size_end == -1:
+                    size_end = params_str.find("\n", size_start)
+                size_str = params_str[size_start:size_end].strip()
+                if "x" in size_str:
+                    width, height = size_str.split("x")
+                    gen_data["width_param"] = int(width.strip())
+                    gen_data["height_param"] = int(height.strip())
+
+            if "Hashes: " in params_str:
+                hashes_start = params_str.find("Hashes: ") + 8
+                hashes_end = params_str.find("}", hashes_start) + 1
+                if hashes_end > hashes_start:
+                    hashes_str = params_str[hashes_start:hashes_end]
+                    try:
+                        gen_data["model_hashes"] = json.loads(hashes_str)
+                    except ValueError:
+                        gen_data["model_hashes"] = hashes_str
+
+            if "Version: " in params_str:
+                version_start = params_str.find("Version: ") + 9
+                version_end = params_str.find("\n", version_start)
+                if version_end == -1:
+                    version_end = len(params_str)
+                gen_data["version"] = params_str[version_start:version_end].strip()
+        except Exception:
+            pass
+
+    # Prompt split done by Load Image after handle_comfyui
+    if "Negative prompt:" in params_str:
+        parts = params_str.split("Negative prompt:")
+        gen_data["prompt"] = parts[0].strip()
+        neg_part = parts[1]
+        gen_data["negative"] = neg_part.split("Steps:")[0].strip() if "Steps:" in neg_part else neg_part.strip()
+    elif "Steps:" in params_str:
+        gen_data["prompt"] = params_str.split("Steps:")[0].strip()
+    else:
+        gen_data["prompt"] = params_str.strip()
+    return gen_data
+
+
+def measure(name: str, parse, infos, repeat: int) -> None:
+    fields = sum(sum(1 for f in FIELDS if f in parse(info)) for info in infos)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for info in infos:
+            parse(info)
+    elapsed = time.perf_counter() - start
+    per_parse = elapsed / (repeat * len(infos)) * 1e6
+    print(f"{name:<34} {per_parse:8.2f} us/parse {fields:4d} fields")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    parsers = load_metadata_parsers()
+    schedulers = parsers.SCHEDULERS_ANY
+    infos = [{"parameters": params} for params in CORPUS]
+
+    print(f"{len(infos)} parameter strings, {args.repeat} passes, {len(FIELDS)} typed fields each at most")
+    measure("before: str.find per field", lambda info: old_handle_comfyui(info, schedulers), infos, args.repeat)
+    measure("after: parse_parameters", parsers.handle_comfyui, infos, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
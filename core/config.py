@@ -10,4 +10,23 @@ import logging
 CONFIG = {
     "loglevel": int(os.environ.get("RVTOOLSX_LOGLEVEL", logging.INFO)),
     "indent": int(os.environ.get("RVTOOLSX_INDENT", 2)),
+    # Opt-in background hashing of model folders at startup (RVTOOLSX_PREHASH=1)
+    "prehash": os.environ.get("RVTOOLSX_PREHASH", "0").lower() in ("1", "true", "yes", "on"),
+    "prehash_workers": int(os.environ.get("RVTOOLSX_PREHASH_WORKERS", 4)),
+    # Let the pre-hasher write .sha256 sidecars next to the model files
+    "prehash_sidecars": os.environ.get("RVTOOLSX_PREHASH_SIDECARS", "0").lower() in ("1", "true", "yes", "on"),
+    # Opt-in RAM budget for decoded video frames reused across Combine/Join runs (0 disables)
+    "video_cache_mb": int(os.environ.get("RVTOOLSX_VIDEO_CACHE_MB", 0)),
+    # Image loader IS_CHANGED fingerprint: "full" file hash or "partial" head/middle/tail hash
+    "fingerprint_mode": os.environ.get("RVTOOLSX_FINGERPRINT", "full").lower(),
+    # Disk budget for images downloaded by the path loaders (0 disables the cache)
+    "http_cache_mb": int(os.environ.get("RVTOOLSX_HTTP_CACHE_MB", 512)),
+    # Loaded MODEL/CLIP/VAE kept for reuse by the checkpoint loaders after their
+    # last user is gone (0 only shares components that are still in use)
+    "model_cache_mb": int(os.environ.get("RVTOOLSX_MODEL_CACHE_MB", 0)),
+    # Combined size of model files the loaders may read at once in parallel_load
+    # mode (0 uses the currently available RAM)
+    "parallel_load_mb": int(os.environ.get("RVTOOLSX_PARALLEL_LOAD_MB", 0)),
+    # Decoded pixels Load Images from Directory may hold for its prefetch
+    "prefetch_mb": int(os.environ.get("RVTOOLSX_PREFETCH_MB", 1024)),
 }
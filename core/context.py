@@ -0,0 +1,79 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+from typing import Any, Dict, Optional, Tuple
+
+# Shared pipe representation for the Context nodes.
+#
+# A Context is a read-only dict, so everything downstream that checks
+# isinstance(pipe, dict) or calls pipe.get()/items() keeps working. Because
+# nobody can change it in place, a node that receives a context and has no
+# inputs connected hands the very same object on instead of copying it, and a
+# node with overrides makes one C-level dict copy of its parent plus the
+# changed keys, rather than re-walking the whole field table in Python.
+
+
+class Context(dict):
+    # Read-only context dict. `fields` is the owning node's key table (shared
+    # tuple), used to tell whether a parent already holds only known keys.
+
+    __slots__ = ("fields",)
+
+    def __init__(self, data=(), fields: Tuple[str, ...] = ()):
+        dict.__init__(self, data)
+        self.fields = fields
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Context pipes are read-only, build a new one with new_context()")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> Dict[str, Any]:
+        # Plain mutable copy for callers that want to edit the values
+        return dict(self)
+
+    def __copy__(self) -> "Context":
+        return self
+
+    def __deepcopy__(self, memo) -> "Context":
+        import copy
+        return Context({k: copy.deepcopy(v, memo) for k, v in self.items()}, self.fields)
+
+    def __reduce__(self):
+        return (Context, (dict(self), self.fields))
+
+
+def context_fields(table: Dict[str, Any]) -> Tuple[str, ...]:
+    # Key order of a node's context table, without the "pipe" entry
+    return tuple(key for key in table if key != "pipe")
+
+
+def new_context(pipe: Any, fields: Tuple[str, ...], overrides: Dict[str, Any]) -> Context:
+    # Build the context for a node from its pipe input (dict, or the tuple
+    # returned by context_return_tuple) and its connected inputs. Only keys
+    # listed in fields are kept; None overrides are ignored.
+    if isinstance(pipe, tuple):
+        pipe = pipe[0] if pipe else None
+    changes = {key: v for key, v in overrides.items() if v is not None and key in fields}
+
+    if isinstance(pipe, Context) and pipe.fields == fields:
+        if not changes:
+            return pipe
+        ctx = Context(pipe, fields)
+    elif isinstance(pipe, dict):
+        ctx = Context({key: pipe[key] for key in fields if key in pipe}, fields)
+    else:
+        ctx = Context((), fields)
+    if changes:
+        dict.update(ctx, changes)
+    return ctx
+
+
+def context_return_tuple(ctx: Optional[Dict[str, Any]], fields: Tuple[str, ...]) -> tuple:
+    # (ctx, value for each field, ...) in field order
+    if not ctx:
+        return (ctx,) + (None,) * len(fields)
+    return (ctx,) + tuple(map(ctx.get, fields))
@@ -0,0 +1,97 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import hashlib
+import os
+import threading
+
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from .config import CONFIG
+
+# Content fingerprints for IS_CHANGED of the file loader nodes.
+#
+# A fingerprint is cached per path together with the file's (size, mtime_ns)
+# and only recomputed when that stat changes, so an unchanged input costs one
+# os.stat per queue instead of reading and hashing the whole file.
+#
+# Modes:
+#   full    - SHA-256 of the whole file (default)
+#   partial - SHA-256 of the size plus the first, middle and last block;
+#             much cheaper for large files on network shares
+
+FINGERPRINT_MODES = ("full", "partial")
+PARTIAL_BLOCK_SIZE = 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+MAX_ENTRIES = 4096
+
+_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], str]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _hash_full(path: str) -> str:
+    m = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            m.update(chunk)
+    return m.hexdigest()
+
+
+def _hash_partial(path: str, size: int) -> str:
+    m = hashlib.sha256()
+    m.update(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        if size <= 3 * PARTIAL_BLOCK_SIZE:
+            m.update(f.read())
+        else:
+            for offset in (0, (size - PARTIAL_BLOCK_SIZE) // 2, size - PARTIAL_BLOCK_SIZE):
+                f.seek(offset)
+                m.update(f.read(PARTIAL_BLOCK_SIZE))
+    return m.hexdigest()
+
+
+def file_fingerprint(path: str, mode: Optional[str] = None) -> str:
+    # Return a fingerprint for the file at path, rehashing only when its
+    # size or mtime changed since the last call. Missing files return "".
+    mode = mode or CONFIG.get("fingerprint_mode", "full")
+    if mode not in FINGERPRINT_MODES:
+        mode = "full"
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    stat_key = (st.st_size, st.st_mtime_ns)
+    key = (os.path.realpath(path), mode)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stat_key:
+            _cache.move_to_end(key)
+            return cached[1]
+    digest = _hash_partial(path, st.st_size) if mode == "partial" else _hash_full(path)
+    with _lock:
+        _cache[key] = (stat_key, digest)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return digest
+
+
+def file_stat_key(path: str) -> Optional[Tuple[str, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+
+
+def files_fingerprint(paths: Iterable[str]) -> str:
+    # Stable IS_CHANGED value for a set of files from their stat alone:
+    # changes only when one of them is added, removed, resized or touched.
+    parts = []
+    for path in paths:
+        key = file_stat_key(path)
+        parts.append(f"{path}:missing" if key is None else f"{key[0]}:{key[1]}:{key[2]}")
+    return "|".join(parts)
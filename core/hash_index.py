@@ -0,0 +1,133 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+import sqlite3
+import threading
+
+from typing import Optional, Tuple
+
+from .common import cstr
+
+# Persistent SHA-256 index for model files.
+#
+# Entries are keyed by the resolved path and validated against the file's
+# (size, mtime_ns, inode) signature, so a replaced or rewritten file is
+# detected automatically and rehashed. The index lives in a small SQLite
+# database under the ComfyUI user directory and survives restarts.
+
+INDEX_DIRNAME = "RvTools-X"
+INDEX_FILENAME = "model_hashes.db"
+
+FileSignature = Tuple[int, int, int]
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    # Return the (size, mtime_ns, inode) signature used to validate entries.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _default_index_path() -> str:
+    try:
+        import folder_paths
+        base = folder_paths.get_user_directory()
+    except Exception:
+        base = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "user")
+    return os.path.join(base, INDEX_DIRNAME, INDEX_FILENAME)
+
+
+class HashIndex:
+    # Thread-safe, SQLite-backed store of file hashes.
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " inode INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL)"
+        )
+
+    def get(self, path: str, signature: Optional[FileSignature] = None) -> Optional[str]:
+        # Return the stored hash if the file still matches its recorded signature.
+        if signature is None:
+            signature = file_signature(path)
+            if signature is None:
+                return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, inode, sha256 FROM hashes WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None:
+                return None
+            if tuple(row[:3]) != tuple(signature):
+                # File was replaced or modified since it was hashed
+                self._conn.execute("DELETE FROM hashes WHERE path = ?", (path,))
+                return None
+            return row[3]
+
+    def put(self, path: str, sha256: str, signature: Optional[FileSignature] = None) -> None:
+        if signature is None:
+            signature = file_signature(path)
+            if signature is None:
+                return
+        size, mtime_ns, inode = signature
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, inode, sha256) VALUES (?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, inode, sha256),
+            )
+
+    def prune(self) -> int:
+        # Drop entries whose file is gone or no longer matches its signature.
+        with self._lock:
+            rows = self._conn.execute("SELECT path, size, mtime_ns, inode FROM hashes").fetchall()
+        stale = [(row[0],) for row in rows if file_signature(row[0]) != tuple(row[1:])]
+        if stale:
+            with self._lock:
+                self._conn.executemany("DELETE FROM hashes WHERE path = ?", stale)
+        return len(stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+
+_index: Optional[HashIndex] = None
+_index_failed = False
+_index_lock = threading.Lock()
+
+
+def get_hash_index() -> Optional[HashIndex]:
+    # Return the process-wide index, opening and pruning it on first use.
+    # Returns None if the database can't be opened; callers then fall back
+    # to hashing without persistence.
+    global _index, _index_failed
+    if _index is not None or _index_failed:
+        return _index
+    with _index_lock:
+        if _index is None and not _index_failed:
+            db_path = _default_index_path()
+            try:
+                index = HashIndex(db_path)
+                pruned = index.prune()
+                if pruned:
+                    cstr(f"Pruned {pruned} stale entries from hash index").debug.print()
+                _index = index
+            except Exception as e:
+                cstr(f"Unable to open hash index {db_path}: {e}").warning.print()
+                _index_failed = True
+    return _index
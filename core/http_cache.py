@@ -0,0 +1,195 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import hashlib
+import json
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from .common import cstr
+from .config import CONFIG
+from .hash_index import INDEX_DIRNAME
+
+# Shared HTTP fetching for the path loaders.
+#
+# All downloads go through one keep-alive requests.Session with a timeout.
+# Bodies are kept in a bounded on-disk cache next to their ETag and
+# Last-Modified validators; a cached URL is revalidated with a conditional
+# request, so an unchanged image costs a 304 instead of a full download.
+# url_fingerprint() gives IS_CHANGED a value that follows the remote file
+# rather than the URL string.
+
+CACHE_DIRNAME = "http_cache"
+REQUEST_TIMEOUT = (5, 60)  # connect, read (seconds)
+HEAD_TIMEOUT = (2, 5)  # IS_CHANGED runs on every queue, keep it short
+POOL_SIZE = 16
+MAX_FETCH_WORKERS = 8
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_cache_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _cache_dir() -> str:
+    try:
+        import folder_paths
+        base = folder_paths.get_user_directory()
+    except Exception:
+        base = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "user")
+    return os.path.join(base, INDEX_DIRNAME, CACHE_DIRNAME)
+
+
+def _cache_paths(url: str):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = os.path.join(_cache_dir(), key)
+    return base + ".bin", base + ".json"
+
+
+def _read_entry(url: str) -> Optional[Dict[str, str]]:
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("url") != url or not os.path.isfile(body_path):
+        return None
+    return meta
+
+
+def _write_entry(url: str, content: bytes, headers) -> None:
+    limit = CONFIG.get("http_cache_mb", 512) * 1024 * 1024
+    if limit <= 0 or len(content) > limit:
+        return
+    etag = headers.get("ETag", "")
+    last_modified = headers.get("Last-Modified", "")
+    if not etag and not last_modified:
+        # Nothing to revalidate against
+        return
+    body_path, meta_path = _cache_paths(url)
+    meta = {"url": url, "etag": etag, "last_modified": last_modified, "size": len(content)}
+    try:
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        with _cache_lock:
+            tmp = body_path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(content)
+            os.replace(tmp, body_path)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        _evict(limit)
+    except OSError as e:
+        cstr(f"Unable to cache {url}: {e}").debug.print()
+
+
+def _evict(limit: int) -> None:
+    # Drop least recently used bodies until the cache fits its budget.
+    directory = _cache_dir()
+    with _cache_lock:
+        entries = []
+        total = 0
+        with os.scandir(directory) as it:
+            for e in it:
+                if e.name.endswith(".bin"):
+                    st = e.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+                    total += st.st_size
+        if total <= limit:
+            return
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= limit:
+                break
+            for p in (path, path[:-4] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def fetch_url(url: str) -> bytes:
+    # Return the body of url, revalidating a cached copy when there is one.
+    entry = _read_entry(url)
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    body_path, _meta_path = _cache_paths(url)
+    try:
+        response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        if entry is None:
+            raise
+        cstr(f"Unable to revalidate {url} ({e}), using cached copy").warning.print()
+        response = None
+    if response is None or (entry is not None and response.status_code == 304):
+        with open(body_path, "rb") as f:
+            content = f.read()
+        _touch(body_path)
+        return content
+    response.raise_for_status()
+    content = response.content
+    _write_entry(url, content, response.headers)
+    return content
+
+
+def fetch_urls(urls: List[str], workers: int = MAX_FETCH_WORKERS) -> List[bytes]:
+    # Fetch several URLs concurrently over the shared session, keeping order.
+    if len(urls) <= 1 or workers <= 1:
+        return [fetch_url(url) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls)), thread_name_prefix="rvtools-http") as pool:
+        return list(pool.map(fetch_url, urls))
+
+
+def url_fingerprint(url: str) -> str:
+    # IS_CHANGED value for a URL: its ETag/Last-Modified/Content-Length as
+    # reported by a HEAD request, or a hash of the body when the server sends
+    # none of them. Falls back to the cached validators and finally to the URL
+    # itself when the server can't be reached.
+    m = hashlib.sha256(url.encode("utf-8"))
+    try:
+        response = get_session().head(url, allow_redirects=True, timeout=HEAD_TIMEOUT)
+        if response.ok:
+            validators = [response.headers.get(h, "") for h in ("ETag", "Last-Modified", "Content-Length")]
+            if any(validators):
+                m.update("\0".join(validators).encode("utf-8"))
+            else:
+                m.update(hashlib.sha256(fetch_url(url)).digest())
+            return m.hexdigest()
+    except requests.RequestException:
+        pass
+    entry = _read_entry(url)
+    if entry is not None:
+        m.update(f"{entry.get('etag', '')}\0{entry.get('last_modified', '')}".encode("utf-8"))
+    return m.hexdigest()
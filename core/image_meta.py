@@ -0,0 +1,79 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import struct
+import zlib
+
+from typing import Any, Dict, Tuple
+from PIL import Image
+
+# Header-only image metadata reads.
+#
+# PNG files are walked chunk by chunk: IHDR gives the size, tEXt/zTXt/iTXt
+# give the text fields and every other chunk (IDAT included) is skipped with
+# a seek, so no pixel data is read or inflated. Text chunks written after the
+# image data are picked up as well. Other formats go through a lazy PIL open,
+# which parses the header/EXIF segments but never calls load().
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+MAX_TEXT_BYTES = 64 * 1024 * 1024  # refuse absurd text chunks instead of reading them
+
+
+def _png_text(ctype: bytes, data: bytes) -> Tuple[str, str]:
+    key, _, rest = data.partition(b"\0")
+    name = key.decode("latin-1", "replace")
+    if ctype == b"tEXt":
+        return name, rest.decode("latin-1", "replace")
+    if ctype == b"zTXt":
+        # compression method byte, then zlib stream
+        return name, zlib.decompress(rest[1:]).decode("latin-1", "replace")
+    # iTXt: compression flag, method, language\0, translated keyword\0, text
+    compressed = rest[:1] == b"\1"
+    _lang, _, rest = rest[2:].partition(b"\0")
+    _translated, _, text = rest.partition(b"\0")
+    if compressed:
+        text = zlib.decompress(text)
+    return name, text.decode("utf-8", "replace")
+
+
+def read_png_header(path: str) -> Tuple[Dict[str, Any], int, int]:
+    # Return (text_info, width, height) for a PNG without decoding pixels.
+    info: Dict[str, Any] = {}
+    width = height = 0
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise ValueError(f"Not a PNG file: {path}")
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                break
+            length, ctype = struct.unpack(">I4s", head)
+            if ctype == b"IHDR":
+                width, height = struct.unpack(">II", f.read(8))
+                f.seek(length - 8 + 4, 1)
+            elif ctype in (b"tEXt", b"zTXt", b"iTXt") and length <= MAX_TEXT_BYTES:
+                data = f.read(length)
+                f.seek(4, 1)
+                try:
+                    key, value = _png_text(ctype, data)
+                except (zlib.error, ValueError):
+                    continue
+                info.setdefault(key, value)
+            elif ctype == b"IEND":
+                break
+            else:
+                f.seek(length + 4, 1)
+    return info, width, height
+
+
+def read_image_header(path: str) -> Tuple[Dict[str, Any], int, int, str]:
+    # Return (info, width, height, format) without decoding pixels.
+    with open(path, "rb") as f:
+        is_png = f.read(8) == PNG_SIGNATURE
+    if is_png:
+        info, width, height = read_png_header(path)
+        return info, width, height, "PNG"
+    with Image.open(path) as img:
+        return dict(img.info), img.width, img.height, img.format or ""
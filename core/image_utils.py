@@ -0,0 +1,63 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import numpy as np
+import torch
+
+from typing import Optional
+from PIL import Image
+
+# Shared IMAGE tensor <-> uint8/PIL conversion helpers.
+
+QUANTIZE_CHUNK_BYTES = 64 * 1024 * 1024  # upper bound for the float scratch buffer
+
+
+def images_to_uint8(images: torch.Tensor, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Quantize a [N,H,W,C] (or [H,W,C]) float batch in [0, 1] to a uint8
+    # [N,H,W,C] array, matching np.clip(255 * x, 0, 255).astype(np.uint8).
+    #
+    # The work happens on the tensor's device in frame chunks that reuse one
+    # float scratch buffer, so peak extra memory is bounded by
+    # QUANTIZE_CHUNK_BYTES instead of several full-size float64/float32 copies.
+    # GPU batches are quantized on the GPU and copied to the host once.
+    # An existing uint8 array may be passed as `out` to avoid the allocation.
+    if images.dim() == 3:
+        images = images.unsqueeze(0)
+    shape = tuple(images.shape)
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+    elif out.shape != shape or out.dtype != np.uint8:
+        raise ValueError(f"images_to_uint8: out must be uint8 with shape {shape}, got {out.dtype} {out.shape}")
+
+    n = shape[0]
+    if n == 0:
+        return out
+    frame_elems = int(np.prod(shape[1:]))
+    chunk = max(1, min(n, QUANTIZE_CHUNK_BYTES // max(1, frame_elems * 4)))
+
+    host = torch.from_numpy(out)
+    with torch.no_grad():
+        on_host = images.device.type == "cpu"
+        target = host if on_host else torch.empty(shape, dtype=torch.uint8, device=images.device)
+        scratch = torch.empty((chunk,) + shape[1:], dtype=torch.float32, device=images.device)
+        for start in range(0, n, chunk):
+            stop = min(n, start + chunk)
+            buf = scratch[: stop - start]
+            torch.mul(images[start:stop], 255.0, out=buf)
+            buf.clamp_(0, 255)
+            # float -> uint8 copy truncates, like numpy's astype
+            target[start:stop].copy_(buf)
+        if not on_host:
+            host.copy_(target)
+    return out
+
+
+def tensor2pil(image: torch.Tensor) -> Image.Image:
+    # Convert a single IMAGE tensor ([H,W,C] or [1,H,W,C]) to a PIL image.
+    return Image.fromarray(np.squeeze(images_to_uint8(image)))
+
+
+def pil2tensor(image: Image.Image) -> torch.Tensor:
+    return torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
@@ -0,0 +1,89 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# Helpers for switch nodes built on ComfyUI lazy inputs ("lazy": True plus
+# check_lazy_status), so only the branch that is actually used gets executed.
+#
+# During check_lazy_status, inputs that are not connected are absent and
+# connected lazy inputs that have not been evaluated yet arrive as None.
+
+
+class DynamicInputs(dict):
+    # Optional-input dict that also answers for the numbered inputs the
+    # frontend adds at runtime (prefix_1 .. prefix_<maximum>). ComfyUI looks
+    # input declarations up by name, so those sockets are treated as lazy too,
+    # while the node still only lists the declared inputs in the UI.
+
+    def __init__(self, declared: Dict[str, Tuple], prefix: str, spec: Tuple, maximum: int = 64):
+        super().__init__(declared)
+        self._prefix = prefix + "_"
+        self._spec = spec
+        self._maximum = maximum
+
+    def _is_dynamic(self, key: Any) -> bool:
+        if not isinstance(key, str) or not key.startswith(self._prefix):
+            return False
+        suffix = key[len(self._prefix):]
+        return suffix.isdigit() and 1 <= int(suffix) <= self._maximum
+
+    def __contains__(self, key: Any) -> bool:
+        return super().__contains__(key) or self._is_dynamic(key)
+
+    def __getitem__(self, key: Any) -> Tuple:
+        if not super().__contains__(key) and self._is_dynamic(key):
+            return self._spec
+        return super().__getitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+
+# Hidden inputs for nodes that call first_pending_input. ComfyUI passes the
+# prompt being executed, which identifies the current run; the node instance
+# itself is reused across prompts.
+EXECUTION_HIDDEN = {"prompt": "PROMPT"}
+
+
+def pending_input(name: str, values: Dict[str, Any]) -> List[str]:
+    # check_lazy_status for a switch that uses exactly one input: request it
+    # only when it is connected (present) and not evaluated yet. Requesting an
+    # unconnected optional input makes ComfyUI fail the prompt.
+    return [name] if name in values and values[name] is None else []
+
+
+def first_pending_input(node: Any, names: Iterable[str], values: Dict[str, Any],
+                        is_empty: Callable[[Any], bool]) -> List[str]:
+    # check_lazy_status for priority switches: walk the inputs in order and
+    # request the first connected one that has not been evaluated yet. Stops
+    # as soon as an earlier input holds a usable value, so later branches are
+    # never executed.
+    #
+    # An input that was evaluated and came back None looks exactly like one
+    # that was never evaluated, and ComfyUI drops requests for inputs it has
+    # already evaluated. So the inputs requested so far are kept on the node
+    # instance and skipped once they are back, letting the switch fall
+    # through to the next one. The record belongs to the prompt it was made
+    # for (see EXECUTION_HIDDEN), so a run that was interrupted half way can't
+    # leak into the next one, and it is cleared when the walk is done.
+    execution = values.get("prompt")
+    record = node.__dict__.get("_lazy_requested")
+    if record is None or record[0] is not execution:
+        record = node._lazy_requested = (execution, set())
+    requested = record[1]
+    for name in names:
+        if name not in values:
+            continue
+        value = values[name]
+        if value is None:
+            if name in requested:
+                continue
+            requested.add(name)
+            return [name]
+        if not is_empty(value):
+            break
+    requested.clear()
+    return []
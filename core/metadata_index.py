@@ -0,0 +1,207 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+import sqlite3
+import threading
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .common import cstr
+from .hash_index import INDEX_DIRNAME
+
+# Persistent index of the generation metadata embedded in saved images.
+#
+# One row per image file holds the parsed fields (seed, model, prompts, ...)
+# together with the file's (size, mtime_ns); LoRA names go to a side table.
+# update() walks a directory and only re-parses files whose stat changed,
+# so refreshing a large output archive costs one os.stat per unchanged file.
+# The parser is supplied by the caller, keeping this module free of the
+# format-specific handlers.
+
+INDEX_FILENAME = "image_metadata.db"
+INDEX_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+# parse(path) -> record dict with the COLUMNS keys plus "loras" (list of names)
+MetadataParser = Callable[[str], Dict[str, Any]]
+
+COLUMNS = ("seed", "steps", "cfg", "sampler", "scheduler", "model_name", "model_hash",
+           "hashes", "width", "height", "text_pos", "text_neg")
+
+
+def _default_index_path() -> str:
+    try:
+        import folder_paths
+        base = folder_paths.get_user_directory()
+    except Exception:
+        base = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "user")
+    return os.path.join(base, INDEX_DIRNAME, INDEX_FILENAME)
+
+
+def _sql_seed(seed: Any) -> Optional[int]:
+    # Seeds span the full uint64 range; store them as signed 64-bit values.
+    try:
+        seed = int(seed)
+    except (TypeError, ValueError):
+        return None
+    return seed - (1 << 64) if seed >= (1 << 63) else seed
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class MetadataIndex:
+    # Thread-safe, SQLite-backed store of parsed image metadata.
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS images ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " seed INTEGER, steps INTEGER, cfg REAL,"
+            " sampler TEXT, scheduler TEXT,"
+            " model_name TEXT, model_hash TEXT, hashes TEXT,"
+            " width INTEGER, height INTEGER,"
+            " text_pos TEXT, text_neg TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS image_loras ("
+            " path TEXT NOT NULL REFERENCES images(path) ON DELETE CASCADE,"
+            " lora TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS images_seed ON images(seed)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS image_loras_lora ON image_loras(lora)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS image_loras_path ON image_loras(path)")
+
+    def update(self, root: str, parse: MetadataParser,
+               extensions: Iterable[str] = INDEX_EXTENSIONS) -> Tuple[int, int]:
+        # Bring the entries under root in line with the files on disk.
+        # Returns (parsed, removed).
+        root = os.path.abspath(root)
+        extensions = tuple(e.lower() for e in extensions)
+        prefix = _like_escape(root.rstrip(os.sep) + os.sep) + "%"
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute(
+                    "SELECT path, size, mtime_ns FROM images WHERE path LIKE ? ESCAPE '\\'", (prefix,)
+                )
+            }
+
+        seen = set()
+        changed: List[Tuple[str, Tuple[int, int]]] = []
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for name in filenames:
+                if not name.lower().endswith(extensions):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                stat_key = (st.st_size, st.st_mtime_ns)
+                if known.get(path) != stat_key:
+                    changed.append((path, stat_key))
+
+        records = []
+        for path, stat_key in changed:
+            try:
+                record = parse(path)
+            except Exception as e:
+                cstr(f"Unable to read metadata from {path}: {e}").debug.print()
+                record = {}
+            records.append((path, stat_key, record))
+
+        removed = [(path,) for path in known if path not in seen]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if removed:
+                    self._conn.executemany("DELETE FROM images WHERE path = ?", removed)
+                for path, (size, mtime_ns), record in records:
+                    self._conn.execute("DELETE FROM images WHERE path = ?", (path,))
+                    self._conn.execute(
+                        f"INSERT INTO images (path, size, mtime_ns, {', '.join(COLUMNS)})"
+                        f" VALUES (?, ?, ?, {', '.join('?' for _ in COLUMNS)})",
+                        (path, size, mtime_ns) + tuple(
+                            _sql_seed(record.get(c)) if c == "seed" else record.get(c) for c in COLUMNS
+                        ),
+                    )
+                    loras = {str(l).strip().lower() for l in record.get("loras", ()) if str(l).strip()}
+                    if loras:
+                        self._conn.executemany(
+                            "INSERT INTO image_loras (path, lora) VALUES (?, ?)", [(path, l) for l in loras]
+                        )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(records), len(removed)
+
+    def query(self, root: Optional[str] = None, seed: Optional[int] = None, model: str = "",
+              lora: str = "", prompt: str = "", limit: int = 0) -> List[str]:
+        # Return matching paths, newest first. Empty filters match everything.
+        #   model  - prefix of the model hash, or substring of the model name
+        #   lora   - substring of a LoRA name
+        #   prompt - substring of the positive prompt
+        sql = ["SELECT path FROM images WHERE 1=1"]
+        args: List[Any] = []
+        if root:
+            sql.append("AND path LIKE ? ESCAPE '\\'")
+            args.append(_like_escape(os.path.abspath(root).rstrip(os.sep) + os.sep) + "%")
+        if seed is not None:
+            sql.append("AND seed = ?")
+            args.append(_sql_seed(seed))
+        if model:
+            sql.append("AND (model_hash LIKE ? ESCAPE '\\' OR model_name LIKE ? ESCAPE '\\' OR hashes LIKE ? ESCAPE '\\')")
+            escaped = _like_escape(model)
+            args.extend((escaped + "%", "%" + escaped + "%", "%" + escaped + "%"))
+        if lora:
+            sql.append("AND path IN (SELECT path FROM image_loras WHERE lora LIKE ? ESCAPE '\\')")
+            args.append("%" + _like_escape(lora.lower()) + "%")
+        if prompt:
+            sql.append("AND text_pos LIKE ? ESCAPE '\\'")
+            args.append("%" + _like_escape(prompt) + "%")
+        sql.append("ORDER BY mtime_ns DESC, path")
+        if limit > 0:
+            sql.append("LIMIT ?")
+            args.append(int(limit))
+        with self._lock:
+            return [row[0] for row in self._conn.execute(" ".join(sql), args)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+
+_index: Optional[MetadataIndex] = None
+_index_failed = False
+_index_lock = threading.Lock()
+
+
+def get_metadata_index() -> Optional[MetadataIndex]:
+    # Return the process-wide index, or None if the database can't be opened.
+    global _index, _index_failed
+    if _index is not None or _index_failed:
+        return _index
+    with _index_lock:
+        if _index is None and not _index_failed:
+            db_path = _default_index_path()
+            try:
+                _index = MetadataIndex(db_path)
+            except Exception as e:
+                cstr(f"Unable to open metadata index {db_path}: {e}").warning.print()
+                _index_failed = True
+    return _index
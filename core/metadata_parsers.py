@@ -0,0 +1,314 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import json
+import re
+
+from typing import Any, Dict, Tuple
+from xml.dom import minidom
+
+from .common import SCHEDULERS_ANY
+
+# Generation metadata parsers shared by the image loader nodes.
+#
+# credits to https://github.com/Jordach/comfy-plasma for the initial code of the
+# metadata extraction, which was modified for this project
+
+EASYDIFFUSION_MAPPING_A = {
+    "prompt": "Prompt",
+    "negative_prompt": "Negative Prompt",
+    "seed": "Seed",
+    "use_stable_diffusion_model": "Stable Diffusion model",
+    "clip_skip": "Clip Skip",
+    "use_vae_model": "VAE model",
+    "sampler_name": "Sampler",
+    "width": "Width",
+    "height": "Height",
+    "num_inference_steps": "Steps",
+    "guidance_scale": "Guidance Scale",
+}
+
+EASYDIFFUSION_MAPPING_B = {
+    "prompt": "prompt",
+    "negative_prompt": "negative_prompt",
+    "seed": "seed",
+    "use_stable_diffusion_model": "use_stable_diffusion_model",
+    "clip_skip": "clip_skip",
+    "use_vae_model": "use_vae_model",
+    "sampler_name": "sampler_name",
+    "width": "width",
+    "height": "height",
+    "num_inference_steps": "num_inference_steps",
+    "guidance_scale": "guidance_scale",
+}
+# A1111-style "parameters" strings:
+#   <prompt>
+#   Negative prompt: <negative>
+#   Steps: 20, Sampler: DPM++ 2M Karras, CFG scale: 7, Seed: 1, Size: 512x512, Hashes: {...}, Version: ComfyUI
+#
+# parse_parameters() walks such a string once: the prompt/negative split is
+# located with two finds, and the settings line is tokenized left to right,
+# with quoted and {...} values decoded in place by the JSON scanner.
+
+NEGATIVE_MARKER = "Negative prompt:"
+SETTINGS_MARKER = "Steps: "
+
+# Settings key -> (gen_data key, converter)
+PARAMETER_FIELDS = {
+    "Steps": ("steps", int),
+    "Sampler": ("sampler", str),
+    "CFG scale": ("cfg_scale", float),
+    "Seed": ("seed", int),
+    "Hashes": ("model_hashes", lambda v: v),
+    "Version": ("version", str),
+}
+
+# Lower-cased scheduler name -> canonical name, probed longest suffix first
+SCHEDULER_SUFFIXES = {s.lower(): s for s in SCHEDULERS_ANY}
+SCHEDULER_SUFFIX_LENGTHS = sorted({len(s) for s in SCHEDULER_SUFFIXES}, reverse=True)
+
+_VALUE_END = re.compile(r"[,\n]")
+_json_decoder = json.JSONDecoder()
+
+
+def split_scheduler(sampler: str) -> Tuple[str, str]:
+    # Split a combined sampler value such as "DPM++ 2M Karras" into
+    # ("DPM++ 2M", "Karras"). Returns (sampler, "") if no scheduler matches.
+    lowered = sampler.lower()
+    for length in SCHEDULER_SUFFIX_LENGTHS:
+        if length <= len(lowered) and lowered[-length:] in SCHEDULER_SUFFIXES:
+            return sampler[:-length].rstrip(" _"), sampler[-length:]
+    return sampler, ""
+
+
+def parse_settings(text: str, pos: int = 0) -> Dict[str, Any]:
+    # Tokenize "Key: value, Key: value, ..." starting at pos into raw values.
+    settings: Dict[str, Any] = {}
+    n = len(text)
+    while pos < n:
+        colon = text.find(": ", pos)
+        if colon == -1:
+            break
+        key = text[pos:colon].strip()
+        pos = colon + 2
+        value: Any = None
+        if pos < n and text[pos] in '{"':
+            try:
+                value, pos = _json_decoder.raw_decode(text, pos)
+            except ValueError:
+                value = None
+        if value is None:
+            match = _VALUE_END.search(text, pos)
+            end = match.start() if match else n
+            value = text[pos:end].strip()
+            pos = end
+        settings[key] = value
+        while pos < n and text[pos] in ", \n":
+            pos += 1
+    return settings
+
+
+def parse_parameters(params: str) -> Dict[str, Any]:
+    # Parse an A1111-style parameters string into typed fields: prompt,
+    # negative, steps, sampler, scheduler, cfg_scale, seed, width_param,
+    # height_param, model_hashes and version. Fields that are missing or
+    # malformed are left out. The raw key/value pairs are kept under "settings".
+    result: Dict[str, Any] = {"prompt": "", "negative": ""}
+    if not params:
+        return result
+
+    settings_at = params.rfind("\n" + SETTINGS_MARKER)
+    if settings_at != -1:
+        settings_at += 1
+    elif params.startswith(SETTINGS_MARKER):
+        settings_at = 0
+    head = params[:settings_at] if settings_at != -1 else params
+
+    negative_at = head.find(NEGATIVE_MARKER)
+    if negative_at != -1:
+        result["prompt"] = head[:negative_at].strip()
+        result["negative"] = head[negative_at + len(NEGATIVE_MARKER):].strip()
+    else:
+        result["prompt"] = head.strip()
+
+    if settings_at == -1:
+        return result
+
+    settings = parse_settings(params, settings_at)
+    result["settings"] = settings
+    for key, (name, convert) in PARAMETER_FIELDS.items():
+        if key in settings:
+            try:
+                result[name] = convert(settings[key])
+            except (TypeError, ValueError):
+                pass
+    if result.get("sampler"):
+        sampler, scheduler = split_scheduler(result["sampler"])
+        if scheduler:
+            result["sampler"] = sampler
+            result["scheduler"] = scheduler
+    size = settings.get("Size")
+    if isinstance(size, str) and "x" in size:
+        try:
+            width, height = size.split("x")
+            result["width_param"] = int(width)
+            result["height_param"] = int(height)
+        except ValueError:
+            pass
+    return result
+
+
+def handle_auto1111(params):
+    parsed = parse_parameters(params)
+    return parsed["prompt"], parsed["negative"]
+
+
+def handle_ezdiff(params):
+    data = json.loads(params)
+    if data.get("prompt"):
+        ed = EASYDIFFUSION_MAPPING_B
+    else:
+        ed = EASYDIFFUSION_MAPPING_A
+
+    pos = data.get(ed["prompt"])
+    data.pop(ed["prompt"])
+    neg = data.get(ed["negative_prompt"])
+    return pos, neg
+
+def handle_invoke_modern(params):
+    meta = json.loads(params.get("sd-metadata"))
+    img = meta.get("image")
+    prompt = img.get("prompt")
+    index = [prompt.rfind("["), prompt.rfind("]")]
+
+    # negative
+    if -1 not in index:
+        pos = prompt[:index[0]]
+        neg = prompt[index[0] + 1:index[1]]
+        return pos, neg
+    else:
+        return prompt, ""
+
+def handle_invoke_legacy(params):
+    dream = params.get("Dream")
+    pi = dream.rfind('"')
+    ni = [dream.rfind("["), dream.rfind("]")]
+
+    # has neg
+    if -1 not in ni:
+        pos = dream[1:ni[0]]
+        neg = dream[ni[0] + 1:ni[1]]
+        return pos, neg
+    else:
+        pos = dream[1:pi]
+        return pos, ""
+
+def handle_novelai(params):
+    pos = params.get("Description")
+    comment = params.get("Comment") or {}
+    comment_json = json.loads(comment)
+    neg = comment_json.get("uc")
+    return pos, neg
+
+def handle_qdiffusion(params):
+    pass
+
+def handle_comfyui(params):
+    """Extract generation data from ComfyUI embedded metadata"""
+    gen_data = {}
+
+    # Extract parameters (generation settings)
+    if "parameters" in params:
+        gen_data["parameters"] = params["parameters"]
+
+    # Extract workflow data
+    if "workflow" in params:
+        try:
+            gen_data["workflow"] = json.loads(params["workflow"])
+        except:
+            gen_data["workflow"] = params["workflow"]
+
+    # Extract LORA weights
+    if "lora_weights" in params:
+        try:
+            gen_data["lora_weights"] = json.loads(params["lora_weights"])
+        except:
+            gen_data["lora_weights"] = params["lora_weights"]
+
+    # Parse generation parameters string for structured data
+    if isinstance(gen_data.get("parameters"), str):
+        parsed = parse_parameters(gen_data["parameters"])
+        parsed.pop("settings", None)
+        gen_data.update(parsed)
+
+    return gen_data
+
+def handle_drawthings(params):
+    try:
+        data = minidom.parseString(params.get("XML:com.adobe.xmp"))
+        data_json = json.loads(data.getElementsByTagName("exif:UserComment")[0].childNodes[1].childNodes[1].childNodes[0].data)
+    except:
+        return "", ""
+    else:
+        pos = data_json.get("c")
+        neg = data_json.get("uc")
+        return pos, neg
+
+
+
+
+def extract_metadata(info: Dict[str, Any], image_format: str) -> Dict[str, Any]:
+    # Parse generation parameters from an image's info dict (PNG text
+    # chunks / EXIF fields), trying each supported tool's format in turn.
+    prompt = ""
+    negative = ""
+    gen_data: Dict[str, Any] = {}
+
+    if image_format == "PNG" or ("parameters" in info or "workflow" in info or "lora_weights" in info):
+        # ComfyUI / auto1111
+        if "parameters" in info or "workflow" in info or "lora_weights" in info:
+            gen_data = handle_comfyui(info)
+            prompt = gen_data.get("prompt", "")
+            negative = gen_data.get("negative", "")
+        # easy diffusion
+        elif "negative_prompt" in info or "Negative Prompt" in info:
+            params = str(info).replace("'", '"')
+            prompt, negative = handle_ezdiff(params)
+        # invokeai modern
+        elif "sd-metadata" in info:
+            prompt, negative = handle_invoke_modern(info)
+        # legacy invokeai
+        elif "Dream" in info:
+            prompt, negative = handle_invoke_legacy(info)
+        # novelai
+        elif info.get("Software") == "NovelAI":
+            prompt, negative = handle_novelai(info)
+        # qdiffusion
+        # elif ????:
+        # drawthings (iPhone, iPad, macOS)
+        elif "XML:com.adobe.xmp" in info:
+            prompt, negative = handle_drawthings(info)
+
+    model_hashes = gen_data.get("model_hashes", {})
+    model_name = ""
+    if isinstance(model_hashes, dict):
+        for key in model_hashes.keys():
+            if key.startswith("Model:"):
+                model_name = key.replace("Model:", "", 1)
+                break
+
+    return {
+        "steps": gen_data.get("steps", 0),
+        "sampler": gen_data.get("sampler", ""),
+        "scheduler": gen_data.get("scheduler", ""),
+        "cfg": gen_data.get("cfg_scale", 0.0),
+        "seed": gen_data.get("seed", 0),
+        "text_pos": prompt or "",
+        "text_neg": negative or "",
+        "model_name": model_name,
+        "model_hashes": model_hashes,
+        "lora_weights": gen_data.get("lora_weights", {}),
+        "version": gen_data.get("version", ""),
+    }
@@ -0,0 +1,335 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+import threading
+import time
+import weakref
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import comfy.sd
+import comfy.utils
+
+from .common import cstr
+from .config import CONFIG
+
+# Process-wide cache of loaded MODEL/CLIP/VAE components for the checkpoint
+# loaders.
+#
+# Components are keyed by (kind, real path, size, mtime_ns, load options), so
+# two loader nodes - of any version - that point at the same file and options
+# get the same objects instead of loading the weights twice, and a replaced
+# file is never served from the cache.
+#
+# Every loaded component is tracked through a weak reference: as long as
+# anything else holds it (typically ComfyUI's output cache of the node that
+# loaded it) it is reused, and it is freed as soon as the last user lets go,
+# exactly as without this cache. On top of that, up to RVTOOLSX_MODEL_CACHE_MB
+# of recently used components are pinned with strong references in LRU order
+# so switching back and forth between workflows doesn't reload them. The
+# budget is measured with comfy's model_size(); moving weights between RAM
+# and VRAM stays with comfy.model_management.
+#
+# Loaders must treat returned objects as shared: clone() before patching,
+# as ComfyUI's own nodes already do.
+
+_MISSING = object()
+
+
+def _stat_key(path: str) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+
+
+def _options_key(options: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((str(k), str(v)) for k, v in (options or {}).items()))
+
+
+def _describe(key: tuple) -> str:
+    stats = key[1] if key[0] == "clip" else (key[1],)
+    return f"{key[0]} " + ", ".join(os.path.basename(stat[0]) for stat in stats)
+
+
+def _component_size(obj: Any) -> int:
+    if obj is None:
+        return 0
+    patcher = obj if hasattr(obj, "model_size") else getattr(obj, "patcher", None)
+    try:
+        return int(patcher.model_size())
+    except Exception:
+        return 0
+
+
+class ComponentCache:
+    # Weakly shared, strongly pinned (LRU, byte budget) loaded components.
+    # Values are single objects or tuples of objects (None allowed).
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._refs: Dict[tuple, Tuple[bool, Tuple[Optional[weakref.ref], ...]]] = {}
+        self._pinned: "OrderedDict[tuple, Tuple[Any, int]]" = OrderedDict()
+        self._pinned_bytes = 0
+        self._pending: Dict[tuple, threading.Event] = {}
+        # Re-entrant: weakref callbacks may run from a GC pass on a thread
+        # that already holds the lock.
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _parts(value: Any) -> Tuple[Any, ...]:
+        return value if isinstance(value, tuple) else (value,)
+
+    def _lookup(self, key: tuple) -> Any:
+        pinned = self._pinned.get(key)
+        if pinned is not None:
+            self._pinned.move_to_end(key)
+            return pinned[0]
+        entry = self._refs.get(key)
+        if entry is None:
+            return _MISSING
+        is_tuple, refs = entry
+        parts = tuple(None if r is None else r() for r in refs)
+        if any(r is not None and p is None for r, p in zip(refs, parts)):
+            del self._refs[key]
+            return _MISSING
+        return parts if is_tuple else parts[0]
+
+    def _store(self, key: tuple, value: Any) -> None:
+        parts = self._parts(value)
+        try:
+            reap = self._make_reaper(key)
+            self._refs[key] = (isinstance(value, tuple), tuple(None if p is None else weakref.ref(p, reap) for p in parts))
+        except TypeError:
+            # Not weak-referenceable; only the pinned copy can be shared
+            self._refs.pop(key, None)
+        if self.budget_bytes == 0:
+            return
+        size = sum(_component_size(p) for p in parts)
+        if size > self.budget_bytes:
+            return
+        old = self._pinned.pop(key, None)
+        if old is not None:
+            self._pinned_bytes -= old[1]
+        while self._pinned and self._pinned_bytes + size > self.budget_bytes:
+            _, (_, evicted) = self._pinned.popitem(last=False)
+            self._pinned_bytes -= evicted
+        self._pinned[key] = (value, size)
+        self._pinned_bytes += size
+
+    def _make_reaper(self, key: tuple) -> Callable[[weakref.ref], None]:
+        def reap(_ref: weakref.ref) -> None:
+            with self._lock:
+                entry = self._refs.get(key)
+                if entry is not None and any(r is _ref for r in entry[1]):
+                    del self._refs[key]
+        return reap
+
+    def get(self, key: tuple) -> Any:
+        # Cached value for key, or None.
+        with self._lock:
+            value = self._lookup(key)
+        return None if value is _MISSING else value
+
+    def get_or_load(self, key: tuple, load: Callable[[], Any]) -> Any:
+        # Return the cached value for key, calling load() once on a miss.
+        # Concurrent callers for the same key wait for that single load.
+        while True:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    cstr(f"Reusing loaded {_describe(key)}").debug.print()
+                    return value
+                pending = self._pending.get(key)
+                owner = pending is None
+                if owner:
+                    pending = self._pending[key] = threading.Event()
+            if not owner:
+                pending.wait()
+                continue
+            try:
+                value = load()
+                with self._lock:
+                    self._store(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+                pending.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._refs.clear()
+            self._pinned.clear()
+            self._pinned_bytes = 0
+
+
+component_cache = ComponentCache(CONFIG.get("model_cache_mb", 0) * 1024 * 1024)
+
+
+def load_checkpoint(ckpt_path: str, output_vae: bool = True, output_clip: bool = True,
+                    embedding_directory: Optional[Sequence[str]] = None) -> tuple:
+    # Shared comfy.sd.load_checkpoint_guess_config. A checkpoint already
+    # loaded with more outputs (e.g. with its VAE) is reused as is, with the
+    # outputs that were not asked for set to None.
+    stat_key = _stat_key(ckpt_path)
+    for vae_flag in sorted({bool(output_vae), True}):
+        for clip_flag in sorted({bool(output_clip), True}):
+            loaded = component_cache.get(("checkpoint", stat_key, vae_flag, clip_flag))
+            if loaded is not None:
+                parts = list(loaded)
+                if not output_clip and len(parts) > 1:
+                    parts[1] = None
+                if not output_vae and len(parts) > 2:
+                    parts[2] = None
+                return tuple(parts)
+    return component_cache.get_or_load(
+        ("checkpoint", stat_key, bool(output_vae), bool(output_clip)),
+        lambda: tuple(comfy.sd.load_checkpoint_guess_config(
+            ckpt_path,
+            output_vae=output_vae,
+            output_clip=output_clip,
+            embedding_directory=embedding_directory,
+        )),
+    )
+
+
+def load_diffusion_model(unet_path: str, model_options: Optional[Dict[str, Any]] = None) -> Any:
+    # Shared comfy.sd.load_diffusion_model, keyed by dtype options as well.
+    model_options = model_options or {}
+    return component_cache.get_or_load(
+        ("diffusion_model", _stat_key(unet_path), _options_key(model_options)),
+        lambda: comfy.sd.load_diffusion_model(unet_path, model_options=model_options),
+    )
+
+
+def load_clip(ckpt_paths: Iterable[str], embedding_directory: Optional[Sequence[str]] = None,
+              clip_type: Any = None, model_options: Optional[Dict[str, Any]] = None) -> Any:
+    # Shared comfy.sd.load_clip for a CLIP set (order matters) and clip type.
+    ckpt_paths = list(ckpt_paths)
+    model_options = model_options or {}
+    kwargs = {"model_options": model_options}
+    if clip_type is not None:
+        kwargs["clip_type"] = clip_type
+    return component_cache.get_or_load(
+        ("clip", tuple(_stat_key(p) for p in ckpt_paths), str(clip_type), _options_key(model_options)),
+        lambda: comfy.sd.load_clip(ckpt_paths=ckpt_paths, embedding_directory=embedding_directory, **kwargs),
+    )
+
+
+def load_vae(vae_path: str) -> Any:
+    # Shared comfy.sd.VAE built from a standalone VAE file.
+    return component_cache.get_or_load(
+        ("vae", _stat_key(vae_path)),
+        lambda: comfy.sd.VAE(sd=comfy.utils.load_torch_file(vae_path)),
+    )
+
+
+def _files_size(paths: Sequence[str]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def _memory_cap() -> int:
+    cap = CONFIG.get("parallel_load_mb", 0) * 1024 * 1024
+    if cap > 0:
+        return cap
+    try:
+        import psutil
+        return int(psutil.virtual_memory().available)
+    except Exception:
+        return 0  # unknown, no cap
+
+
+class ComponentPrefetch:
+    # Opt-in concurrent loading for the checkpoint loaders. Independent
+    # component files (UNet/checkpoint, CLIP set, VAE) are loaded through the
+    # shared loaders above on a thread pool, overlapping disk reads and
+    # deserialization. The node's regular sequential load calls then get the
+    # results from component_cache (waiting for any load still in flight),
+    # so the node logic doesn't change. Results are held here until finish()
+    # so the weakly cached components can't be freed in between.
+    #
+    # Loads only start together while the combined size of the files in
+    # flight stays under the memory cap (RVTOOLSX_PARALLEL_LOAD_MB, default:
+    # currently available RAM); a component larger than the cap still loads,
+    # just on its own.
+
+    def __init__(self):
+        self._tasks: List[Tuple[str, int, Callable[[], Any]]] = []
+        self._futures: List[Tuple[str, int, Future]] = []
+        self._timings: Dict[str, float] = {}
+        self._cap = 0
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._started = 0.0
+
+    def add(self, name: str, paths: Union[str, Sequence[str], None], load: Callable[..., Any], *args, **kwargs) -> None:
+        # Queue load(*args, **kwargs) for the file(s) in paths. Missing files
+        # are skipped so the node's own checks report them as usual.
+        paths = [paths] if isinstance(paths, str) else list(paths or ())
+        if not paths or not all(p and os.path.isfile(p) for p in paths):
+            return
+        self._tasks.append((name, _files_size(paths), lambda: load(*args, **kwargs)))
+
+    def _run(self, name: str, size: int, load: Callable[[], Any]) -> Any:
+        with self._cond:
+            while not self._closed and self._in_flight and self._cap and self._in_flight + size > self._cap:
+                self._cond.wait()
+            if self._closed:
+                return None
+            self._in_flight += size
+        start = time.perf_counter()
+        try:
+            return load()
+        finally:
+            self._timings[name] = time.perf_counter() - start
+            with self._cond:
+                self._in_flight -= size
+                self._cond.notify_all()
+
+    def start(self) -> "ComponentPrefetch":
+        if not self._tasks:
+            return self
+        self._cap = _memory_cap()
+        self._started = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=len(self._tasks), thread_name_prefix="rvtools-load")
+        # Largest first, so the longest read starts right away
+        for name, size, load in sorted(self._tasks, key=lambda t: -t[1]):
+            self._futures.append((name, size, pool.submit(self._run, name, size, load)))
+        pool.shutdown(wait=False)
+        return self
+
+    def finish(self) -> None:
+        # Wait for the loads already running, drop those still waiting for
+        # memory, report per-component timings and release the results. Call
+        # it on every exit of the node. Errors are left to the node's own load
+        # calls, which retry and raise them in the usual place.
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if not self._futures:
+            return
+        parts = []
+        for name, size, future in self._futures:
+            try:
+                future.result()
+            except Exception as e:
+                cstr(f"Parallel load of {name} failed: {e}").debug.print()
+                continue
+            if name not in self._timings:
+                continue  # never started
+            parts.append(f"{name} {size / (1024 ** 3):.2f} GB in {self._timings.get(name, 0.0):.2f}s")
+        wall = time.perf_counter() - self._started
+        self._futures.clear()
+        if parts:
+            cstr(f"Parallel load: {', '.join(parts)} (total {wall:.2f}s)").msg.print()
@@ -0,0 +1,160 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+import threading
+import time
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import folder_paths
+
+# Cached filename index over ComfyUI model folders.
+#
+# Each folder type is indexed once from folder_paths.get_filename_list and
+# kept until the mtime of one of its directories changes. Every directory
+# under the folder roots is watched, empty ones included, so a file copied
+# anywhere in the tree shows up the next time the index is validated. Lookups
+# by relative name, basename or stem are then dict hits instead of recursive
+# globs.
+
+VALIDATE_INTERVAL = 1.0  # seconds between directory mtime checks per folder type
+
+
+def _norm(name: str) -> str:
+    return name.replace("\\", "/").lower()
+
+
+def _walk_dirs(roots: Iterable[str]) -> List[str]:
+    # Every directory below the roots, the roots themselves included even
+    # when missing (so creating one is noticed). Skips .git like folder_paths.
+    dirs = []
+    for root in roots:
+        dirs.append(root)
+        for dirpath, dirnames, _ in os.walk(root, followlinks=True):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            dirs.extend(os.path.join(dirpath, d) for d in dirnames)
+    return dirs
+
+
+def _dir_mtimes(dirs: Iterable[str]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    result = []
+    for d in dirs:
+        try:
+            result.append((d, os.stat(d).st_mtime_ns))
+        except OSError:
+            result.append((d, None))
+    return tuple(result)
+
+
+class _FolderIndex:
+    __slots__ = ("folder_type", "roots", "dirs", "mtimes", "checked", "names", "by_name", "by_basename", "by_stem")
+
+    def __init__(self, folder_type: str):
+        self.folder_type = folder_type
+        self.roots = [os.path.abspath(p) for p in folder_paths.get_folder_paths(folder_type)]
+        # mtimes before listing, so a file added in between invalidates the index
+        self.dirs = _walk_dirs(self.roots)
+        self.mtimes = _dir_mtimes(self.dirs)
+        self.names: List[str] = list(folder_paths.get_filename_list(folder_type))
+        self.by_name: Dict[str, str] = {}
+        self.by_basename: Dict[str, str] = {}
+        self.by_stem: Dict[str, str] = {}
+        for name in self.names:
+            key = _norm(name)
+            base = key.rsplit("/", 1)[-1]
+            self.by_name.setdefault(key, name)
+            self.by_basename.setdefault(base, name)
+            self.by_stem.setdefault(os.path.splitext(base)[0], name)
+        self.checked = time.monotonic()
+
+    def is_stale(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked < VALIDATE_INTERVAL:
+            return False
+        self.checked = now
+        return _dir_mtimes(self.dirs) != self.mtimes
+
+    def lookup(self, name: str, extensions: Sequence[str] = (), allow_prefix: bool = False) -> Optional[str]:
+        # Return the relative filename as known to folder_paths, or None.
+        key = _norm(name)
+        candidates = [key] + [key + ext for ext in extensions if not key.endswith(ext)]
+        for c in candidates:
+            if c in self.by_name:
+                return self.by_name[c]
+        for c in candidates:
+            if "/" not in c:
+                if c in self.by_basename:
+                    return self.by_basename[c]
+            else:
+                suffix = "/" + c
+                for n in self.names:
+                    if _norm(n).endswith(suffix):
+                        return n
+        if "/" not in key and key in self.by_stem:
+            return self.by_stem[key]
+        if allow_prefix:
+            for n in self.names:
+                if _norm(n).rsplit("/", 1)[-1].startswith(key):
+                    return n
+        return None
+
+    def root_for(self, full_path: str) -> Optional[str]:
+        full_path = os.path.abspath(full_path)
+        for root in self.roots:
+            if full_path.startswith(root + os.sep):
+                return root
+        return None
+
+
+class ModelFileIndex:
+    # Process-wide basename -> path index shared by the model lookups.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._folders: Dict[str, _FolderIndex] = {}
+
+    def _folder(self, folder_type: str) -> Optional[_FolderIndex]:
+        with self._lock:
+            index = self._folders.get(folder_type)
+            if index is None or index.is_stale():
+                try:
+                    index = _FolderIndex(folder_type)
+                except Exception:
+                    # Unknown folder type for this ComfyUI version
+                    return None
+                self._folders[folder_type] = index
+            return index
+
+    def filenames(self, folder_type: str) -> List[str]:
+        index = self._folder(folder_type)
+        return list(index.names) if index is not None else []
+
+    def find(self, name: str, folder_types: Sequence[str], extensions: Sequence[str] = (),
+             allow_prefix: bool = False) -> Tuple[Optional[str], Optional[str]]:
+        # Resolve a model name to (full_path, root_dir), searching folder types in order.
+        if not name:
+            return None, None
+        for folder_type in folder_types:
+            index = self._folder(folder_type)
+            if index is None:
+                continue
+            rel = index.lookup(name, extensions, allow_prefix)
+            if rel is None:
+                continue
+            full_path = folder_paths.get_full_path(folder_type, rel)
+            if full_path:
+                return full_path, index.root_for(full_path)
+        return None, None
+
+    def invalidate(self, folder_type: Optional[str] = None) -> None:
+        with self._lock:
+            if folder_type is None:
+                self._folders.clear()
+            else:
+                self._folders.pop(folder_type, None)
+
+
+model_file_index = ModelFileIndex()
@@ -0,0 +1,263 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import json
+import os
+import struct
+import threading
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .common import cstr
+
+# Header-only reads of .safetensors files.
+#
+# A safetensors file starts with a little-endian u64 length and a JSON table
+# of tensor names -> dtype/shape/offsets, so names and shapes are available
+# without touching tensor data. Only a small summary of each header is kept,
+# cached per path together with the file's (size, mtime_ns) and recomputed
+# when that stat changes.
+
+SAFETENSORS_EXTENSIONS = (".safetensors", ".sft")
+MAX_HEADER_BYTES = 100 * 1024 * 1024  # same limit the safetensors library enforces
+MAX_ENTRIES = 1024
+
+# Tensors whose input channels equal the VAE latent channels, by key suffix.
+# decoder.conv_in: SD/SDXL/SD3/Flux; conv_in.conv: Hunyuan/Mochi style causal
+# convs; decoder.conv1: Wan/Qwen-Image VAEs (5D weights).
+_LATENT_INPUT_KEYS = ("decoder.conv_in.weight", "decoder.conv_in.conv.weight", "decoder.conv1.weight")
+
+_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def is_safetensors(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in SAFETENSORS_EXTENSIONS
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    # Return the parsed JSON header of a safetensors file (tensor name ->
+    # {"dtype", "shape", "data_offsets"}, plus "__metadata__" when present).
+    # Raises OSError/ValueError for unreadable or malformed files.
+    return _read_header(path)[0]
+
+
+def _read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    with open(path, "rb") as f:
+        raw = f.read(8)
+        if len(raw) < 8:
+            raise ValueError(f"Not a safetensors file (truncated): {path}")
+        (length,) = struct.unpack("<Q", raw)
+        if length > MAX_HEADER_BYTES:
+            raise ValueError(f"Not a safetensors file (header length {length}): {path}")
+        data = f.read(length)
+    if len(data) < length:
+        raise ValueError(f"Not a safetensors file (truncated header): {path}")
+    header = json.loads(data)
+    if not isinstance(header, dict):
+        raise ValueError(f"Not a safetensors file (invalid header): {path}")
+    return header, length
+
+
+def _latent_channels(header: Dict[str, Any]) -> Optional[int]:
+    for suffix in _LATENT_INPUT_KEYS:
+        for name, info in header.items():
+            if name == suffix or name.endswith("." + suffix):
+                shape = info.get("shape") if isinstance(info, dict) else None
+                if isinstance(shape, list) and len(shape) >= 4:
+                    return int(shape[1])
+    return None
+
+
+# Diffusion model families by a characteristic tensor name (after the
+# checkpoint prefixes are stripped), with the latent channels they expect from
+# the VAE. Only architectures whose latent space is fixed get a number; block
+# layouts that derived models reuse with other VAEs (Flux, Qwen-Image, Wan)
+# leave it to the loader.
+_MODEL_SIGNATURES = (
+    ("double_blocks.0.img_attn.qkv.weight", "flux", None),
+    ("joint_blocks.0.x_block.attn.qkv.weight", "sd3", 16),
+    ("transformer_blocks.0.img_mod.1.weight", "qwen_image", None),
+    ("patch_embedding.weight", "wan", None),
+    ("input_blocks.0.0.weight", "sd", 4),
+)
+_MODEL_PREFIXES = ("model.diffusion_model.", "diffusion_model.")
+
+# Text encoder families by tensor name suffix
+_TEXT_ENCODER_SIGNATURES = (
+    ("encoder.block.0.layer.0.SelfAttention.q.weight", "t5"),
+    ("text_model.encoder.layers.0.self_attn.q_proj.weight", "clip"),
+    ("transformer.resblocks.0.attn.in_proj_weight", "clip"),
+    ("layers.0.self_attn.q_proj.weight", "llm"),
+)
+_LORA_MARKERS = ("lora_up.", "lora_down.", "lora_A.", "lora_B.", ".lora.")
+
+
+def _strip_model_prefix(name: str) -> str:
+    for prefix in _MODEL_PREFIXES:
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+
+def _summarize(header: Dict[str, Any], file_size: int, header_size: int) -> Dict[str, Any]:
+    tensors = {k: v for k, v in header.items() if k != "__metadata__" and isinstance(v, dict)}
+    names = set(_strip_model_prefix(k) for k in tensors)
+    diffusion_model = any(k.startswith(_MODEL_PREFIXES) for k in tensors)
+
+    model = model_latent = None
+    for name, arch, channels in _MODEL_SIGNATURES:
+        if name in names:
+            model, model_latent = arch, channels
+            if arch == "sd" and "label_emb.0.0.weight" in names:
+                model = "sdxl"
+            break
+
+    text_encoder = None
+    for suffix, kind in _TEXT_ENCODER_SIGNATURES:
+        if any(k == suffix or k.endswith("." + suffix) for k in tensors):
+            text_encoder = kind
+            break
+
+    dtypes: Dict[str, int] = {}
+    data_end = 0
+    for info in tensors.values():
+        dtype = str(info.get("dtype", ""))
+        dtypes[dtype] = dtypes.get(dtype, 0) + 1
+        offsets = info.get("data_offsets")
+        if isinstance(offsets, list) and len(offsets) == 2:
+            data_end = max(data_end, int(offsets[1]))
+
+    return {
+        "tensors": len(tensors),
+        "latent_channels": _latent_channels(header),
+        "model": model,
+        "model_latent_channels": model_latent,
+        "diffusion_model": diffusion_model,
+        "text_encoder": text_encoder,
+        "lora": any(marker in k for k in tensors for marker in _LORA_MARKERS),
+        "dtype": max(dtypes, key=dtypes.get) if dtypes else "",
+        "complete": 8 + header_size + data_end <= file_size,
+    }
+
+
+def header_summary(path: str) -> Dict[str, Any]:
+    # Cached summary of a safetensors header:
+    #   tensors               - number of tensors in the file
+    #   latent_channels       - VAE latent channels, or None without a known VAE
+    #   model                 - diffusion model family (sd, sdxl, sd3, flux, ...) or None
+    #   model_latent_channels - latent channels that model expects, when fixed
+    #   diffusion_model       - True when tensors carry a (model.)diffusion_model. prefix
+    #   text_encoder          - text encoder family (clip, t5, llm) or None
+    #   lora                  - True for LoRA/LyCORIS weights
+    #   dtype                 - most common tensor dtype (F16, BF16, F8_E4M3, ...)
+    #   complete              - False when the file is shorter than its header says
+    # Raises OSError/ValueError for unreadable or malformed files.
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    stat_key = (st.st_size, st.st_mtime_ns)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == stat_key:
+            _cache.move_to_end(key)
+            return hit[1]
+    header, header_size = _read_header(path)
+    summary = _summarize(header, st.st_size, header_size)
+    with _lock:
+        _cache[key] = (stat_key, summary)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return summary
+
+
+def latent_channels(path: str) -> Optional[int]:
+    # Latent channel count of the VAE in path (a VAE file or a checkpoint
+    # with a baked VAE), read from tensor shapes only. None when the file is
+    # not safetensors or no known VAE tensor is found.
+    if not is_safetensors(path):
+        return None
+    try:
+        return header_summary(path)["latent_channels"]
+    except (OSError, ValueError):
+        return None
+
+
+def _kind(summary: Dict[str, Any]) -> Optional[str]:
+    # Human readable kind of a model file, or None when it isn't recognized
+    if summary["lora"]:
+        return "LoRA"
+    if summary["model"]:
+        return f"{summary['model']} diffusion model"
+    if summary["text_encoder"]:
+        return f"{summary['text_encoder']} text encoder"
+    if summary["latent_channels"] is not None:
+        return "VAE"
+    return None
+
+
+def preflight(checkpoint: Optional[str] = None, unet: Optional[str] = None,
+              clips: Sequence[str] = (), vae: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    # Check the model files a loader is about to read from their safetensors
+    # headers alone, before any weights are loaded. Raises ValueError naming
+    # the first file that is truncated, of the wrong kind (e.g. a LoRA picked
+    # as VAE) or whose VAE latent channels don't fit the model. Files that are
+    # missing or not safetensors are left to the loaders' own checks.
+    # Returns {path: summary} for the files that were checked.
+    summaries: Dict[str, Dict[str, Any]] = {}
+
+    def summarize(role: str, path: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not path or not is_safetensors(path) or not os.path.isfile(path):
+            return None
+        name = os.path.basename(path)
+        try:
+            summary = header_summary(path)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"{role} '{name}' is not a valid safetensors file: {e}")
+        if not summary["complete"]:
+            raise ValueError(f"{role} '{name}' is truncated (incomplete download or copy?)")
+        summaries[path] = summary
+        return summary
+
+    model = None
+    for role, path in (("Checkpoint", checkpoint), ("UNet", unet)):
+        summary = summarize(role, path)
+        if summary is None:
+            continue
+        # Families not in _MODEL_SIGNATURES are fine as long as the file
+        # holds diffusion model weights; all-in-one checkpoints also carry a
+        # VAE and text encoders.
+        kind = _kind(summary)
+        if summary["lora"] or (summary["model"] is None and not summary["diffusion_model"] and kind is not None):
+            raise ValueError(f"{role} '{os.path.basename(path)}' is a {kind}, not a diffusion model")
+        model = summary
+
+    for path in clips:
+        summary = summarize("CLIP", path)
+        if summary is None or summary["text_encoder"] is not None:
+            continue
+        kind = _kind(summary)
+        if kind is not None:
+            raise ValueError(f"CLIP '{os.path.basename(path)}' is a {kind}, not a text encoder")
+
+    summary = summarize("VAE", vae)
+    if summary is not None:
+        kind = _kind(summary)
+        if summary["latent_channels"] is None and kind is not None:
+            raise ValueError(f"VAE '{os.path.basename(vae)}' is a {kind}, not a VAE")
+        expected = model["model_latent_channels"] if model is not None else None
+        channels = summary["latent_channels"]
+        if expected is not None and channels is not None and channels != expected:
+            raise ValueError(
+                f"VAE '{os.path.basename(vae)}' has {channels} latent channels, but the "
+                f"{model['model']} model expects {expected}"
+            )
+
+    if summaries:
+        cstr("Preflight: " + ", ".join(
+            f"{os.path.basename(p)} ({_kind(s) or 'unknown'}, {s['dtype']})" for p, s in summaries.items()
+        )).debug.print()
+    return summaries
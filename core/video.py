@@ -0,0 +1,335 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+import threading
+import cv2
+import numpy as np
+import torch
+
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from .common import cstr
+from .config import CONFIG
+from .fingerprint import file_stat_key
+
+# Bounded-memory video frame loading for the video nodes.
+#
+# Frames are decoded straight into slices of one preallocated float32 IMAGE
+# tensor ([N,H,W,3] in 0..1). The only per-frame scratch memory is a single
+# reused uint8 RGB buffer, so peak RAM stays close to the size of the output.
+
+
+class FrameCache:
+    # Byte-budgeted LRU cache of decoded frame ranges, keyed by
+    # (path, size, mtime_ns, start, count). Values are [N,H,W,3] float32
+    # tensors owned by the cache, so the resolution travels with the entry
+    # and a replaced file can never produce a stale hit.
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._entries: "OrderedDict[tuple, torch.Tensor]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path: str, start: int, count: Optional[int]) -> Optional[tuple]:
+        stat_key = file_stat_key(path)
+        if stat_key is None:
+            return None
+        return stat_key + (start, count)
+
+    def get(self, key: Optional[tuple]) -> Optional[torch.Tensor]:
+        if key is None or self.budget_bytes == 0:
+            return None
+        with self._lock:
+            frames = self._entries.get(key)
+            if frames is not None:
+                self._entries.move_to_end(key)
+            return frames
+
+    def put(self, key: Optional[tuple], frames: torch.Tensor) -> None:
+        size = frames.numel() * frames.element_size()
+        if key is None or size == 0 or size > self.budget_bytes:
+            return
+        frames = frames.clone()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.numel() * old.element_size()
+            # Entries for replaced files are never hit again and age out here
+            while self._entries and self._bytes + size > self.budget_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.numel() * evicted.element_size()
+            self._entries[key] = frames
+            self._bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+frame_cache = FrameCache(CONFIG.get("video_cache_mb", 0) * 1024 * 1024)
+
+
+def open_video(video_path: str) -> cv2.VideoCapture:
+    if not os.path.exists(video_path):
+        raise ValueError(f"Video file not found: {video_path}")
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        cap.release()
+        raise ValueError(f"Could not open video file: {video_path}")
+    return cap
+
+
+class VideoInfo:
+    __slots__ = ("frame_count", "width", "height", "fps")
+
+    def __init__(self, frame_count: int, width: int, height: int, fps: float):
+        self.frame_count = frame_count
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+
+def probe_video(video_path: str) -> VideoInfo:
+    # Read frame count, resolution and fps from the container without decoding.
+    cap = open_video(video_path)
+    try:
+        info = VideoInfo(
+            int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            cap.get(cv2.CAP_PROP_FPS),
+        )
+    finally:
+        cap.release()
+    cstr(f"Video {video_path}: {info.frame_count} frames, {info.fps} fps").msg.print()
+    return info
+
+
+SEEK_MIN_FRAMES = 24  # below this many frames, skipping with grab() is cheaper than a seek
+
+
+def seek_to_frame(cap: cv2.VideoCapture, video_path: str, start: int) -> Tuple[cv2.VideoCapture, bool]:
+    # Position `cap` so the next read() returns frame `start`. Long skips use
+    # a container seek (keyframe + decode forward inside the demuxer); if the
+    # backend can't seek accurately the clip is reopened and frames are
+    # skipped with grab(), which decodes but never retrieves or converts them.
+    # Returns the (possibly reopened) capture and False if the clip is shorter
+    # than `start`.
+    if start <= 0:
+        return cap, True
+    if start >= SEEK_MIN_FRAMES:
+        try:
+            if cap.set(cv2.CAP_PROP_POS_FRAMES, start) and int(round(cap.get(cv2.CAP_PROP_POS_FRAMES))) == start:
+                return cap, True
+        except cv2.error:
+            pass
+        cap.release()
+        cap = open_video(video_path)
+    for _ in range(start):
+        if not cap.grab():
+            return cap, False
+    return cap, True
+
+
+def _frame_to_slot(frame_bgr: np.ndarray, rgb: np.ndarray, slot: torch.Tensor) -> None:
+    # BGR uint8 -> RGB float32 0..1, written in place into slot
+    cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+    slot.copy_(torch.from_numpy(rgb)).div_(255.0)
+
+
+def _check_frame(frame: np.ndarray, height: int, width: int, video_path: str) -> None:
+    if frame.shape[0] != height or frame.shape[1] != width:
+        raise ValueError(
+            f"Frame size {frame.shape[1]}x{frame.shape[0]} in {video_path} does not match expected {width}x{height}"
+        )
+
+
+def decode_video_into(video_path: str, out: torch.Tensor, start: int = 0) -> int:
+    # Decode frames [start, start + len(out)) of a clip into `out` and return
+    # how many frames were actually available. Frames outside the range are
+    # never retrieved or color-converted.
+    count, height, width = out.shape[0], out.shape[1], out.shape[2]
+    if count == 0:
+        return 0
+    cap = open_video(video_path)
+    try:
+        cap, ok = seek_to_frame(cap, video_path, start)
+        if not ok:
+            return 0
+        rgb = np.empty((height, width, 3), dtype=np.uint8)
+        n = 0
+        while n < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            _check_frame(frame, height, width, video_path)
+            _frame_to_slot(frame, rgb, out[n])
+            n += 1
+        return n
+    finally:
+        cap.release()
+
+
+def load_video_frames(video_path: str, max_frames: Optional[int] = None, start: int = 0) -> torch.Tensor:
+    # Load a clip (or the part of it from `start`, up to max_frames) into a new
+    # preallocated tensor sized from CAP_PROP_FRAME_COUNT. The buffer grows
+    # only if the container under-reports its frame count.
+    cap = open_video(video_path)
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        cstr(f"Video {video_path}: {total_frames} frames, {fps} fps").msg.print()
+        cap, _ = seek_to_frame(cap, video_path, start)
+        ret, frame = cap.read()
+        if not ret:
+            raise ValueError(f"No frames could be loaded from video: {video_path}")
+        height, width = frame.shape[:2]
+        capacity = max(1, total_frames - start)
+        if max_frames:
+            capacity = min(capacity, max_frames)
+        out = torch.empty((capacity, height, width, 3), dtype=torch.float32)
+        rgb = np.empty((height, width, 3), dtype=np.uint8)
+        n = 0
+        while ret:
+            _check_frame(frame, height, width, video_path)
+            if n == out.shape[0]:
+                grow = max(16, n // 2)
+                if max_frames:
+                    grow = min(grow, max_frames - n)
+                grown = torch.empty((n + grow, height, width, 3), dtype=torch.float32)
+                grown[:n].copy_(out)
+                out = grown
+            _frame_to_slot(frame, rgb, out[n])
+            n += 1
+            if max_frames and n >= max_frames:
+                break
+            ret, frame = cap.read()
+    finally:
+        cap.release()
+    cstr(f"Successfully loaded {n} frames from {video_path}").msg.print()
+    return out[:n] if n < out.shape[0] else out
+
+
+class FrameSegment:
+    # One contiguous run of output frames: either `count` frames of a clip
+    # starting at `start` (count=None means to the end of the clip), or
+    # `count` solid frames of value `fill` when path is None.
+    __slots__ = ("path", "start", "count", "fill")
+
+    def __init__(self, path: Optional[str] = None, start: int = 0, count: Optional[int] = None,
+                 fill: Optional[float] = None):
+        self.path = path
+        self.start = max(0, int(start))
+        self.count = None if count is None else max(0, int(count))
+        self.fill = fill
+
+
+def _resolve_segments(segments: Sequence[FrameSegment]) -> Tuple[List[int], int, int]:
+    # Planned frame count per segment plus the common output resolution.
+    counts: List[int] = []
+    size: Optional[Tuple[int, int]] = None
+    for seg in segments:
+        if seg.path is None:
+            counts.append(seg.count or 0)
+            continue
+        cached = frame_cache.get(FrameCache.make_key(seg.path, seg.start, seg.count))
+        if cached is not None:
+            info = VideoInfo(seg.start + cached.shape[0], cached.shape[2], cached.shape[1], 0.0)
+        else:
+            info = probe_video(seg.path)
+        if info.width <= 0 or info.height <= 0:
+            raise ValueError(f"Could not read resolution of video file: {seg.path}")
+        if size is None:
+            size = (info.height, info.width)
+        elif size != (info.height, info.width):
+            raise ValueError(
+                f"Video {seg.path} is {info.width}x{info.height}, expected {size[1]}x{size[0]} like the previous clips"
+            )
+        if cached is not None:
+            counts.append(cached.shape[0])
+        elif info.frame_count > 0:
+            available = max(0, info.frame_count - seg.start)
+            counts.append(available if seg.count is None else min(seg.count, available))
+        else:
+            # Container doesn't report a frame count; decoded separately
+            counts.append(-1)
+    if size is None:
+        raise ValueError("No video clips to load")
+    return counts, size[0], size[1]
+
+
+def _compact(out: torch.Tensor, offsets: List[int], decoded: List[int]) -> int:
+    # Close the gaps left by segments that delivered fewer frames than
+    # planned. Frames only ever move towards the front, one at a time in
+    # ascending order, so source and destination never overlap.
+    cursor = 0
+    for offset, got in zip(offsets, decoded):
+        if cursor != offset:
+            for j in range(got):
+                out[cursor + j].copy_(out[offset + j])
+        cursor += got
+    return cursor
+
+
+def load_segments(segments: Sequence[FrameSegment], workers: int = 1) -> torch.Tensor:
+    # Decode all segments into one preallocated [N,H,W,3] float32 tensor.
+    # Each segment owns a precomputed slice, so with workers > 1 the clips
+    # are decoded concurrently (OpenCV releases the GIL while decoding) and
+    # the output order is still exactly the segment order. If a clip
+    # delivers fewer frames than its container reported, later segments
+    # move up and the result is trimmed at the end.
+    counts, height, width = _resolve_segments(segments)
+    predecoded = {}
+    for i, (seg, count) in enumerate(zip(segments, counts)):
+        if count < 0:
+            if seg.count == 0:
+                counts[i] = 0
+                continue
+            predecoded[i] = load_video_frames(seg.path, seg.count, seg.start)
+            counts[i] = predecoded[i].shape[0]
+    offsets = []
+    total = 0
+    for count in counts:
+        offsets.append(total)
+        total += count
+    out = torch.empty((total, height, width, 3), dtype=torch.float32)
+
+    def run(i: int) -> int:
+        seg, offset, count = segments[i], offsets[i], counts[i]
+        target = out[offset:offset + count]
+        if seg.path is None:
+            target.fill_(seg.fill or 0.0)
+            return count
+        key = FrameCache.make_key(seg.path, seg.start, seg.count)
+        cached = frame_cache.get(key)
+        if cached is not None and cached.shape[0] == count:
+            target.copy_(cached)
+            cstr(f"Reused {count} cached frames from {seg.path}").msg.print()
+            return count
+        if i in predecoded:
+            target.copy_(predecoded.pop(i))
+            decoded = count
+        else:
+            decoded = decode_video_into(seg.path, target, seg.start)
+            cstr(f"Successfully loaded {decoded} frames from {seg.path}").msg.print()
+        frame_cache.put(key, target[:decoded])
+        return decoded
+
+    clips = sum(1 for seg in segments if seg.path is not None)
+    workers = max(1, min(int(workers or 1), clips))
+    if workers == 1:
+        decoded = [run(i) for i in range(len(segments))]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rvtools-decode") as pool:
+            decoded = list(pool.map(run, range(len(segments))))
+
+    cursor = _compact(out, offsets, decoded)
+    return out[:cursor] if cursor < out.shape[0] else out
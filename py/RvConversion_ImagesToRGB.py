@@ -8,12 +8,7 @@ import numpy as np
 
 from PIL import Image
 from ..core import CATEGORY
-
-def tensor2pil(image):
-    return Image.fromarray(np.clip(255. * image.cpu().numpy().squeeze(), 0, 255).astype(np.uint8))
-
-def pil2tensor(image):
-    return torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
+from ..core.image_utils import images_to_uint8, pil2tensor, tensor2pil
 
 
 class RvConversion_ImagesToRGB:
@@ -54,8 +49,8 @@ class RvConversion_ImagesToRGB:
             if is_rgb_tensor(images):
                 return (images, )
             if images.ndim == 4:
-                # Convert each image in batch
-                tensors = [convert_to_rgb(images[i]) for i in range(images.shape[0])]
+                # Quantize the whole batch once, then convert each frame
+                tensors = [pil2tensor(Image.fromarray(np.squeeze(frame)).convert('RGB')) for frame in images_to_uint8(images)]
                 tensors = torch.cat(tensors, dim=0)
                 return (tensors, )
             # Single image tensor (shape [C, H, W])
@@ -10,259 +10,21 @@ import torch
 import numpy as np
 import folder_paths
 import safetensors.torch
-import hashlib
-import requests
-import json
 import re
 
 from io import BytesIO
-from PIL import Image, ImageOps, ImageSequence, ImageFile, ImageEnhance, ImageFilter
+from PIL import Image, ImageOps, ImageFile, ImageEnhance, ImageFilter
 from PIL.PngImagePlugin import PngInfo
-from xml.dom import minidom
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "comfy"))
 
 from ..core import CATEGORY
-from ..core.common import SCHEDULERS_ANY
+from ..core.fingerprint import file_fingerprint
+from ..core.metadata_parsers import extract_metadata
 
 #credits to comfyanonymous for the initial code of the image load node, which was modified for this project
 #credits to https://github.com/Jordach/comfy-plasma for the initial code of the metadata extraction, which was modified for this project
 
-EASYDIFFUSION_MAPPING_A = {
-	"prompt": "Prompt",
-	"negative_prompt": "Negative Prompt",
-	"seed": "Seed",
-	"use_stable_diffusion_model": "Stable Diffusion model",
-	"clip_skip": "Clip Skip",
-	"use_vae_model": "VAE model",
-	"sampler_name": "Sampler",
-	"width": "Width",
-	"height": "Height",
-	"num_inference_steps": "Steps",
-	"guidance_scale": "Guidance Scale",
-}
-
-EASYDIFFUSION_MAPPING_B = {
-	"prompt": "prompt",
-	"negative_prompt": "negative_prompt",
-	"seed": "seed",
-	"use_stable_diffusion_model": "use_stable_diffusion_model",
-	"clip_skip": "clip_skip",
-	"use_vae_model": "use_vae_model",
-	"sampler_name": "sampler_name",
-	"width": "width",
-	"height": "height",
-	"num_inference_steps": "num_inference_steps",
-	"guidance_scale": "guidance_scale",
-}
-
-def handle_auto1111(params):
-	if params and "\nSteps:" in params:
-		# has a negative:
-		if "Negative prompt:" in params:
-			prompt_index = [params.index("\nNegative prompt:"), params.index("\nSteps:")]
-			neg = params[prompt_index[0] + 1 + len("Negative prompt: "):prompt_index[-1]]
-		else:
-			index = [params.index("\nSteps:")]
-			neg = ""
-
-		pos = params[:prompt_index[0]]
-		return pos, neg
-	elif params:
-		# has a negative:
-		if "Negative prompt:" in params:
-			prompt_index = [params.index("\nNegative prompt:")]
-			neg = params[prompt_index[0] + 1 + len("Negative prompt: "):]
-		else:
-			index = [len(params)]
-			neg = ""
-		
-		pos = params[:prompt_index[0]]
-		return pos, neg
-	else:
-		return "", ""
-
-def handle_ezdiff(params):
-	data = json.loads(params)
-	if data.get("prompt"):
-		ed = EASYDIFFUSION_MAPPING_B
-	else:
-		ed = EASYDIFFUSION_MAPPING_A
-
-	pos = data.get(ed["prompt"])
-	data.pop(ed["prompt"])
-	neg = data.get(ed["negative_prompt"])
-	return pos, neg
-
-def handle_invoke_modern(params):
-	meta = json.loads(params.get("sd-metadata"))
-	img = meta.get("image")
-	prompt = img.get("prompt")
-	index = [prompt.rfind("["), prompt.rfind("]")]
-
-	# negative
-	if -1 not in index:
-		pos = prompt[:index[0]]
-		neg = prompt[index[0] + 1:index[1]]
-		return pos, neg
-	else:
-		return prompt, ""
-
-def handle_invoke_legacy(params):
-	dream = params.get("Dream")
-	pi = dream.rfind('"')
-	ni = [dream.rfind("["), dream.rfind("]")]
-
-	# has neg
-	if -1 not in ni:
-		pos = dream[1:ni[0]]
-		neg = dream[ni[0] + 1:ni[1]]
-		return pos, neg
-	else:
-		pos = dream[1:pi]
-		return pos, ""
-
-def handle_novelai(params):
-	pos = params.get("Description")
-	comment = params.get("Comment") or {}
-	comment_json = json.loads(comment)
-	neg = comment_json.get("uc")
-	return pos, neg
-
-def handle_qdiffusion(params):
-	pass
-
-def handle_comfyui(params):
-	"""Extract generation data from ComfyUI embedded metadata"""
-	gen_data = {}
-	
-	# Extract parameters (generation settings)
-	if "parameters" in params:
-		gen_data["parameters"] = params["parameters"]
-	
-	# Extract workflow data
-	if "workflow" in params:
-		try:
-			gen_data["workflow"] = json.loads(params["workflow"])
-		except:
-			gen_data["workflow"] = params["workflow"]
-	
-	# Extract LORA weights
-	if "lora_weights" in params:
-		try:
-			gen_data["lora_weights"] = json.loads(params["lora_weights"])
-		except:
-			gen_data["lora_weights"] = params["lora_weights"]
-	
-	# Parse generation parameters string for structured data
-	if "parameters" in gen_data:
-		params_str = gen_data["parameters"]
-		if "Steps:" in params_str:
-			# Extract individual parameters
-			try:
-				# Steps
-				if "Steps: " in params_str:
-					steps_start = params_str.find("Steps: ") + 7
-					steps_end = params_str.find(",", steps_start)
-					if steps_end == -1:
-						steps_end = params_str.find("\n", steps_start)
-					gen_data["steps"] = int(params_str[steps_start:steps_end].strip())
-				
-				# Sampler
-				if "Sampler: " in params_str:
-					sampler_start = params_str.find("Sampler: ") + 9
-					sampler_end = params_str.find(",", sampler_start)
-					if sampler_end == -1:
-						sampler_end = params_str.find("\n", sampler_start)
-					gen_data["sampler"] = params_str[sampler_start:sampler_end].strip()
-				
-				# Separate scheduler from sampler if embedded
-				if "sampler" in gen_data and gen_data["sampler"]:
-					sampler_full = gen_data["sampler"]
-					# Check if sampler ends with a known scheduler (case-insensitive)
-					for sched in SCHEDULERS_ANY:
-						if sampler_full.lower().endswith(' ' + sched.lower()):
-							# Find the actual scheduler in the string (preserve original case)
-							sched_start = sampler_full.lower().rfind(' ' + sched.lower())
-							if sched_start >= 0:
-								actual_sched = sampler_full[sched_start + 1:]
-								gen_data["sampler"] = sampler_full[:sched_start].strip()
-								gen_data["scheduler"] = actual_sched
-								break
-						elif sampler_full.lower().endswith(sched.lower()):
-							# Find the actual scheduler in the string (preserve original case)
-							sched_start = sampler_full.lower().rfind(sched.lower())
-							if sched_start >= 0:
-								actual_sched = sampler_full[sched_start:]
-								gen_data["sampler"] = sampler_full[:sched_start].strip()
-								gen_data["scheduler"] = actual_sched
-								break
-				
-				# CFG scale
-				if "CFG scale: " in params_str:
-					cfg_start = params_str.find("CFG scale: ") + 11
-					cfg_end = params_str.find(",", cfg_start)
-					if cfg_end == -1:
-						cfg_end = params_str.find("\n", cfg_start)
-					gen_data["cfg_scale"] = float(params_str[cfg_start:cfg_end].strip())
-				
-				# Seed
-				if "Seed: " in params_str:
-					seed_start = params_str.find("Seed: ") + 6
-					seed_end = params_str.find(",", seed_start)
-					if seed_end == -1:
-						seed_end = params_str.find("\n", seed_start)
-					gen_data["seed"] = int(params_str[seed_start:seed_end].strip())
-				
-				# Size
-				if "Size: " in params_str:
-					size_start = params_str.find("Size: ") + 6
-					size_end = params_str.find(",", size_start)
-					if size_end == -1:
-						size_end = params_str.find("\n", size_start)
-					size_str = params_str[size_start:size_end].strip()
-					if "x" in size_str:
-						width, height = size_str.split("x")
-						gen_data["width_param"] = int(width.strip())
-						gen_data["height_param"] = int(height.strip())
-				
-				# Model hashes
-				if "Hashes: " in params_str:
-					hashes_start = params_str.find("Hashes: ") + 8
-					hashes_end = params_str.find("}", hashes_start) + 1
-					if hashes_end > hashes_start:
-						hashes_str = params_str[hashes_start:hashes_end]
-						try:
-							gen_data["model_hashes"] = json.loads(hashes_str)
-						except:
-							gen_data["model_hashes"] = hashes_str
-				
-				# Version
-				if "Version: " in params_str:
-					version_start = params_str.find("Version: ") + 9
-					version_end = params_str.find("\n", version_start)
-					if version_end == -1:
-						version_end = len(params_str)
-					gen_data["version"] = params_str[version_start:version_end].strip()
-					
-			except Exception as e:
-				# If parsing fails, just continue
-				pass
-	
-	return gen_data
-	
-def handle_drawthings(params):
-	try:
-		data = minidom.parseString(params.get("XML:com.adobe.xmp"))
-		data_json = json.loads(data.getElementByTagName("exif:UserComment")[0].childNodes[1].childNodes[1].childNodes[0].data)
-	except:
-		return "", ""
-	else:
-		pos = data_json.get("c")
-		neg = data_json.get("uc")
-		return pos, neg
-
-
 class RvImage_LoadImageDrop:
 	@classmethod
 	def INPUT_TYPES(s):
@@ -271,6 +33,12 @@ class RvImage_LoadImageDrop:
 		files = folder_paths.filter_files_content_types(files, ["image"])
 		return {"required":
 					{"image": (sorted(files), {"image_upload": True})},
+				"optional":
+					{
+						"start_frame": ("INT", {"default": 0, "min": 0, "max": 0xffffffff, "step": 1, "tooltip": "First frame to load from animated or multi-page images."}),
+						"frame_count": ("INT", {"default": 0, "min": 0, "max": 0xffffffff, "step": 1, "tooltip": "Maximum number of frames to load (0 for all)."}),
+						"frame_stride": ("INT", {"default": 1, "min": 1, "max": 0xffffffff, "step": 1, "tooltip": "Load every Nth frame."}),
+					}
 				}
 
 	CATEGORY = CATEGORY.MAIN.value + CATEGORY.IMAGE.value
@@ -279,159 +47,89 @@ class RvImage_LoadImageDrop:
 	RETURN_NAMES = ("image", "mask", "pipe")
 	FUNCTION = "load_image"
 
-	def load_image(self, image):
+	def load_image(self, image, start_frame=0, frame_count=0, frame_stride=1):
 		image_path = folder_paths.get_annotated_filepath(image)
 
 		img = Image.open(image_path)
-
-		output_images = []
-		output_masks = []
-		w, h = None, None
+		info = dict(img.info)
+		image_format = img.format
 
 		excluded_formats = ['MPO']
 
-		for i in ImageSequence.Iterator(img):
-			i = ImageOps.exif_transpose(i)
+		# Work out which frames are wanted before decoding anything, so the
+		# output tensors can be allocated once and filled in place.
+		n_frames = getattr(img, "n_frames", 1) if image_format not in excluded_formats else 1
+		frame_stride = max(1, int(frame_stride))
+		indices = range(min(max(0, int(start_frame)), n_frames - 1), n_frames, frame_stride)
+		if frame_count > 0:
+			indices = indices[:frame_count]
+
+		output_image = None
+		output_mask = None
+		w, h = None, None
+		filled = 0
+
+		for index in indices:
+			img.seek(index)
+			i = ImageOps.exif_transpose(img)
 
 			if i.mode == 'I':
 				i = i.point(lambda i: i * (1 / 255))
 			image_rgb = i.convert("RGB")
 
-			if len(output_images) == 0:
+			if output_image is None:
 				w = image_rgb.size[0]
 				h = image_rgb.size[1]
+				output_image = torch.empty((len(indices), h, w, 3), dtype=torch.float32)
 
 			if image_rgb.size[0] != w or image_rgb.size[1] != h:
 				continue
 
-			image_tensor = np.array(image_rgb).astype(np.float32) / 255.0
-			image_tensor = torch.from_numpy(image_tensor)[None,]
+			# uint8 -> float32 happens in the copy; scaling is done once at the end
+			output_image[filled].copy_(torch.from_numpy(np.asarray(image_rgb)))
 			if 'A' in i.getbands():
-				mask = np.array(i.getchannel('A')).astype(np.float32) / 255.0
-				mask = 1. - torch.from_numpy(mask)
-			else:
-				mask = torch.zeros((64,64), dtype=torch.float32, device="cpu")
-			output_images.append(image_tensor)
-			output_masks.append(mask.unsqueeze(0))
-
-		if len(output_images) > 1 and img.format not in excluded_formats:
-			output_image = torch.cat(output_images, dim=0)
-			output_mask = torch.cat(output_masks, dim=0)
+				if output_mask is None:
+					# Frames before the first one with alpha get an opaque mask
+					output_mask = torch.full((len(indices), h, w), 255.0, dtype=torch.float32)
+				output_mask[filled].copy_(torch.from_numpy(np.asarray(i.getchannel('A'))))
+			elif output_mask is not None:
+				output_mask[filled].fill_(255.0)
+			filled += 1
+
+		output_image = output_image[:filled].div_(255.0)
+		if output_mask is not None:
+			output_mask = torch.sub(1.0, output_mask[:filled].div_(255.0))
 		else:
-			output_image = output_images[0]
-			output_mask = output_masks[0]
+			output_mask = torch.zeros((filled, 64, 64), dtype=torch.float32, device="cpu")
 
 		# Extract metadata and create pipe
-		prompt = ""
-		negative = ""
-		generation_data = "{}"
-		steps = 0
-		sampler = ""
-		scheduler = ""
-		cfg_scale = 0.0
-		seed = 0
-		model_hash = ""
-		model_hashes = {}  # Initialize model_hashes to avoid NameError
-		version = ""
-		comfyui_processed = False
-		
-		if img.format == "PNG" or ("parameters" in img.info or "workflow" in img.info or "lora_weights" in img.info):
-			if "parameters" in img.info or "workflow" in img.info or "lora_weights" in img.info:
-				gen_data = handle_comfyui(img.info)
-				if gen_data:
-					generation_data = json.dumps(gen_data)
-					comfyui_processed = True
-					# Extract individual values
-					steps = gen_data.get("steps", 0)
-					sampler = gen_data.get("sampler", "")
-					scheduler = gen_data.get("scheduler", "")
-					cfg_scale = gen_data.get("cfg_scale", 0.0)
-					seed = gen_data.get("seed", 0)
-					model_hashes = gen_data.get("model_hashes", {})
-					model_hash = json.dumps(model_hashes) if isinstance(model_hashes, dict) else str(model_hashes)
-					version = gen_data.get("version", "")
-					# Extract prompts from ComfyUI parameters if available
-					if "parameters" in gen_data:
-						params_str = gen_data["parameters"]
-						if "Negative prompt:" in params_str:
-							# Split positive and negative prompts
-							parts = params_str.split("Negative prompt:")
-							if len(parts) >= 2:
-								prompt = parts[0].strip()
-								# Extract negative prompt up to the generation parameters
-								neg_part = parts[1]
-								if "Steps:" in neg_part:
-									negative = neg_part.split("Steps:")[0].strip()
-								else:
-									negative = neg_part.strip()
-						else:
-							# No negative prompt, just positive
-							if "Steps:" in params_str:
-								prompt = params_str.split("Steps:")[0].strip()
-							else:
-								prompt = params_str.strip()
-			
-			# auto1111 (only if ComfyUI data not found)
-			elif "parameters" in img.info and not comfyui_processed:
-				params = img.info.get("parameters")
-				prompt, negative = handle_auto1111(params)
-
-			# easy diffusion
-			elif "negative_prompt" in img.info or "Negative Prompt" in img.info:
-				params = str(img.info).replace("'", '"')
-				prompt, negative = handle_ezdiff(params)
-			# invokeai modern
-			elif "sd-metadata" in img.info:
-				prompt, negative = handle_invoke_modern(img.info)
-			# legacy invokeai
-			elif "Dream" in img.info:
-				prompt, negative = handle_invoke_legacy(img.info)
-			# novelai
-			elif img.info.get("Software") == "NovelAI":
-				prompt, negative = handle_novelai(img.info)
-			# qdiffusion
-			# elif ????:
-			# drawthings (iPhone, iPad, macOS)
-			elif "XML:com.adobe.xmp" in img.info:
-				prompt, negative = handle_drawthings(img.info)
-		
-		# Create pipe dict with all extracted data
-		# Extract model name from hashes if available
-		model_name = ""
-		if isinstance(model_hashes, dict):
-			for key in model_hashes.keys():
-				if key.startswith("Model:"):
-					model_name = key.replace("Model:", "", 1)
-					break
+		meta = extract_metadata(info, image_format)
 		
 		pipe = {
 			"images": output_image,
 			"mask": output_mask,
-			"steps": steps,
-			"sampler": sampler,
-			"scheduler": scheduler,
-			"cfg": cfg_scale,
-			"seed": seed,
+			"steps": meta["steps"],
+			"sampler": meta["sampler"],
+			"scheduler": meta["scheduler"],
+			"cfg": meta["cfg"],
+			"seed": meta["seed"],
 			"width": w,
 			"height": h,
-			"text_pos": prompt,
-			"text_neg": negative,
-			"model_name": model_name,
+			"text_pos": meta["text_pos"],
+			"text_neg": meta["text_neg"],
+			"model_name": meta["model_name"],
 			"path": '',
 		}
 		
 		return (output_image, output_mask, pipe)
 
 	@classmethod
-	def IS_CHANGED(s, image):
+	def IS_CHANGED(s, image, **kwargs):
 		image_path = folder_paths.get_annotated_filepath(image)
-		m = hashlib.sha256()
-		with open(image_path, 'rb') as f:
-			m.update(f.read())
-		return m.digest().hex()
+		return file_fingerprint(image_path)
 
 	@classmethod
-	def VALIDATE_INPUTS(s, image):
+	def VALIDATE_INPUTS(s, image, **kwargs):
 		if not folder_paths.exists_annotated_filepath(image):
 			return "Invalid image file: {}".format(image)
 
@@ -0,0 +1,277 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+import threading
+import torch
+import numpy as np
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image, ImageOps
+
+from ..core import CATEGORY, cstr
+from ..core.config import CONFIG
+from ..core.metadata_parsers import extract_metadata
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tiff', '.tif', '.gif')
+MAX_WORKERS = 16
+
+# Sorted image listings per directory, revalidated by the directory's mtime
+_listing_cache: Dict[str, Tuple[int, List[str]]] = {}
+_listing_lock = threading.Lock()
+
+# Decoded images fetched ahead of the next run, keyed by path and validated by
+# stat. Holds only the window requested by the last run, within PREFETCH_MAX_BYTES.
+PREFETCH_MAX_BYTES = max(0, CONFIG.get("prefetch_mb", 1024)) * 1024 * 1024
+_prefetched: "OrderedDict[str, Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+_prefetch_window: set = set()
+_prefetch_bytes = 0
+_prefetch_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="rvtools-dirload")
+        return _pool
+
+
+def list_directory_images(directory: str) -> List[str]:
+    # Sorted full paths of the images in directory; rescanned only when the
+    # directory's mtime changes.
+    directory = os.path.abspath(directory)
+    mtime = os.stat(directory).st_mtime_ns
+    with _listing_lock:
+        cached = _listing_cache.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with os.scandir(directory) as entries:
+        files = sorted(e.path for e in entries if e.is_file() and e.name.lower().endswith(IMAGE_EXTENSIONS))
+    with _listing_lock:
+        _listing_cache[directory] = (mtime, files)
+    return files
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _decode(path: str) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, Any]]:
+    # Decode one image to uint8 RGB (+ alpha) and return its text metadata.
+    with Image.open(path) as img:
+        info = dict(img.info)
+        img = ImageOps.exif_transpose(img)
+        if img.mode == 'I':
+            img = img.point(lambda i: i * (1 / 255))
+        alpha = np.asarray(img.getchannel('A')) if 'A' in img.getbands() else None
+        rgb = np.asarray(img.convert("RGB"))
+    return rgb, alpha, info
+
+
+def _decoded_size(decoded: Tuple[np.ndarray, Optional[np.ndarray], Dict[str, Any]]) -> int:
+    rgb, alpha, _ = decoded
+    return rgb.nbytes + (alpha.nbytes if alpha is not None else 0)
+
+
+def _drop_prefetched(path: str) -> Optional[Tuple[Tuple[int, int], Any, int]]:
+    # Caller holds _prefetch_lock
+    global _prefetch_bytes
+    entry = _prefetched.pop(path, None)
+    if entry is not None:
+        _prefetch_bytes -= entry[2]
+    return entry
+
+
+def _load(path: str) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, Any]]:
+    key = _stat_key(path)
+    with _prefetch_lock:
+        cached = _drop_prefetched(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    return _decode(path)
+
+
+def _prefetch(paths: List[str]) -> None:
+    # Decode upcoming images in the background so the next run finds them ready.
+    # Entries outside the new window are dropped, and fetching stops once the
+    # cache would exceed PREFETCH_MAX_BYTES.
+    global _prefetch_window
+    window = set(paths)
+    with _prefetch_lock:
+        _prefetch_window = window
+        for path in [p for p in _prefetched if p not in window]:
+            _drop_prefetched(path)
+
+    def fetch(path):
+        global _prefetch_bytes
+        try:
+            with _prefetch_lock:
+                if path not in _prefetch_window or _prefetch_bytes >= PREFETCH_MAX_BYTES:
+                    return
+            key = _stat_key(path)
+            with _prefetch_lock:
+                if path in _prefetched and _prefetched[path][0] == key:
+                    return
+            decoded = _decode(path)
+            size = _decoded_size(decoded)
+            with _prefetch_lock:
+                # A later run may have moved the window while this one decoded
+                if path not in _prefetch_window or _prefetch_bytes + size > PREFETCH_MAX_BYTES:
+                    return
+                _drop_prefetched(path)
+                _prefetched[path] = (key, decoded, size)
+                _prefetch_bytes += size
+        except Exception as e:
+            cstr(f"Prefetch failed for {path}: {e}").debug.print()
+
+    pool = _get_pool()
+    for path in paths:
+        pool.submit(fetch, path)
+
+
+def select_batch(pipe: Any) -> Tuple[str, List[str], int, int]:
+    # (directory, sorted listing, start, stop) selected by a Load Directory
+    # Settings pipe. Raises ValueError for a bad pipe or directory.
+    if not isinstance(pipe, dict):
+        raise ValueError("RvImage_LoadImageDirectory expects a dict-style Load Directory Settings pipe.")
+    directory = str(pipe.get("directory") or pipe.get("path") or "").replace('"', "")
+    if not directory or not os.path.isdir(directory):
+        raise ValueError(f"Directory not found: {directory}")
+    start_index = max(0, int(pipe.get("start_index") or 0))
+    load_cap = int(pipe.get("load_cap") or 0)
+
+    files = list_directory_images(directory)
+    if start_index >= len(files):
+        raise ValueError(f"start_index {start_index} is beyond the {len(files)} images in {directory}")
+    stop = len(files) if load_cap <= 0 else min(len(files), start_index + load_cap)
+    return directory, files, start_index, stop
+
+
+def metadata_pipe(info: Dict[str, Any], path: str, image: torch.Tensor, mask: torch.Tensor) -> Dict[str, Any]:
+    # Build a Load Image style metadata pipe from the image's embedded metadata.
+    meta = extract_metadata(info, "PNG" if path.lower().endswith(".png") else "")
+    return {
+        "images": image,
+        "mask": mask,
+        "steps": meta["steps"],
+        "sampler": meta["sampler"],
+        "scheduler": meta["scheduler"],
+        "cfg": meta["cfg"],
+        "seed": meta["seed"],
+        "width": image.shape[2],
+        "height": image.shape[1],
+        "text_pos": meta["text_pos"],
+        "text_neg": meta["text_neg"],
+        "model_name": meta["model_name"],
+        "path": path,
+    }
+
+
+class RvImage_LoadImageDirectory:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "pipe": ("pipe", {"tooltip": "Load Directory Settings pipe (directory, start_index, load_cap)."}),
+                "workers": ("INT", {"default": 4, "min": 1, "max": MAX_WORKERS, "step": 1, "tooltip": "Number of images decoded in parallel."}),
+                "prefetch": ("INT", {"default": 0, "min": 0, "max": 4096, "step": 1, "tooltip": "Number of following images decoded in the background for the next run (0 disables). Limited to RVTOOLSX_PREFETCH_MB of decoded pixels."}),
+                "emit_metadata": ("BOOLEAN", {"default": False, "tooltip": "Output one metadata pipe per image, parsed from embedded generation data."}),
+            },
+        }
+
+    CATEGORY = CATEGORY.MAIN.value + CATEGORY.IMAGE.value
+
+    RETURN_TYPES = ("IMAGE", "MASK", "STRING", "pipe")
+    RETURN_NAMES = ("images", "masks", "files", "metadata_pipes")
+    OUTPUT_IS_LIST = (False, False, False, True)
+    FUNCTION = "load_images"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # The directory comes in through the linked pipe, which IS_CHANGED never
+        # sees, so the folder contents can't be checked here. Always re-run; the
+        # cached listing and the prefetch keep repeated runs cheap.
+        return float("nan")
+
+    def load_images(self, pipe, workers=4, prefetch=0, emit_metadata=False):
+        directory, files, start_index, stop = select_batch(pipe)
+        batch = files[start_index:stop]
+
+        # The first image fixes the batch resolution; the rest decode in
+        # parallel straight into their slot of the preallocated tensor.
+        rgb, alpha, info = _load(batch[0])
+        height, width = rgb.shape[:2]
+        images = torch.empty((len(batch), height, width, 3), dtype=torch.float32)
+        masks = torch.zeros((len(batch), height, width), dtype=torch.float32)
+        infos: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+
+        def store(index, decoded):
+            rgb, alpha, info = decoded
+            if rgb.shape[:2] != (height, width):
+                cstr(f"Skipping {batch[index]}: {rgb.shape[1]}x{rgb.shape[0]} does not match batch size {width}x{height}").warning.print()
+                return False
+            images[index].copy_(torch.from_numpy(rgb)).div_(255.0)
+            if alpha is not None:
+                masks[index].copy_(torch.from_numpy(alpha)).div_(255.0)
+                torch.sub(1.0, masks[index], out=masks[index])
+            infos[index] = info
+            return True
+
+        def work(index):
+            try:
+                return store(index, _load(batch[index]))
+            except Exception as e:
+                cstr(f"Unable to load {batch[index]}: {e}").warning.print()
+                return False
+
+        ok = [store(0, (rgb, alpha, info))]
+        if len(batch) > 1:
+            if workers > 1:
+                pool = _get_pool()
+                # Bound in-flight decodes to the requested worker count
+                for chunk_start in range(1, len(batch), workers):
+                    ok.extend(pool.map(work, range(chunk_start, min(len(batch), chunk_start + workers))))
+            else:
+                ok.extend(work(i) for i in range(1, len(batch)))
+
+        if not all(ok):
+            keep = [i for i, good in enumerate(ok) if good]
+            index = torch.tensor(keep, dtype=torch.long)
+            images = images.index_select(0, index)
+            masks = masks.index_select(0, index)
+            batch = [batch[i] for i in keep]
+            infos = [infos[i] for i in keep]
+
+        if prefetch > 0 and stop < len(files):
+            _prefetch(files[stop:stop + prefetch])
+
+        pipes = []
+        if emit_metadata:
+            for i, path in enumerate(batch):
+                pipes.append(metadata_pipe(infos[i] or {}, path, images[i:i + 1], masks[i:i + 1]))
+
+        cstr(f"Loaded {len(batch)} images from {directory} [{start_index}:{stop}]").msg.print()
+        return (images, masks, "\n".join(batch), pipes)
+
+
+NODE_NAME = 'Load Images from Directory [RvTools-X]'
+NODE_DESC = 'Load Images from Directory'
+
+NODE_CLASS_MAPPINGS = {
+    NODE_NAME: RvImage_LoadImageDirectory
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    NODE_NAME: NODE_DESC
+}
@@ -10,257 +10,32 @@ import torch
 import numpy as np
 import folder_paths
 import safetensors.torch
-import hashlib
-import requests
-import json
 import re
 
 from io import BytesIO
 from PIL import Image, ImageOps, ImageSequence, ImageFile, ImageEnhance, ImageFilter
 from PIL.PngImagePlugin import PngInfo
-from xml.dom import minidom
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "comfy"))
 
-from ..core import CATEGORY
-from ..core.common import SCHEDULERS_ANY
+from ..core import CATEGORY, cstr
+from ..core.fingerprint import file_fingerprint
+from ..core.http_cache import fetch_urls, url_fingerprint
+from ..core.metadata_parsers import extract_metadata
 
 #credits to https://github.com/Jordach/comfy-plasma for the initial code, which was modified for this project
 
-EASYDIFFUSION_MAPPING_A = {
-	"prompt": "Prompt",
-	"negative_prompt": "Negative Prompt",
-	"seed": "Seed",
-	"use_stable_diffusion_model": "Stable Diffusion model",
-	"clip_skip": "Clip Skip",
-	"use_vae_model": "VAE model",
-	"sampler_name": "Sampler",
-	"width": "Width",
-	"height": "Height",
-	"num_inference_steps": "Steps",
-	"guidance_scale": "Guidance Scale",
-}
-
-EASYDIFFUSION_MAPPING_B = {
-	"prompt": "prompt",
-	"negative_prompt": "negative_prompt",
-	"seed": "seed",
-	"use_stable_diffusion_model": "use_stable_diffusion_model",
-	"clip_skip": "clip_skip",
-	"use_vae_model": "use_vae_model",
-	"sampler_name": "sampler_name",
-	"width": "width",
-	"height": "height",
-	"num_inference_steps": "num_inference_steps",
-	"guidance_scale": "guidance_scale",
-}
-
-def handle_auto1111(params):
-	if params and "\nSteps:" in params:
-		# has a negative:
-		if "Negative prompt:" in params:
-			prompt_index = [params.index("\nNegative prompt:"), params.index("\nSteps:")]
-			neg = params[prompt_index[0] + 1 + len("Negative prompt: "):prompt_index[-1]]
-		else:
-			index = [params.index("\nSteps:")]
-			neg = ""
-
-		pos = params[:prompt_index[0]]
-		return pos, neg
-	elif params:
-		# has a negative:
-		if "Negative prompt:" in params:
-			prompt_index = [params.index("\nNegative prompt:")]
-			neg = params[prompt_index[0] + 1 + len("Negative prompt: "):]
-		else:
-			index = [len(params)]
-			neg = ""
-		
-		pos = params[:prompt_index[0]]
-		return pos, neg
-	else:
-		return "", ""
-
-def handle_ezdiff(params):
-	data = json.loads(params)
-	if data.get("prompt"):
-		ed = EASYDIFFUSION_MAPPING_B
-	else:
-		ed = EASYDIFFUSION_MAPPING_A
-
-	pos = data.get(ed["prompt"])
-	data.pop(ed["prompt"])
-	neg = data.get(ed["negative_prompt"])
-	return pos, neg
-
-def handle_invoke_modern(params):
-	meta = json.loads(params.get("sd-metadata"))
-	img = meta.get("image")
-	prompt = img.get("prompt")
-	index = [prompt.rfind("["), prompt.rfind("]")]
-
-	# negative
-	if -1 not in index:
-		pos = prompt[:index[0]]
-		neg = prompt[index[0] + 1:index[1]]
-		return pos, neg
-	else:
-		return prompt, ""
-
-def handle_invoke_legacy(params):
-	dream = params.get("Dream")
-	pi = dream.rfind('"')
-	ni = [dream.rfind("["), dream.rfind("]")]
-
-	# has neg
-	if -1 not in ni:
-		pos = dream[1:ni[0]]
-		neg = dream[ni[0] + 1:ni[1]]
-		return pos, neg
-	else:
-		pos = dream[1:pi]
-		return pos, ""
-
-def handle_novelai(params):
-	pos = params.get("Description")
-	comment = params.get("Comment") or {}
-	comment_json = json.loads(comment)
-	neg = comment_json.get("uc")
-	return pos, neg
-
-def handle_qdiffusion(params):
-	pass
-
-def handle_comfyui(params):
-	"""Extract generation data from ComfyUI embedded metadata"""
-	gen_data = {}
-	
-	# Extract parameters (generation settings)
-	if "parameters" in params:
-		gen_data["parameters"] = params["parameters"]
-	
-	# Extract workflow data
-	if "workflow" in params:
-		try:
-			gen_data["workflow"] = json.loads(params["workflow"])
-		except:
-			gen_data["workflow"] = params["workflow"]
-	
-	# Extract LORA weights
-	if "lora_weights" in params:
-		try:
-			gen_data["lora_weights"] = json.loads(params["lora_weights"])
-		except:
-			gen_data["lora_weights"] = params["lora_weights"]
-	
-	# Parse generation parameters string for structured data
-	if "parameters" in gen_data:
-		params_str = gen_data["parameters"]
-		if "Steps:" in params_str:
-			# Extract individual parameters
-			try:
-				# Steps
-				if "Steps: " in params_str:
-					steps_start = params_str.find("Steps: ") + 7
-					steps_end = params_str.find(",", steps_start)
-					if steps_end == -1:
-						steps_end = params_str.find("\n", steps_start)
-					gen_data["steps"] = int(params_str[steps_start:steps_end].strip())
-				
-				# Sampler
-				if "Sampler: " in params_str:
-					sampler_start = params_str.find("Sampler: ") + 9
-					sampler_end = params_str.find(",", sampler_start)
-					if sampler_end == -1:
-						sampler_end = params_str.find("\n", sampler_start)
-					gen_data["sampler"] = params_str[sampler_start:sampler_end].strip()
-				
-				# Separate scheduler from sampler if embedded
-				if "sampler" in gen_data and gen_data["sampler"]:
-					sampler_full = gen_data["sampler"]
-					# Check if sampler ends with a known scheduler (case-insensitive)
-					for sched in SCHEDULERS_ANY:
-						if sampler_full.lower().endswith(' ' + sched.lower()):
-							# Find the actual scheduler in the string (preserve original case)
-							sched_start = sampler_full.lower().rfind(' ' + sched.lower())
-							if sched_start >= 0:
-								actual_sched = sampler_full[sched_start + 1:]
-								gen_data["sampler"] = sampler_full[:sched_start].strip()
-								gen_data["scheduler"] = actual_sched
-								break
-						elif sampler_full.lower().endswith(sched.lower()):
-							# Find the actual scheduler in the string (preserve original case)
-							sched_start = sampler_full.lower().rfind(sched.lower())
-							if sched_start >= 0:
-								actual_sched = sampler_full[sched_start:]
-								gen_data["sampler"] = sampler_full[:sched_start].strip()
-								gen_data["scheduler"] = actual_sched
-								break
-				
-				# CFG scale
-				if "CFG scale: " in params_str:
-					cfg_start = params_str.find("CFG scale: ") + 11
-					cfg_end = params_str.find(",", cfg_start)
-					if cfg_end == -1:
-						cfg_end = params_str.find("\n", cfg_start)
-					gen_data["cfg_scale"] = float(params_str[cfg_start:cfg_end].strip())
-				
-				# Seed
-				if "Seed: " in params_str:
-					seed_start = params_str.find("Seed: ") + 6
-					seed_end = params_str.find(",", seed_start)
-					if seed_end == -1:
-						seed_end = params_str.find("\n", seed_start)
-					gen_data["seed"] = int(params_str[seed_start:seed_end].strip())
-				
-				# Size
-				if "Size: " in params_str:
-					size_start = params_str.find("Size: ") + 6
-					size_end = params_str.find(",", size_start)
-					if size_end == -1:
-						size_end = params_str.find("\n", size_start)
-					size_str = params_str[size_start:size_end].strip()
-					if "x" in size_str:
-						width, height = size_str.split("x")
-						gen_data["width_param"] = int(width.strip())
-						gen_data["height_param"] = int(height.strip())
-				
-				# Model hashes
-				if "Hashes: " in params_str:
-					hashes_start = params_str.find("Hashes: ") + 8
-					hashes_end = params_str.find("}", hashes_start) + 1
-					if hashes_end > hashes_start:
-						hashes_str = params_str[hashes_start:hashes_end]
-						try:
-							gen_data["model_hashes"] = json.loads(hashes_str)
-						except:
-							gen_data["model_hashes"] = hashes_str
-				
-				# Version
-				if "Version: " in params_str:
-					version_start = params_str.find("Version: ") + 9
-					version_end = params_str.find("\n", version_start)
-					if version_end == -1:
-						version_end = len(params_str)
-					gen_data["version"] = params_str[version_start:version_end].strip()
-					
-			except Exception as e:
-				# If parsing fails, just continue
-				pass
-	
-	return gen_data
-	
-def handle_drawthings(params):
-	try:
-		data = minidom.parseString(params.get("XML:com.adobe.xmp"))
-		data_json = json.loads(data.getElementByTagName("exif:UserComment")[0].childNodes[1].childNodes[1].childNodes[0].data)
-	except:
-		return "", ""
-	else:
-		pos = data_json.get("c")
-		neg = data_json.get("uc")
-		return pos, neg
-
+def image_sources(image):
+	# One path or URL per line; removes any quotes from Explorer
+	sources = []
+	for line in str(image).splitlines():
+		src = line.replace('"', "").strip()
+		if not src:
+			continue
+		if src.startswith("http"):
+			src = re.sub(r'quality=\d+', 'quality=100', src)
+		sources.append(src)
+	return sources
 
 class RvImage_LoadImagePathWithMetadata:
 	@classmethod
@@ -268,7 +43,7 @@ class RvImage_LoadImagePathWithMetadata:
 		return {
 				"required": 
 					{
-						"image": ("STRING", {"default": ""})
+						"image": ("STRING", {"default": "", "tooltip": "Image path or URL. Several paths/URLs, one per line, are loaded as a batch (URLs are downloaded concurrently)."})
 					}
 				}
 
@@ -279,124 +54,69 @@ class RvImage_LoadImagePathWithMetadata:
 	FUNCTION = "load_image"
 
 	def load_image(self, image):
-		# Removes any quotes from Explorer
-		image_path = str(image)
-		image_path = image_path.replace('"', "")
-		if image_path.startswith("http"):
-			image_path = re.sub(r'quality=\d+', 'quality=100', image_path)
-		i = None
-		if image_path.startswith("http"):
-			response = requests.get(image_path)
-			i = Image.open(BytesIO(response.content)).convert("RGB")
-		else:
-			i = Image.open(image_path)
-		prompt = ""
-		negative = ""
-		generation_data = "{}"
-		width = i.width
-		height = i.height
-		steps = 0
-		sampler = ""
-		scheduler = ""
-		cfg_scale = 0.0
-		seed = 0
-		model_hash = ""
-		version = ""
-		comfyui_processed = False
-		
-		if i.format == "PNG" or ("parameters" in i.info or "workflow" in i.info or "lora_weights" in i.info):
-			if "parameters" in i.info or "workflow" in i.info or "lora_weights" in i.info:
-				gen_data = handle_comfyui(i.info)
-				if gen_data:
-					generation_data = json.dumps(gen_data)
-					comfyui_processed = True
-					# Extract individual values
-					steps = gen_data.get("steps", 0)
-					sampler = gen_data.get("sampler", "")
-					scheduler = gen_data.get("scheduler", "")
-					cfg_scale = gen_data.get("cfg_scale", 0.0)
-					seed = gen_data.get("seed", 0)
-					model_hashes = gen_data.get("model_hashes", {})
-					model_hash = json.dumps(model_hashes) if isinstance(model_hashes, dict) else str(model_hashes)
-					version = gen_data.get("version", "")
-					# Extract prompts from ComfyUI parameters if available
-					if "parameters" in gen_data:
-						params_str = gen_data["parameters"]
-						if "Negative prompt:" in params_str:
-							# Split positive and negative prompts
-							parts = params_str.split("Negative prompt:")
-							if len(parts) >= 2:
-								prompt = parts[0].strip()
-								# Extract negative prompt up to the generation parameters
-								neg_part = parts[1]
-								if "Steps:" in neg_part:
-									negative = neg_part.split("Steps:")[0].strip()
-								else:
-									negative = neg_part.strip()
-						else:
-							# No negative prompt, just positive
-							if "Steps:" in params_str:
-								prompt = params_str.split("Steps:")[0].strip()
-							else:
-								prompt = params_str.strip()
+		sources = image_sources(image)
+		if not sources:
+			raise ValueError("No image path or URL given")
+		# Download all URLs up front, concurrently and through the shared cache
+		urls = [src for src in sources if src.startswith("http")]
+		downloads = dict(zip(urls, fetch_urls(urls))) if urls else {}
+
+		images = []
+		masks = []
+		meta = None
+		width = height = 0
+		for src in sources:
+			if src.startswith("http"):
+				i = Image.open(BytesIO(downloads[src])).convert("RGB")
+			else:
+				i = Image.open(src)
+			if meta is None:
+				# Metadata and reported size come from the first image
+				width = i.width
+				height = i.height
+				meta = extract_metadata(i.info, i.format)
 			
-			# auto1111 (only if ComfyUI data not found)
-			elif "parameters" in i.info and not comfyui_processed:
-				params = i.info.get("parameters")
-				prompt, negative = handle_auto1111(params)
-
-			# easy diffusion
-			elif "negative_prompt" in i.info or "Negative Prompt" in i.info:
-				params = str(i.info).replace("'", '"')
-				prompt, negative = handle_ezdiff(params)
-			# invokeai modern
-			elif "sd-metadata" in i.info:
-				prompt, negative = handle_invoke_modern(i.info)
-			# legacy invokeai
-			elif "Dream" in i.info:
-				prompt, negative = handle_invoke_legacy(i.info)
-			# novelai
-			elif i.info.get("Software") == "NovelAI":
-				prompt, negative = handle_novelai(i.info)
-			# qdiffusion
-			# elif ????:
-			# drawthings (iPhone, iPad, macOS)
-			elif "XML:com.adobe.xmp" in i.info:
-				prompt, negative = handle_drawthings(i.info)
-		
-		# Removes EXIF rotation and other nonsense
-		i = ImageOps.exif_transpose(i)
-		image = i.convert("RGB")
-		image = np.array(image).astype(np.float32) / 255.0
-		image = torch.from_numpy(image)[None,]
-		if 'A' in i.getbands():
-			mask = np.array(i.getchannel('A')).astype(np.float32) / 255.0
-			mask = 1. - torch.from_numpy(mask)
+			# Removes EXIF rotation and other nonsense
+			i = ImageOps.exif_transpose(i)
+			if images and (i.width, i.height) != (images[0].shape[2], images[0].shape[1]):
+				cstr(f"Skipping {src}: size {i.width}x{i.height} does not match the first image").warning.print()
+				continue
+			frame = i.convert("RGB")
+			frame = np.array(frame).astype(np.float32) / 255.0
+			images.append(torch.from_numpy(frame)[None,])
+			if 'A' in i.getbands():
+				mask = np.array(i.getchannel('A')).astype(np.float32) / 255.0
+				mask = 1. - torch.from_numpy(mask)
+			elif len(sources) > 1:
+				mask = torch.zeros((i.height, i.width), dtype=torch.float32, device="cpu")
+			else:
+				mask = torch.zeros((64,64), dtype=torch.float32, device="cpu")
+			masks.append(mask)
+
+		if len(images) == 1:
+			image, mask = images[0], masks[0]
 		else:
-			mask = torch.zeros((64,64), dtype=torch.float32, device="cpu")
-		return (image, mask, prompt, negative, width, height, steps, sampler, scheduler, cfg_scale, seed, version)
+			image = torch.cat(images, dim=0)
+			mask = torch.stack(masks, dim=0)
+		return (image, mask, meta["text_pos"], meta["text_neg"], width, height, meta["steps"], meta["sampler"], meta["scheduler"], meta["cfg"], meta["seed"], meta["version"])
 
 	@classmethod
 	def IS_CHANGED(s, image):
-		image_path = str(image)
-		image_path = image_path.replace('"', "")
-		m = hashlib.sha256()
-		if not image_path.startswith("http"):
-			with open(image_path, 'rb') as f:
-				m.update(f.read())
-			return m.digest().hex()
-		else:
-			m.update(image.encode("utf-8"))
-			return m.digest().hex()
+		fingerprints = []
+		for src in image_sources(image):
+			if src.startswith("http"):
+				fingerprints.append(url_fingerprint(src))
+			else:
+				fingerprints.append(file_fingerprint(src))
+		return "|".join(fingerprints)
 
 	@classmethod
 	def VALIDATE_INPUTS(s, image):
-		image_path = str(image)
-		image_path = image_path.replace('"', "")
-		if image_path.startswith("http"):
-			return True
-		if not os.path.isfile(image_path):
-			return "No file found: {}".format(image_path)
+		for src in image_sources(image):
+			if src.startswith("http"):
+				continue
+			if not os.path.isfile(src):
+				return "No file found: {}".format(src)
 
 		return True
 
@@ -0,0 +1,142 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import json
+import os
+import re
+import torch
+import numpy as np
+import folder_paths
+
+from typing import Any, Dict, List
+from PIL import Image, ImageOps
+
+from ..core import CATEGORY, cstr
+from ..core.image_meta import read_image_header
+from ..core.metadata_index import get_metadata_index
+from ..core.metadata_parsers import extract_metadata
+
+LORA_TOKEN = re.compile(r'<lora:([^>:]+)')
+
+
+def index_record(path: str) -> Dict[str, Any]:
+    # Parse one image into a metadata index record, reading only its header.
+    info, width, height, image_format = read_image_header(path)
+    record = extract_metadata(info, image_format)
+    record["width"] = width
+    record["height"] = height
+
+    hashes = record.pop("model_hashes", None)
+    hashes = hashes if isinstance(hashes, dict) else {}
+    lora_weights = record.pop("lora_weights", None)
+    loras = set(LORA_TOKEN.findall(record.get("text_pos") or ""))
+    if isinstance(lora_weights, dict):
+        loras.update(lora_weights.keys())
+    for key in hashes:
+        if key.upper().startswith("LORA:"):
+            loras.add(key[5:])
+    model_key = "Model:" + record.get("model_name", "")
+    record["model_hash"] = str(hashes.get(model_key, ""))
+    record["hashes"] = json.dumps(hashes) if hashes else ""
+    record["loras"] = [os.path.splitext(os.path.basename(l.replace("\\", "/")))[0] for l in loras]
+    return record
+
+
+class RvImage_MetadataSearch:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "directory": ("STRING", {"default": "", "tooltip": "Directory to index and search. Empty uses the ComfyUI output directory."}),
+                "seed": ("INT", {"default": -1, "min": -1, "max": 0xffffffffffffffff, "tooltip": "Seed to match (-1 matches any)."}),
+                "model": ("STRING", {"default": "", "tooltip": "Model hash prefix or model name substring."}),
+                "lora": ("STRING", {"default": "", "tooltip": "LoRA name substring."}),
+                "prompt": ("STRING", {"default": "", "tooltip": "Positive prompt substring."}),
+                "limit": ("INT", {"default": 100, "min": 0, "max": 100000, "tooltip": "Maximum number of results, newest first (0 for all)."}),
+                "rescan": ("BOOLEAN", {"default": True, "tooltip": "Re-index files added or modified since the last run before searching."}),
+            },
+        }
+
+    CATEGORY = CATEGORY.MAIN.value + CATEGORY.IMAGE.value
+
+    RETURN_TYPES = ("STRING", "INT")
+    RETURN_NAMES = ("files", "count")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "search"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # The archive can change between runs without any input changing
+        return float("nan")
+
+    def search(self, directory, seed=-1, model="", lora="", prompt="", limit=100, rescan=True):
+        directory = str(directory).replace('"', "").strip() or folder_paths.get_output_directory()
+        if not os.path.isdir(directory):
+            raise ValueError(f"Directory not found: {directory}")
+        index = get_metadata_index()
+        if index is None:
+            raise RuntimeError("Image metadata index is unavailable")
+        if rescan:
+            parsed, removed = index.update(directory, index_record)
+            if parsed or removed:
+                cstr(f"Metadata index: {parsed} files indexed, {removed} removed").msg.print()
+        files = index.query(directory, None if seed < 0 else seed, model.strip(), lora.strip(), prompt.strip(), limit)
+        return (files, len(files))
+
+
+class RvImage_LoadImagesFromSearch:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "files": ("STRING", {"forceInput": True, "tooltip": "File list from Search Image Metadata."}),
+            },
+        }
+
+    CATEGORY = CATEGORY.MAIN.value + CATEGORY.IMAGE.value
+
+    RETURN_TYPES = ("IMAGE", "MASK", "STRING")
+    RETURN_NAMES = ("images", "masks", "files")
+    INPUT_IS_LIST = True
+    OUTPUT_IS_LIST = (True, True, True)
+    FUNCTION = "load_images"
+
+    def load_images(self, files):
+        images: List[torch.Tensor] = []
+        masks: List[torch.Tensor] = []
+        loaded: List[str] = []
+        for path in files:
+            try:
+                with Image.open(path) as img:
+                    img = ImageOps.exif_transpose(img)
+                    image = torch.from_numpy(np.array(img.convert("RGB")).astype(np.float32) / 255.0)[None,]
+                    if 'A' in img.getbands():
+                        mask = 1. - torch.from_numpy(np.array(img.getchannel('A')).astype(np.float32) / 255.0)
+                    else:
+                        mask = torch.zeros((64,64), dtype=torch.float32, device="cpu")
+            except Exception as e:
+                cstr(f"Unable to load {path}: {e}").warning.print()
+                continue
+            images.append(image)
+            masks.append(mask.unsqueeze(0))
+            loaded.append(path)
+        return (images, masks, loaded)
+
+
+NODE_NAME = 'Search Image Metadata [RvTools-X]'
+NODE_DESC = 'Search Image Metadata'
+
+LOAD_NODE_NAME = 'Load Images from Metadata Search [RvTools-X]'
+LOAD_NODE_DESC = 'Load Images from Metadata Search'
+
+NODE_CLASS_MAPPINGS = {
+    NODE_NAME: RvImage_MetadataSearch,
+    LOAD_NODE_NAME: RvImage_LoadImagesFromSearch,
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    NODE_NAME: NODE_DESC,
+    LOAD_NODE_NAME: LOAD_NODE_DESC,
+}
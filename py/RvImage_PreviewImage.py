@@ -7,7 +7,6 @@ import os
 import sys
 import random
 import torch
-import numpy as np
 import folder_paths
 import safetensors.torch
 
@@ -17,6 +16,7 @@ from PIL.PngImagePlugin import PngInfo
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "comfy"))
 
 from ..core import CATEGORY
+from ..core.image_utils import images_to_uint8
 
 class RvImage_PreviewImage():
     def __init__(self):
@@ -58,12 +58,18 @@ class RvImage_PreviewImage():
             filename_prefix, self.output_dir, images[0].shape[1], images[0].shape[0])
         results = []
 
-        for batch_number, image in enumerate(images):
-            if Show_Images == 0:
-                break  # no preview for whatever reason
+        if Show_Images == 0:
+            return {"ui": {"images": results}, "result": (images,)}  # no preview for whatever reason
 
-            i = 255. * image.cpu().numpy()
-            img = Image.fromarray(np.clip(i, 0, 255).astype(np.uint8))
+        # Quantize only the frames that will be shown, in one pass
+        shown = images if Show_Images < 0 else images[:Show_Images]
+        if isinstance(shown, torch.Tensor):
+            frames = images_to_uint8(shown)
+        else:
+            frames = [images_to_uint8(image)[0] for image in shown]
+
+        for batch_number, frame in enumerate(frames):
+            img = Image.fromarray(frame)
             metadata = None
 
             filename_with_batch_num = filename.replace("%batch_num%", str(batch_number))
@@ -12,14 +12,22 @@ import json
 import numpy as np
 import folder_paths
 import hashlib
+import threading
+import time
+import weakref
 
 from pathlib import Path
-from typing import Optional, Final
+from typing import Optional, Final, Tuple
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from PIL import Image
 from PIL.PngImagePlugin import PngInfo
 
 from ..core import CATEGORY, cstr
+from ..core.config import CONFIG
+from ..core.image_utils import images_to_uint8
+from ..core.hash_index import FileSignature, file_signature, get_hash_index
+from ..core.model_index import model_file_index
 
 UPSCALE_MODELS = folder_paths.get_filename_list("upscale_models") + ["None"]
 MAX_RESOLUTION = 32768
@@ -303,54 +311,221 @@ def string_placeholder(filename_prefix: str, isPath: bool) -> str:
 
 
 # Constants for configuration
-CHUNK_SIZE: Final[int] = 8192  # Optimal chunk size for reading files
-MAX_WORKERS: Final[int] = 4    # Number of concurrent hash operations
-HASH_CACHE: Dict[str, str] = {}  # Cache for hash values
+CHUNK_SIZE: Final[int] = 1024 * 1024  # Read size used while hashing model files
+MAX_WORKERS: Final[int] = max(1, CONFIG.get("prehash_workers", 4))  # Number of concurrent hash operations
+HASH_CACHE: Dict[str, Tuple[FileSignature, str]] = {}  # In-process front of the persistent hash index
+# Per-file locks so a file is never hashed twice at once; an entry goes away
+# once nobody holds or waits on its lock
+_HASH_LOCKS: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_HASH_LOCKS_GUARD = threading.Lock()
 
 
+def _hash_lock_for(file_path: str) -> threading.Lock:
+    with _HASH_LOCKS_GUARD:
+        lock = _HASH_LOCKS.get(file_path)
+        if lock is None:
+            lock = _HASH_LOCKS[file_path] = threading.Lock()
+        return lock
 
-def get_sha256(file_path: str) -> Optional[str]:
-    # Calculate or retrieve SHA-256 hash for a file with improved safety and caching.
+
+def _read_sidecar_hash(hash_file: str, file_mtime_ns: int) -> Optional[str]:
+    # Only trust a .sha256 sidecar that is at least as new as the model file.
+    try:
+        if os.stat(hash_file).st_mtime_ns < file_mtime_ns:
+            return None
+        with open(hash_file, "r") as f:
+            hash_value = f.read().strip()
+        if len(hash_value) == 64:
+            return hash_value
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        cstr(f"Error reading hash file {hash_file}: {e}").error.print()
+    return None
+
+
+def get_sha256(file_path: str, verbose: bool = True, write_sidecar: bool = True) -> Optional[str]:
+    # Calculate or retrieve SHA-256 hash for a file.
+    # Lookups go through the in-process cache, then the persistent hash index,
+    # then a .sha256 sidecar; all are validated against the file's current
+    # (size, mtime_ns, inode) so replaced files are rehashed. A newly computed
+    # hash is written to the sidecar only when write_sidecar is set.
     if not file_path or file_path in ('undefined', 'none'):
         cstr(f"Invalid file path: {file_path}").warning.print()
         return None
     try:
         file_path = str(Path(file_path).resolve())
-        cache_key = f"sha256:{file_path}"
-        if cache_key in HASH_CACHE:
-            return HASH_CACHE[cache_key]
-        file_no_ext = str(Path(file_path).with_suffix(''))
-        hash_file = file_no_ext + ".sha256"
-        try:
-            if Path(hash_file).exists():
-                with open(hash_file, "r") as f:
-                    hash_value = f.read().strip()
-                    if len(hash_value) == 64:
-                        HASH_CACHE[cache_key] = hash_value
-                        return hash_value
-        except OSError as e:
-            cstr(f"Error reading hash file {hash_file}: {e}").error.print()
-        if not Path(file_path).exists():
+        signature = file_signature(file_path)
+        if signature is None:
             cstr(f"Source file not found: {file_path}").error.print()
             return None
-        cstr(f"Calculating SHA-256 for: {Path(file_path).name}").msg.print()
-        hash_obj = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            while chunk := f.read(CHUNK_SIZE):
-                hash_obj.update(chunk)
-        hash_value = hash_obj.hexdigest()
-        HASH_CACHE[cache_key] = hash_value
-        try:
-            with open(hash_file, "w") as f:
-                f.write(hash_value)
-        except OSError as e:
-            cstr(f"Failed to save hash file {hash_file}: {e}").error.print()
-        return hash_value
+
+        cache_key = f"sha256:{file_path}"
+        cached = HASH_CACHE.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        # If the background pre-hasher is working on this file, wait for it
+        # instead of reading the file a second time.
+        with _hash_lock_for(file_path):
+            cached = HASH_CACHE.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            index = get_hash_index()
+            if index is not None:
+                hash_value = index.get(file_path, signature)
+                if hash_value:
+                    HASH_CACHE[cache_key] = (signature, hash_value)
+                    return hash_value
+
+            hash_file = str(Path(file_path).with_suffix('')) + ".sha256"
+            hash_value = _read_sidecar_hash(hash_file, signature[1])
+            if hash_value is None:
+                if verbose:
+                    cstr(f"Calculating SHA-256 for: {Path(file_path).name}").msg.print()
+                hash_obj = hashlib.sha256()
+                with open(file_path, "rb") as f:
+                    while chunk := f.read(CHUNK_SIZE):
+                        hash_obj.update(chunk)
+                hash_value = hash_obj.hexdigest()
+                if write_sidecar:
+                    try:
+                        with open(hash_file, "w") as f:
+                            f.write(hash_value)
+                    except OSError as e:
+                        cstr(f"Failed to save hash file {hash_file}: {e}").error.print()
+
+            HASH_CACHE[cache_key] = (signature, hash_value)
+            if index is not None:
+                index.put(file_path, hash_value, signature)
+            return hash_value
     except Exception as e:
         cstr(f"Hash calculation failed for {file_path}: {e}").error.print()
         return None
 
 
+PREHASH_FOLDERS: Final = ("checkpoints", "diffusion_models", "loras", "embeddings", "vae", "upscale_models")
+PREHASH_EXTENSIONS: Final = ('.safetensors', '.pt', '.pth', '.ckpt', '.bin', '.gguf', '.sft')
+
+
+class ModelPrehasher:
+    # Hashes every model file in PREHASH_FOLDERS on a background worker pool so
+    # the hash cache is warm before the first save. The pool size bounds the
+    # number of files being read concurrently. Hashes go to the hash index;
+    # .sha256 sidecars are only written next to the models when write_sidecars
+    # is set (RVTOOLSX_PREHASH_SIDECARS).
+
+    def __init__(self, max_workers: int = MAX_WORKERS, write_sidecars: bool = False):
+        self.max_workers = max_workers
+        self.write_sidecars = write_sidecars
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict[str, Any] = {
+            "state": "idle",
+            "total": 0,
+            "done": 0,
+            "failed": 0,
+            "current": [],
+            "started": None,
+            "finished": None,
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            status = dict(self._status)
+            status["current"] = list(self._status["current"])
+        return status
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        # Start a pass in a daemon thread; returns False if one is already running.
+        with self._lock:
+            if self.is_running():
+                return False
+            self._thread = threading.Thread(target=self._run, name="RvTools-X prehash", daemon=True)
+            self._thread.start()
+        return True
+
+    @staticmethod
+    def _collect_files() -> List[str]:
+        files = {}
+        for folder in PREHASH_FOLDERS:
+            try:
+                names = folder_paths.get_filename_list(folder)
+            except Exception:
+                # Folder type not registered in this ComfyUI version
+                continue
+            for name in names:
+                if not name.lower().endswith(PREHASH_EXTENSIONS):
+                    continue
+                full_path = folder_paths.get_full_path(folder, name)
+                if full_path:
+                    files.setdefault(os.path.realpath(full_path), None)
+        return list(files)
+
+    def _hash_one(self, file_path: str) -> None:
+        with self._lock:
+            self._status["current"].append(os.path.basename(file_path))
+        try:
+            ok = get_sha256(file_path, verbose=False, write_sidecar=self.write_sidecars) is not None
+        except Exception:
+            ok = False
+        with self._lock:
+            self._status["current"].remove(os.path.basename(file_path))
+            self._status["done"] += 1
+            if not ok:
+                self._status["failed"] += 1
+
+    def _run(self) -> None:
+        with self._lock:
+            self._status.update(state="scanning", total=0, done=0, failed=0, current=[],
+                                started=time.time(), finished=None)
+        try:
+            files = self._collect_files()
+            with self._lock:
+                self._status.update(state="hashing", total=len(files))
+            cstr(f"Pre-hashing {len(files)} model files with {self.max_workers} workers").msg.print()
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rvtools-prehash") as pool:
+                list(pool.map(self._hash_one, files))
+            status = self.get_status()
+            cstr(f"Pre-hashing finished: {status['done'] - status['failed']} hashed, {status['failed']} failed").msg.print()
+            with self._lock:
+                self._status.update(state="finished", finished=time.time())
+        except Exception as e:
+            cstr(f"Pre-hashing failed: {e}").error.print()
+            with self._lock:
+                self._status.update(state="error", finished=time.time())
+
+
+model_prehasher = ModelPrehasher(write_sidecars=CONFIG.get("prehash_sidecars", False))
+
+try:
+    from aiohttp import web
+    from server import PromptServer
+
+    @PromptServer.instance.routes.get("/rvtools/prehash/status")
+    async def _prehash_status(request):
+        return web.json_response(model_prehasher.get_status())
+
+    @PromptServer.instance.routes.post("/rvtools/prehash/start")
+    async def _prehash_start(request):
+        started = model_prehasher.start()
+        return web.json_response({"started": started, **model_prehasher.get_status()})
+except Exception as e:
+    cstr(f"Pre-hash status endpoint unavailable: {e}").debug.print()
+
+if CONFIG.get("prehash"):
+    model_prehasher.start()
+
+
+MODEL_EXTENSIONS: Final = ('.safetensors', '.pt', '.pth', '.ckpt', '.bin', '.gguf')
+LORA_EXTENSIONS: Final = ('.safetensors', '.pt', '.bin')
+EMBEDDING_EXTENSIONS: Final = ('.pt', '.safetensors', '.bin')
+MODEL_FOLDER_TYPES: Final = ("checkpoints", "diffusion_models", "unet", "upscale_models")
+
 # Represent the given embedding name as key as detected by civitAI
 
 def civitai_embedding_key_name(embedding: str):
@@ -370,29 +545,17 @@ def civitai_model_key_name(model: str):
 def full_embedding_path_for(embedding: str):
     # Match by filename (without extension) in a case-insensitive manner
     name = str(embedding)
-    matching_embedding = None
-    # Try direct match in embeddings folder
-    for x in __list_embeddings():
-        if Path(x).name.lower().startswith(name.lower()):
-            matching_embedding = x
-            break
-    # If not found, try subfolder or direct path
-    if not matching_embedding:
-        if os.sep in name or '/' in name:
-            candidate = os.path.join(folder_paths.get_folder_paths("embeddings")[0], name)
-            if os.path.exists(candidate):
-                matching_embedding = name
-    # Try with supported extensions
-    if not matching_embedding:
-        for ext in ['.pt', '.safetensors', '.bin']:
-            candidate = name if name.lower().endswith(ext) else name + ext
-            candidate_path = os.path.join(folder_paths.get_folder_paths("embeddings")[0], candidate)
-            if os.path.exists(candidate_path):
-                matching_embedding = candidate
-                break
-    if not matching_embedding:
-        return None
-    return folder_paths.get_full_path("embeddings", matching_embedding)
+    full_path, _ = model_file_index.find(name, ("embeddings",), EMBEDDING_EXTENSIONS, allow_prefix=True)
+    if full_path:
+        return full_path
+    # If not indexed, try subfolder or direct path with supported extensions
+    embeddings_dir = folder_paths.get_folder_paths("embeddings")[0]
+    for ext in ('',) + EMBEDDING_EXTENSIONS:
+        candidate = name if not ext or name.lower().endswith(ext) else name + ext
+        candidate_path = os.path.join(embeddings_dir, candidate)
+        if os.path.isfile(candidate_path):
+            return candidate_path
+    return None
 
 # Based on a lora name, e.g., 'epi_noise_offset2', finds the path as known in comfy, including extension.
 
@@ -409,30 +572,18 @@ def full_lora_path_for(lora: str):
         # If contains a weight like name:0.8, split it off
         name = original.split(':')[0]
 
-    matching_lora = None
-    # Try direct match in loras folder
-    for x in __list_loras():
-        if Path(x).name.lower().startswith(name.lower()):
-            matching_lora = x
-            break
-    # If not found, try subfolder or direct path
-    if not matching_lora:
-        if os.sep in name or '/' in name:
-            candidate = os.path.join(folder_paths.get_folder_paths("loras")[0], name)
-            if os.path.exists(candidate):
-                matching_lora = name
-    # Try with supported extensions
-    if not matching_lora:
-        for ext in ['.safetensors', '.pt', '.bin']:
-            candidate = name if name.lower().endswith(ext) else name + ext
-            candidate_path = os.path.join(folder_paths.get_folder_paths("loras")[0], candidate)
-            if os.path.exists(candidate_path):
-                matching_lora = candidate
-                break
-    if not matching_lora:
-        cstr(f'RvTools: could not find full path to lora "{original}"').error.print()
-        return None
-    return folder_paths.get_full_path("loras", matching_lora)
+    full_path, _ = model_file_index.find(name, ("loras",), LORA_EXTENSIONS, allow_prefix=True)
+    if full_path:
+        return full_path
+    # If not indexed, try subfolder or direct path with supported extensions
+    loras_dir = folder_paths.get_folder_paths("loras")[0]
+    for ext in ('',) + LORA_EXTENSIONS:
+        candidate = name if not ext or name.lower().endswith(ext) else name + ext
+        candidate_path = os.path.join(loras_dir, candidate)
+        if os.path.isfile(candidate_path):
+            return candidate_path
+    cstr(f'RvTools: could not find full path to lora "{original}"').error.print()
+    return None
 
 
 def parse_lora_string(lora_input):
@@ -479,12 +630,6 @@ def parse_lora_string(lora_input):
     return (''.join(tokens), weights)
 
 
-def __list_loras():
-    return folder_paths.get_filename_list("loras")
-
-def __list_embeddings():
-    return folder_paths.get_filename_list("embeddings")
-
 # Extracts Embeddings and Lora's from the given prompts
 # and allows asking for their sha's 
 # This module is based on civit's plugin and website implementations
@@ -578,6 +723,97 @@ def save_json(image_info, filename):
         cstr(f'Failed to save workflow as json due to: {e}, proceeding with the remainder of saving execution').error.print()
 
 
+class OutputCounter:
+    # Allocates numbered output filenames without listing the output folder on
+    # every save. The next counter per (directory, prefix, delimiter, position)
+    # is seeded from a single scan and then advanced in memory. Each name is
+    # claimed with O_EXCL so concurrent workers (or files written by other
+    # processes) can never be overwritten; a collision just moves to the next
+    # number.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next: Dict[Tuple[str, str, str, bool], int] = {}
+
+    @staticmethod
+    def _scan(output_path: str, prefix: str, delimiter: str, number_start: bool) -> int:
+        if number_start:
+            pattern = re.compile(f"(\\d+){re.escape(delimiter)}{re.escape(prefix)}")
+        else:
+            pattern = re.compile(f"{re.escape(prefix)}{re.escape(delimiter)}(\\d+)")
+        highest = 0
+        with os.scandir(output_path) as entries:
+            for entry in entries:
+                m = pattern.match(entry.name)
+                if m:
+                    highest = max(highest, int(m.group(1)))
+        return highest + 1
+
+    @staticmethod
+    def format_names(counter: int, prefix: str, delimiter: str, number_start: bool,
+                     padding: int, file_extension: str) -> Tuple[str, str]:
+        if number_start:
+            stem = f"{counter:0{padding}}{delimiter}{prefix}"
+        else:
+            stem = f"{prefix}{delimiter}{counter:0{padding}}"
+        return f"{stem}{file_extension}", stem
+
+    def reserve(self, output_path: str, prefix: str, delimiter: str, number_start: bool,
+                padding: int, file_extension: str) -> Tuple[int, str, str]:
+        # Claim the next free filename; returns (counter, file, stem). The file
+        # is created empty and is overwritten by the actual save.
+        key = (os.path.normcase(os.path.abspath(output_path)), prefix, delimiter, bool(number_start))
+        while True:
+            with self._lock:
+                counter = self._next.get(key)
+                if counter is None:
+                    counter = self._scan(output_path, prefix, delimiter, number_start)
+                self._next[key] = counter + 1
+            file, stem = self.format_names(counter, prefix, delimiter, number_start, padding, file_extension)
+            try:
+                fd = os.open(os.path.join(output_path, file), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return counter, file, stem
+
+    @staticmethod
+    def release(output_file: str) -> None:
+        # Remove an empty placeholder left behind by a failed save.
+        try:
+            if os.path.getsize(output_file) == 0:
+                os.remove(output_file)
+        except OSError:
+            pass
+
+
+output_counter = OutputCounter()
+
+_ENCODE_POOLS: Dict[int, ThreadPoolExecutor] = {}
+_ENCODE_POOLS_LOCK = threading.Lock()
+
+
+def get_encode_pool(workers: int) -> ThreadPoolExecutor:
+    # Long-lived encoder pools, one per worker count, so background writes
+    # outlive the node call that queued them. PIL releases the GIL while
+    # encoding, so threads scale across cores.
+    workers = max(1, int(workers))
+    with _ENCODE_POOLS_LOCK:
+        pool = _ENCODE_POOLS.get(workers)
+        if pool is None:
+            pool = _ENCODE_POOLS[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rvtools-encode")
+        return pool
+
+
+def report_background_write(output_file: str, future) -> None:
+    # Done callback for writes the node did not wait for
+    error = future.exception()
+    if error is not None:
+        cstr(f"Background write of {output_file} failed: {error}").error.print()
+    elif not future.result():
+        cstr(f"Background write of {output_file} failed").error.print()
+
+
 class RvImage_SaveImages:
     def __init__(self):
         self.output_dir = folder_paths.output_directory
@@ -664,6 +900,8 @@ class RvImage_SaveImages:
                 "save_workflow_as_json": ("BOOLEAN", {"default": False}),
                 "add_loras_to_prompt": ("BOOLEAN", {"default": False}),
                 "show_previews": ("BOOLEAN", {"default": False}),
+                "encode_workers": ("INT", {"default": 1, "min": 1, "max": 32, "step": 1, "tooltip": "Number of threads encoding and writing images in parallel. 1 saves sequentially."}),
+                "wait_for_write": ("BOOLEAN", {"default": True, "tooltip": "Wait until all files are written before the node finishes. When disabled (and previews are off), encoding continues in the background and the files output lists only the images already written."}),
             },
             "optional": {
                 "images": ("IMAGE", ),
@@ -702,6 +940,8 @@ class RvImage_SaveImages:
                         save_workflow_as_json=False, 
                         add_loras_to_prompt=False,
                         show_previews=False, 
+                        encode_workers=1,
+                        wait_for_write=True,
                         pipe_opt=None,
                         prompt=None, 
                         extra_pnginfo=None
@@ -784,15 +1024,10 @@ class RvImage_SaveImages:
                     global_values['basemodel'] = return_filename_without_extension(first_model)
                     global_values['model'] = first_model
 
-                import glob
-
-                def find_model_file(model, search_dirs, extensions):
-                    for search_dir in search_dirs:
-                        for ext in extensions:
-                            pattern = os.path.join(search_dir, '**', model if model.lower().endswith(ext) else model + ext)
-                            matches = glob.glob(pattern, recursive=True)
-                            if matches:
-                                return matches[0], search_dir  # Return both path and directory
+                def find_model_file(model, folder_types, extensions):
+                    model_path, model_dir = model_file_index.find(model, folder_types, extensions)
+                    if model_path:
+                        return model_path, model_dir
                     if os.path.exists(model):
                         return model, None
                     for ext in extensions:
@@ -801,17 +1036,12 @@ class RvImage_SaveImages:
                             return candidate, None
                     return None, None
 
-                search_dirs = []
-                for key in ["checkpoints", "diffusion_models", "unet", "upscale_models"]:
-                    search_dirs.extend(folder_paths.get_folder_paths(key))
-                extensions = ['.safetensors', '.pt', '.pth', '.ckpt', '.bin', '.gguf']
-
                 # Get upscale model directories for accurate detection
-                upscale_model_dirs = set(folder_paths.get_folder_paths("upscale_models"))
+                upscale_model_dirs = set(os.path.abspath(p) for p in folder_paths.get_folder_paths("upscale_models"))
 
                 for model in models:
                     if not model in (None, '', 'undefined', 'none'):
-                        model_path, model_dir = find_model_file(model, search_dirs, extensions)
+                        model_path, model_dir = find_model_file(model, MODEL_FOLDER_TYPES, MODEL_EXTENSIONS)
                         modelhash = None
                         if model_path and os.path.exists(model_path):
                             modelhash = get_sha256(model_path)
@@ -938,10 +1168,8 @@ class RvImage_SaveImages:
                 # Tensor may be (N, C, H, W) or (C, H, W)
                 if pipe_images.numel() == 0:
                     raise RuntimeError("RvImage_SaveImages: pipe_opt provided but contains an empty tensor for 'images'.")
-                if pipe_images.dim() == 4:
-                    images = [pipe_images[i] for i in range(pipe_images.size(0))]
-                else:
-                    images = [pipe_images]
+                # Kept as one batch; quantized in a single pass below
+                images = pipe_images
             elif isinstance(pipe_images, np.ndarray):
                 if pipe_images.size == 0:
                     raise RuntimeError("RvImage_SaveImages: pipe_opt provided but contains an empty numpy array for 'images'.")
@@ -1000,137 +1228,139 @@ class RvImage_SaveImages:
 
         filename_prefix = string_placeholder(filename_prefix, False)
         
-        # Find existing counter values
-        if filename_number_start:
-            pattern = f"(\\d+){re.escape(delimiter)}{re.escape(filename_prefix)}"
-        else:
-            pattern = f"{re.escape(filename_prefix)}{re.escape(delimiter)}(\\d+)"
-        existing_counters = [
-            int(re.search(pattern, filename).group(1))
-            for filename in os.listdir(output_path)
-            if re.match(pattern, os.path.basename(filename))
-        ]
-        existing_counters.sort(reverse=True)
-
-        # Set initial counter value
-        if existing_counters:
-            counter = existing_counters[0] + 1
-        else:
-            counter = 1
-
         # Set Extension
         file_extension = '.' + extension
         if file_extension not in ALLOWED_EXT:
             cstr(f"The extension `{extension}` is not valid. The valid formats are: {', '.join(sorted(ALLOWED_EXT))}").error.print()
             file_extension = ".png"
 
-        results = list()
-        output_files = list()
-        for image in images:
-            i = 255. * image.cpu().numpy()
-            img = Image.fromarray(np.clip(i, 0, 255).astype(np.uint8))
-
-            # Delegate metadata/pnginfo
-            if extension == 'webp':
-                img_exif = img.getexif()
-                if embed_workflow:
-                    workflow_metadata = ''
-                    prompt_str = ''
-                    if prompt is not None:
-                        prompt_str = json.dumps(prompt)
-                        img_exif[0x010f] = "Prompt:" + prompt_str
-                    if extra_pnginfo is not None:
-                        for x in extra_pnginfo:
-                            workflow_metadata += json.dumps(extra_pnginfo[x])
-                    img_exif[0x010e] = "Workflow:" + workflow_metadata
-                # Debug: show parameters string for webp (webp branch does not currently embed parameters)
+        # Build the metadata once; it is identical for every image in the batch
+        if extension == 'webp':
+            img_exif = Image.Exif()
+            if embed_workflow:
+                workflow_metadata = ''
+                prompt_str = ''
+                if prompt is not None:
+                    prompt_str = json.dumps(prompt)
+                    img_exif[0x010f] = "Prompt:" + prompt_str
+                if extra_pnginfo is not None:
+                    for x in extra_pnginfo:
+                        workflow_metadata += json.dumps(extra_pnginfo[x])
+                img_exif[0x010e] = "Workflow:" + workflow_metadata
+            # Debug: show parameters string for webp (webp branch does not currently embed parameters)
+            try:
+                cstr(f"WEBP parameters (diagnostic): {a111_params}").debug.print()
+            except Exception:
+                pass
+            exif_data = img_exif.tobytes()
+        else:
+            metadata = PngInfo()
+
+            if embed_workflow:
+                if prompt is not None:
+                    metadata.add_text("prompt", json.dumps(prompt))
+                if extra_pnginfo is not None:
+                    for x in extra_pnginfo:
+                        metadata.add_text(x, json.dumps(extra_pnginfo[x]))
+
+            if pipe_opt != None and save_generation_data:
+                # Debug: log exact parameters string we're about to embed
                 try:
-                    cstr(f"WEBP parameters (diagnostic): {a111_params}").debug.print()
+                    cstr(f"Embedding parameters metadata: {a111_params}").debug.print()
                 except Exception:
                     pass
-                exif_data = img_exif.tobytes()
-            else:
-                metadata = PngInfo()
-
-                if embed_workflow:
-                    if prompt is not None:
-                        metadata.add_text("prompt", json.dumps(prompt))
-                    if extra_pnginfo is not None:
-                        for x in extra_pnginfo:
-                            metadata.add_text(x, json.dumps(extra_pnginfo[x]))
-
-                if pipe_opt != None and save_generation_data:
-                    # Debug: log exact parameters string we're about to embed
+                metadata.add_text("parameters", a111_params)
+                # Add a machine-readable lora weights JSON key so other tools
+                # can easily read numeric strengths without parsing the prompt.
+                if lora_weights:
                     try:
-                        cstr(f"Embedding parameters metadata: {a111_params}").debug.print()
-                    except Exception:
-                        pass
-                    metadata.add_text("parameters", a111_params)
-                    # Add a machine-readable lora weights JSON key so other tools
-                    # can easily read numeric strengths without parsing the prompt.
-                    if lora_weights:
-                        try:
-                            metadata.add_text('lora_weights', json.dumps(lora_weights))
-                        except Exception as e:
-                            cstr(f"Failed to add lora_weights metadata: {e}").error.print()
-
-                exif_data = metadata
-
-            # Delegate the filename stuffs
-            if filename_number_start == True:
-                file = f"{counter:0{number_padding}}{delimiter}{filename_prefix}{file_extension}"
-                jsonfile = f"{counter:0{number_padding}}{delimiter}{filename_prefix}"
-            else:
-                file = f"{filename_prefix}{delimiter}{counter:0{number_padding}}{file_extension}"
-                jsonfile = f"{filename_prefix}{delimiter}{counter:0{number_padding}}"
-            if os.path.exists(os.path.join(output_path, file)):
-                counter += 1
+                        metadata.add_text('lora_weights', json.dumps(lora_weights))
+                    except Exception as e:
+                        cstr(f"Failed to add lora_weights metadata: {e}").error.print()
+
+            exif_data = metadata
+
+        if extension in ["jpg", "jpeg"]:
+            save_kwargs = dict(quality=quality, optimize=optimize_image, dpi=(dpi, dpi))
+        elif extension == 'webp':
+            save_kwargs = dict(quality=quality, lossless=lossless_webp, exif=exif_data)
+        elif extension == 'bmp':
+            save_kwargs = {}
+        elif extension == 'tiff':
+            save_kwargs = dict(quality=quality, optimize=optimize_image)
+        else:
+            save_kwargs = dict(pnginfo=exif_data, optimize=optimize_image)
 
-            # Save the images
-            try:
-                output_file = os.path.abspath(os.path.join(output_path, file))
-                if extension in ["jpg", "jpeg"]:
-                    img.save(output_file,
-                             quality=quality, optimize=optimize_image, dpi=(dpi, dpi))
-                elif extension == 'webp':
-                    img.save(output_file,
-                             quality=quality, lossless=lossless_webp, exif=exif_data)
-                elif extension == 'png':
-                    img.save(output_file,
-                             pnginfo=exif_data, optimize=optimize_image)
-                elif extension == 'bmp':
-                    img.save(output_file)
-                elif extension == 'tiff':
-                    img.save(output_file,
-                             quality=quality, optimize=optimize_image)
-                else:
-                    img.save(output_file,
-                             pnginfo=exif_data, optimize=optimize_image)
+        # One device->host transfer and quantization for a whole tensor batch;
+        # pipe lists are converted per image (PIL images are used as they are)
+        if isinstance(images, torch.Tensor):
+            frames = images_to_uint8(images)
+        else:
+            frames = [np.asarray(image) if isinstance(image, Image.Image) else images_to_uint8(torch.as_tensor(image))[0]
+                      for image in images]
 
+        def write_image(frame, output_file, jsonfile):
+            try:
+                Image.fromarray(frame).save(output_file, **save_kwargs)
                 cstr(f"Image file saved to: {output_file}").msg.print()
-                output_files.append(output_file)
-                   
-                if show_previews:
-                    subfolder = self.get_subfolder_path(output_file, original_output)
-                    results.append({
-                        "filename": file,
-                        "subfolder": subfolder,
-                        "type": self.type
-                    })
-
+                saved = True
             except OSError as e:
                 cstr(f'Unable to save file to: {output_file}').error.print()
                 cstr(e).error.print()
+                output_counter.release(output_file)
+                saved = False
             except Exception as e:
                 cstr('Unable to save file due to the to the following error:').error.print()
                 cstr(e).error.print()
+                output_counter.release(output_file)
+                saved = False
 
             if save_workflow_as_json:
                 output_json = os.path.abspath(os.path.join(output_path, jsonfile))
                 save_json(extra_pnginfo, output_json)
                 #output_files.append(jsonfile + ".json")
+            return saved
+
+        # Delegate the filename stuffs; the counter reserves each file atomically
+        jobs = []
+        for frame in frames:
+            counter, file, jsonfile = output_counter.reserve(
+                output_path, filename_prefix, delimiter, filename_number_start, number_padding, file_extension)
+            jobs.append((frame, os.path.abspath(os.path.join(output_path, file)), jsonfile))
+
+        # Save the images. Previews send the UI to the files, so they always
+        # wait for the writes to finish.
+        wait_for_write = wait_for_write or show_previews
+        if encode_workers <= 1 and wait_for_write:
+            saved = [write_image(*job) for job in jobs]
+        else:
+            pool = get_encode_pool(encode_workers)
+            futures = [pool.submit(write_image, *job) for job in jobs]
+            if wait_for_write:
+                saved = [f.result() for f in futures]
+            else:
+                # Only files already on disk are reported; the rest are
+                # written in the background and log their own failures
+                saved = []
+                for job, future in zip(jobs, futures):
+                    if future.done():
+                        saved.append(future.exception() is None and future.result())
+                    else:
+                        saved.append(False)
+                        future.add_done_callback(partial(report_background_write, job[1]))
+                pending = saved.count(False)
+                if pending:
+                    cstr(f"{pending} image(s) still being written in the background").msg.print()
 
-            counter += 1
+        results = list()
+        output_files = [job[1] for job, ok in zip(jobs, saved) if ok]
+        if show_previews:
+            for output_file in output_files:
+                results.append({
+                    "filename": os.path.basename(output_file),
+                    "subfolder": self.get_subfolder_path(output_file, original_output),
+                    "type": self.type
+                })
 
         filtered_paths = []
 
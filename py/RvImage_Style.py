@@ -11,15 +11,12 @@ from typing import Union, List
 import subprocess
 
 from ..core import CATEGORY, cstr
+from ..core.image_utils import images_to_uint8, pil2tensor
 
 try:
     import pilgram
 except ImportError:
     subprocess.check_call(['pip', 'install', 'pilgram'])
-def tensor2pil(image):
-    return Image.fromarray(np.clip(255. * image.cpu().numpy().squeeze(), 0, 255).astype(np.uint8))
-def pil2tensor(image):
-    return torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
 
 class RvImage_Style:
     def __init__(self):
@@ -86,16 +83,18 @@ class RvImage_Style:
 
         tensors = []
         if All:
-            for img in image:
+            for frame in images_to_uint8(image):
+                pil_img = Image.fromarray(np.squeeze(frame))
                 for filter_name, filter_func in style_map.items():
-                    tensors.append(pil2tensor(filter_func(tensor2pil(img))))
+                    tensors.append(pil2tensor(filter_func(pil_img)))
             tensors = torch.cat(tensors, dim=0)
             return (tensors,)
         else:
-            for img in image:
-                filter_func = style_map.get(style, lambda x: x)
-                styled_img = pil2tensor(filter_func(tensor2pil(img))) if style in style_map else img
-                tensors.append(styled_img)
+            if style not in style_map:
+                return (image,)
+            filter_func = style_map[style]
+            for frame in images_to_uint8(image):
+                tensors.append(pil2tensor(filter_func(Image.fromarray(np.squeeze(frame)))))
             tensors = torch.cat(tensors, dim=0)
             return (tensors,)
 
@@ -4,12 +4,15 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 import os
-import comfy
-import comfy.sd
 import torch
 import folder_paths
 
+from typing import Optional
+
 from ..core import CATEGORY, cstr, RESOLUTION_PRESETS, RESOLUTION_MAP
+from ..core.safetensors_header import latent_channels, preflight
+from ..core.model_cache import load_checkpoint, load_vae
+from ..core.model_index import model_file_index
 
 MAX_RESOLUTION = 32768
 
@@ -17,12 +20,12 @@ MAX_RESOLUTION = 32768
 LATENT_CHANNELS = 4
 UNET_DOWNSAMPLE = 8
 
-def _detect_latent_channels_from_vae_obj(vae_obj) -> int:
+def _detect_latent_channels_from_vae_obj(vae_obj) -> Optional[int]:
     try:
-        if hasattr(vae_obj, 'channels') and isinstance(getattr(vae_obj, 'channels'), int):
-            return getattr(vae_obj, 'channels')
         if hasattr(vae_obj, 'latent_channels') and isinstance(getattr(vae_obj, 'latent_channels'), int):
             return getattr(vae_obj, 'latent_channels')
+        if hasattr(vae_obj, 'channels') and isinstance(getattr(vae_obj, 'channels'), int):
+            return getattr(vae_obj, 'channels')
         for attr in ('encoder', 'conv_in', 'down_blocks'):
             sub = getattr(vae_obj, attr, None)
             if sub is not None and hasattr(sub, 'weight'):
@@ -34,7 +37,7 @@ def _detect_latent_channels_from_vae_obj(vae_obj) -> int:
                     pass
     except Exception:
         pass
-    return LATENT_CHANNELS
+    return None
 
 class RvLoader_Checkpoint_Loader:
     resolution = RESOLUTION_PRESETS
@@ -47,8 +50,8 @@ class RvLoader_Checkpoint_Loader:
     def INPUT_TYPES(cls) -> dict:
         return {
             "required": {
-                "ckpt_name": (folder_paths.get_filename_list("checkpoints"), "Select a checkpoint file to load. Prefer .safetensors for safety"),
-                "vae_name": (["Baked VAE"] + folder_paths.get_filename_list("vae"), "Optional VAE to load (or use baked VAE in the checkpoint)"),
+                "ckpt_name": (model_file_index.filenames("checkpoints"), "Select a checkpoint file to load. Prefer .safetensors for safety"),
+                "vae_name": (["Baked VAE"] + model_file_index.filenames("vae"), "Optional VAE to load (or use baked VAE in the checkpoint)"),
                 "Baked_Clip": ("BOOLEAN", {"default": True}, "If enabled, return the baked CLIP from the checkpoint"),
                 "Use_Clip_Layer": ("BOOLEAN", {"default": True}, "If enabled, trim CLIP to the requested layer index"),
                 "stop_at_clip_layer": ("INT", {"default": -2, "min": -24, "max": -1, "step": 1}, "When trimming CLIP, stop at this layer index"),
@@ -92,8 +95,11 @@ class RvLoader_Checkpoint_Loader:
             cstr(msg).error.print()
             raise RuntimeError(msg)
 
+        # Check the checkpoint and VAE headers before any weights are read
+        preflight(checkpoint=ckpt_path, vae=None if vae_name == "Baked VAE" else folder_paths.get_full_path("vae", vae_name))
+
         output_vae = (vae_name == "Baked VAE")
-        loaded_ckpt = comfy.sd.load_checkpoint_guess_config(
+        loaded_ckpt = load_checkpoint(
             ckpt_path,
             output_vae=output_vae,
             output_clip=Baked_Clip,
@@ -103,6 +109,7 @@ class RvLoader_Checkpoint_Loader:
         ckpt_model, ckpt_clip, ckpt_vae = loaded_ckpt[:3]
 
         # VAE selection
+        vae_path = ""
         if vae_name == "Baked VAE":
             loaded_vae = ckpt_vae
         else:
@@ -111,7 +118,7 @@ class RvLoader_Checkpoint_Loader:
                 cstr(f"Selected VAE not found: {vae_path}. Falling back to baked VAE if available.").warning.print()
                 loaded_vae = ckpt_vae
             else:
-                loaded_vae = comfy.sd.VAE(sd=comfy.utils.load_torch_file(vae_path))
+                loaded_vae = load_vae(vae_path)
 
         # CLIP selection
         if Baked_Clip:
@@ -127,32 +134,17 @@ class RvLoader_Checkpoint_Loader:
         if resolution != "Custom" and resolution in self.resolution_map:
             width, height = self.resolution_map[resolution]
 
-        # Attempt detection of latent channels from external or baked VAE
-        detected_latent_channels = LATENT_CHANNELS
-        try:
-            if vae_name != "Baked VAE":
-                vae_path = folder_paths.get_full_path("vae", vae_name)
-                if vae_path and os.path.isfile(vae_path):
-                    sd_obj = comfy.utils.load_torch_file(vae_path)
-                    try:
-                        vae_inst = comfy.sd.VAE(sd=sd_obj)
-                        detected_latent_channels = _detect_latent_channels_from_vae_obj(vae_inst)
-                        cstr(f"Detected Latent Channels: {detected_latent_channels}").msg.print()
-                    except Exception:
-                        if isinstance(sd_obj, dict):
-                            for k, v in sd_obj.items():
-                                if hasattr(v, 'ndim') and v.ndim == 4:
-                                    detected_latent_channels = int(v.shape[0])
-                                    cstr(f"Detected Latent Channels: {detected_latent_channels}").warning.print()
-                                    break
-            else:
-                # baked VAE from checkpoint (if available)
-                if 'ckpt_vae' in locals() and ckpt_vae is not None:
-                    detected_latent_channels = _detect_latent_channels_from_vae_obj(ckpt_vae)
-                    cstr(f"Detected Latent Channels: {detected_latent_channels}").msg.print()
-        except Exception:
+        # Detect latent channels from the VAE that is already loaded, falling back
+        # to the safetensors header of its file (cached per file). The VAE
+        # weights are never read a second time.
+        detected_latent_channels = _detect_latent_channels_from_vae_obj(loaded_vae)
+        if detected_latent_channels is None:
+            detected_latent_channels = latent_channels(vae_path if vae_path and os.path.isfile(vae_path) else ckpt_path)
+        if detected_latent_channels is None:
             detected_latent_channels = LATENT_CHANNELS
             cstr(f"Fallback to Default Latent Channels: {detected_latent_channels}").warning.print()
+        else:
+            cstr(f"Detected Latent Channels: {detected_latent_channels}").msg.print()
 
         latent = torch.zeros([batch_size, detected_latent_channels, height // UNET_DOWNSAMPLE, width // UNET_DOWNSAMPLE])
         return (ckpt_model, loaded_clip, loaded_vae, {"samples": latent}, ckpt_name)
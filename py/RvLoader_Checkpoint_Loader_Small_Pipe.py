@@ -4,12 +4,13 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 import os
-import comfy
-import comfy.sd
 import torch
 import folder_paths
 
 from ..core import CATEGORY, cstr
+from ..core.model_cache import load_checkpoint, load_vae
+from ..core.model_index import model_file_index
+from ..core.safetensors_header import preflight
 
 class RvLoader_Checkpoint_Loader_Small_Pipe:
     def __init__(self) -> None:
@@ -19,8 +20,8 @@ class RvLoader_Checkpoint_Loader_Small_Pipe:
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "ckpt_name": (folder_paths.get_filename_list("checkpoints"), "Select the checkpoint file to load (v1 format)."),
-                "vae_name": (["Baked VAE"] + folder_paths.get_filename_list("vae"), "Select a VAE or choose 'Baked VAE' to use the one embedded in the checkpoint."),
+                "ckpt_name": (model_file_index.filenames("checkpoints"), "Select the checkpoint file to load (v1 format)."),
+                "vae_name": (["Baked VAE"] + model_file_index.filenames("vae"), "Select a VAE or choose 'Baked VAE' to use the one embedded in the checkpoint."),
                 "stop_at_clip_layer": ("INT", {"default": -2, "min": -24, "max": -1, "step": 1}, "Negative index to stop CLIP at. -1 means full CLIP."),
             },
         }
@@ -86,9 +87,12 @@ class RvLoader_Checkpoint_Loader_Small_Pipe:
                 elif ext not in safe_exts:
                     cstr(f"Warning: unknown checkpoint extension: {ext}. Proceeding, but verify file.").warning.print()
 
+            # Check the checkpoint and VAE headers before any weights are read
+            preflight(checkpoint=ckpt_path_real, vae=None if vae_name == "Baked VAE" else folder_paths.get_full_path("vae", vae_name))
+
             output_vae = (vae_name == "Baked VAE")
 
-            loaded_ckpt = comfy.sd.load_checkpoint_guess_config(
+            loaded_ckpt = load_checkpoint(
                 ckpt_path_real,
                 output_vae=output_vae,
                 output_clip=True,
@@ -108,8 +112,7 @@ class RvLoader_Checkpoint_Loader_Small_Pipe:
                 vae_path_real = os.path.realpath(os.path.abspath(vae_path))
                 if not os.path.isfile(vae_path_real) or not os.access(vae_path_real, os.R_OK):
                     raise FileNotFoundError(f"VAE file is not accessible: {vae_path_real}")
-                sd_obj = comfy.utils.load_torch_file(vae_path_real)
-                loaded_vae = comfy.sd.VAE(sd=sd_obj)
+                loaded_vae = load_vae(vae_path_real)
 
             # CLIP: avoid cloning unless trimming is requested
             clip_candidate = ckpt_parts[1] if ckpt_parts is not None else getattr(loaded_ckpt, "clip", None)
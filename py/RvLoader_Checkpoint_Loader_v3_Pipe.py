@@ -11,6 +11,41 @@ import folder_paths
 import comfy.utils
 
 from ..core import CATEGORY, cstr
+from ..core.safetensors_header import preflight
+from ..core.model_cache import ComponentPrefetch, load_checkpoint, load_clip, load_diffusion_model, load_vae
+from ..core.model_index import model_file_index
+
+def _unet_model_options(weight_dtype: str) -> dict:
+    # model_options for comfy.sd.load_diffusion_model from the weight_dtype widget
+    model_options = {}
+    if weight_dtype == "fp8_e4m3fn":
+        model_options["dtype"] = torch.float8_e4m3fn
+    elif weight_dtype == "fp8_e4m3fn_fast":
+        model_options["dtype"] = torch.float8_e4m3fn
+        model_options["fp8_optimizations"] = True
+    elif weight_dtype == "fp8_e5m2":
+        model_options["dtype"] = torch.float8_e5m2
+    return model_options
+
+def _clip_type(clip_type_: str):
+    # comfy CLIPType for the clip_type_ widget
+    if clip_type_ == "sdxl":
+        return comfy.sd.CLIPType.STABLE_DIFFUSION
+    elif clip_type_ == "sd3":
+        return comfy.sd.CLIPType.SD3
+    elif clip_type_ == "flux":
+        return comfy.sd.CLIPType.FLUX
+    elif clip_type_ == "qwen_image":
+        return comfy.sd.CLIPType.QWEN_IMAGE
+    elif clip_type_ == "hidream":
+        return comfy.sd.CLIPType.HIDREAM
+    elif clip_type_ == "hunyuan_image":
+        return comfy.sd.CLIPType.HUNYUAN_IMAGE
+    elif clip_type_ == "chroma":
+        return comfy.sd.CLIPType.CHROMA
+    elif clip_type_ == "wan":
+        return comfy.sd.CLIPType.WAN
+    return comfy.sd.CLIPType.STABLE_DIFFUSION
 
 class RvLoader_Checkpoint_Loader_v3_Pipe:
     def __init__(self):
@@ -18,21 +53,26 @@ class RvLoader_Checkpoint_Loader_v3_Pipe:
 
     @classmethod
     def INPUT_TYPES(cls):
+        # Cached, mtime-invalidated folder listings; one CLIP list serves all CLIP inputs
+        clip_names = model_file_index.filenames("clip") + ["None"]
         return {
             "required": {
-                "ckpt_name": (folder_paths.get_filename_list("checkpoints") + ["None"], {"default": "None"}, "Checkpoint filename to load (or 'None' to use a UNet file)"),
-                "unet_name": (folder_paths.get_filename_list("diffusion_models") + ["None"], {"default": "None"}, "Diffusion UNet checkpoint (used when 'load_unet_checkpoint' is True)"),
+                "ckpt_name": (model_file_index.filenames("checkpoints") + ["None"], {"default": "None"}, "Checkpoint filename to load (or 'None' to use a UNet file)"),
+                "unet_name": (model_file_index.filenames("diffusion_models") + ["None"], {"default": "None"}, "Diffusion UNet checkpoint (used when 'load_unet_checkpoint' is True)"),
                 "weight_dtype": (["default", "fp8_e4m3fn", "fp8_e4m3fn_fast", "fp8_e5m2"], {"default": "default"}, "Weight dtype for UNet when loading a diffusion model"),
-                "clip_name1": (folder_paths.get_filename_list("clip") + ["None"], {"default": "None"}, "Primary CLIP module (or 'None' to use baked CLIP from the checkpoint)"),
-                "clip_name2": (folder_paths.get_filename_list("clip") + ["None"], {"default": "None"}, "Optional second CLIP module (for ensemble)"),
-                "clip_name3": (folder_paths.get_filename_list("clip") + ["None"], {"default": "None"}, "Optional third CLIP module (for ensemble)"),
+                "clip_name1": (clip_names, {"default": "None"}, "Primary CLIP module (or 'None' to use baked CLIP from the checkpoint)"),
+                "clip_name2": (clip_names, {"default": "None"}, "Optional second CLIP module (for ensemble)"),
+                "clip_name3": (clip_names, {"default": "None"}, "Optional third CLIP module (for ensemble)"),
                 "clip_type_": (["sdxl", "sd3", "flux", "qwen_image", "hidream", "hunyuan_image", "wan"], {"default": "flux"}, "CLIP flavor/type to interpret when loading external CLIP modules"),
-                "vae_name": (["Baked VAE"] + folder_paths.get_filename_list("vae"), {"default": "Baked VAE"}, "VAE file to load, or use baked VAE from the checkpoint"),
+                "vae_name": (["Baked VAE"] + model_file_index.filenames("vae"), {"default": "Baked VAE"}, "VAE file to load, or use baked VAE from the checkpoint"),
                 "baked_clip": ("BOOLEAN", {"default": True}, "Use baked CLIP from checkpoint if available"),
                 "enable_clip_layer": ("BOOLEAN", {"default": True}, "When enabled, trim CLIP to `stop_at_clip_layer` (memory-costly)"),
                 "stop_at_clip_layer": ("INT", {"default": -2, "min": -24, "max": -1, "step": 1}, "Layer index to stop at when trimming CLIP"),
                 "load_unet_checkpoint": ("BOOLEAN", {"default": False}, "If True, load a UNet checkpoint from 'unet_name' instead of a regular checkpoint"),
             },
+            "optional": {
+                "parallel_load": ("BOOLEAN", {"default": False, "tooltip": "Read the UNet/checkpoint, CLIP files and VAE concurrently (needs enough free RAM for all of them)"}),
+            },
         }
 
     CATEGORY = CATEGORY.MAIN.value + CATEGORY.CHECKPOINT.value
@@ -41,7 +81,7 @@ class RvLoader_Checkpoint_Loader_v3_Pipe:
     FUNCTION = "execute"
 
     def execute(self, ckpt_name: str, unet_name: str, weight_dtype: str, clip_name1: str, clip_name2: str, clip_name3: str, clip_type_: str,
-                vae_name: str, baked_clip: bool, enable_clip_layer: bool, stop_at_clip_layer: int, load_unet_checkpoint: bool) -> tuple:
+                vae_name: str, baked_clip: bool, enable_clip_layer: bool, stop_at_clip_layer: int, load_unet_checkpoint: bool, parallel_load: bool = False) -> tuple:
 
         # normalize boolean-ish inputs
         baked_clip = bool(baked_clip)
@@ -75,131 +115,147 @@ class RvLoader_Checkpoint_Loader_v3_Pipe:
 
         safe_exts = {".safetensors", ".sft"}
 
-        # Regular checkpoint path
-        if ckpt_name not in (None, '', 'undefined', 'None') and not load_unet_checkpoint:
-            ckpt_path = folder_paths.get_full_path("checkpoints", ckpt_name)
-
-            # extension and existence checks
-            _, ext = os.path.splitext(ckpt_path.lower())
-            # Prefers safetensors; warn if extension is not a known safe extension
-            if ext not in safe_exts:
-                cstr(f"Selected checkpoint '{ckpt_name}' uses non-preferred extension '{ext}'. Consider converting to .safetensors for safety/performance.").msg.print()
-
-            # Ensure the checkpoint path exists and is readable. Fail-fast when
-            # the file cannot be accessed rather than silently logging and
-            # letting a downstream loader raise a less-helpful error.
-            if not os.path.isfile(ckpt_path) or not os.access(ckpt_path, os.R_OK):
-                msg = f"Checkpoint file not found or not readable: {ckpt_path}"
-                cstr(msg).error.print()
-                raise RuntimeError(msg)
-
-            # load the checkpoint (may include baked VAE/CLIP)
-            loaded_ckpt = comfy.sd.load_checkpoint_guess_config(
-                ckpt_path,
-                output_vae=baked_vae,
-                output_clip=baked_clip,
-                embedding_directory=folder_paths.get_folder_paths("embeddings"),
-            )
-            checkpoint = ckpt_name
-            # Cache commonly used checkpoint parts defensively
-            ckpt_parts = loaded_ckpt[:3] if hasattr(loaded_ckpt, '__len__') and len(loaded_ckpt) >= 3 else None
-            # handle baked clip (clone only when trimming requested)
-            if baked_clip and ckpt_parts is not None:
-                base_clip = ckpt_parts[1]
-                if enable_clip_layer:
-                    loaded_clip = base_clip.clone()
-                    loaded_clip.clip_layer(stop_at_clip_layer)
-                else:
-                    loaded_clip = base_clip
-
-        # UNet checkpoint
-        elif unet_name not in (None, '', 'undefined', 'None') and load_unet_checkpoint:
-            model_options = {}
-            if weight_dtype == "fp8_e4m3fn":
-                model_options["dtype"] = torch.float8_e4m3fn
-            elif weight_dtype == "fp8_e4m3fn_fast":
-                model_options["dtype"] = torch.float8_e4m3fn
-                model_options["fp8_optimizations"] = True
-            elif weight_dtype == "fp8_e5m2":
-                model_options["dtype"] = torch.float8_e5m2
-
-            ckpt_path = folder_paths.get_full_path_or_raise("diffusion_models", unet_name)
-            _, ext = os.path.splitext(ckpt_path.lower())
-            if ext not in safe_exts:
-                cstr(f"Selected UNet checkpoint '{unet_name}' uses non-preferred extension '{ext}'. Consider converting to .safetensors.").msg.print()
-
-            # Verify UNet checkpoint accessibility and fail-fast on error.
-            if not os.path.isfile(ckpt_path) or not os.access(ckpt_path, os.R_OK):
-                msg = f"UNet checkpoint not found or not readable: {ckpt_path}"
-                cstr(msg).error.print()
-                raise RuntimeError(msg)
-
-            loaded_ckpt = comfy.sd.load_diffusion_model(ckpt_path, model_options=model_options)
-            checkpoint = unet_name
-
-        else:
-            raise ValueError("Missing Input: No Checkpoint selected or wrong combination of settings.")
-
-        # VAE loading
-        if vae_name == "Baked VAE":
-            if not load_unet_checkpoint:
-                loaded_vae = ckpt_parts[2] if ckpt_parts is not None else None
-            else:
-                raise ValueError("Missing Input: Select a VAE File when loading a UNet checkpoint")
-        else:
-            vae_path = folder_paths.get_full_path("vae", vae_name)
-            if not os.path.isfile(vae_path):
-                cstr(f"Selected VAE not found: {vae_path}. Falling back to baked VAE if available.").msg.print()
-                loaded_vae = ckpt_parts[2] if ckpt_parts is not None else None
-            else:
-                loaded_vae = comfy.sd.VAE(sd=comfy.utils.load_torch_file(vae_path))
-
-        # CLIP mapping
-        if clip_type_ == "sdxl":
-            clip_type = comfy.sd.CLIPType.STABLE_DIFFUSION
-        elif clip_type_ == "sd3":
-            clip_type = comfy.sd.CLIPType.SD3
-        elif clip_type_ == "flux":
-            clip_type = comfy.sd.CLIPType.FLUX
-        elif clip_type_ == "qwen_image":
-            clip_type = comfy.sd.CLIPType.QWEN_IMAGE
-        elif clip_type_ == "hidream":
-            clip_type = comfy.sd.CLIPType.HIDREAM
-        elif clip_type_ == "hunyuan_image":
-            clip_type = comfy.sd.CLIPType.HUNYUAN_IMAGE
-        elif clip_type_ == "chroma":
-            clip_type = comfy.sd.CLIPType.CHROMA
-        elif clip_type_ == "wan":
-            clip_type = comfy.sd.CLIPType.WAN
-        else:
-            clip_type = comfy.sd.CLIPType.STABLE_DIFFUSION
-
-        # load external CLIP modules when baked_clip is False
+        # Resolve the component files up front: their safetensors headers are
+        # checked before any weights are read, and parallel_load can start
+        # reading them all at once.
+        unet_path = full_ckpt_path = full_vae_path = None
+        clip_paths = []
+        if load_unet_checkpoint:
+            if unet_name not in (None, '', 'undefined', 'None'):
+                unet_path = folder_paths.get_full_path("diffusion_models", unet_name)
+        elif ckpt_name not in (None, '', 'undefined', 'None'):
+            full_ckpt_path = folder_paths.get_full_path("checkpoints", ckpt_name)
+        if not baked_vae:
+            full_vae_path = folder_paths.get_full_path("vae", vae_name)
         if not baked_clip:
-            if clip_name1 not in (None, '', 'undefined', 'None'):
-                clip_path1 = folder_paths.get_full_path_or_raise("clip", clip_name1)
+            clip_paths = [folder_paths.get_full_path("clip", n) for n in (clip_name1, clip_name2, clip_name3) if n not in (None, '', 'undefined', 'None')]
+        preflight(checkpoint=full_ckpt_path, unet=unet_path, clips=clip_paths, vae=full_vae_path)
+
+        # Opt-in: start reading all independent component files concurrently.
+        # The load calls below pick the results up from the shared component
+        # cache, waiting for any that are still in flight. Settings the checks
+        # below reject queue nothing, and finish() runs however the node exits
+        # so no load outlives it.
+        prefetch = None
+        clip1_missing = clip_name1 in (None, '', 'undefined', 'None')
+        rejected = (load_unet_checkpoint and (baked_vae or baked_clip)) or (not baked_clip and clip1_missing)
+        if parallel_load and not rejected:
+            prefetch = ComponentPrefetch()
+            embeddings = folder_paths.get_folder_paths("embeddings")
+            if unet_path:
+                prefetch.add("unet", unet_path, load_diffusion_model, unet_path, model_options=_unet_model_options(weight_dtype))
+            elif full_ckpt_path:
+                prefetch.add("checkpoint", full_ckpt_path, load_checkpoint, full_ckpt_path,
+                             output_vae=baked_vae, output_clip=baked_clip, embedding_directory=embeddings)
+            prefetch.add("vae", full_vae_path, load_vae, full_vae_path)
+            prefetch.add("clip", clip_paths, load_clip, clip_paths, embedding_directory=embeddings, clip_type=_clip_type(clip_type_))
+            prefetch.start()
+
+        try:
+            # Regular checkpoint path
+            if ckpt_name not in (None, '', 'undefined', 'None') and not load_unet_checkpoint:
+                ckpt_path = folder_paths.get_full_path("checkpoints", ckpt_name)
+
+                # extension and existence checks
+                _, ext = os.path.splitext(ckpt_path.lower())
+                # Prefers safetensors; warn if extension is not a known safe extension
+                if ext not in safe_exts:
+                    cstr(f"Selected checkpoint '{ckpt_name}' uses non-preferred extension '{ext}'. Consider converting to .safetensors for safety/performance.").msg.print()
+
+                # Ensure the checkpoint path exists and is readable. Fail-fast when
+                # the file cannot be accessed rather than silently logging and
+                # letting a downstream loader raise a less-helpful error.
+                if not os.path.isfile(ckpt_path) or not os.access(ckpt_path, os.R_OK):
+                    msg = f"Checkpoint file not found or not readable: {ckpt_path}"
+                    cstr(msg).error.print()
+                    raise RuntimeError(msg)
+
+                # load the checkpoint (may include baked VAE/CLIP)
+                loaded_ckpt = load_checkpoint(
+                    ckpt_path,
+                    output_vae=baked_vae,
+                    output_clip=baked_clip,
+                    embedding_directory=folder_paths.get_folder_paths("embeddings"),
+                )
+                checkpoint = ckpt_name
+                # Cache commonly used checkpoint parts defensively
+                ckpt_parts = loaded_ckpt[:3] if hasattr(loaded_ckpt, '__len__') and len(loaded_ckpt) >= 3 else None
+                # handle baked clip (clone only when trimming requested)
+                if baked_clip and ckpt_parts is not None:
+                    base_clip = ckpt_parts[1]
+                    if enable_clip_layer:
+                        loaded_clip = base_clip.clone()
+                        loaded_clip.clip_layer(stop_at_clip_layer)
+                    else:
+                        loaded_clip = base_clip
+
+            # UNet checkpoint
+            elif unet_name not in (None, '', 'undefined', 'None') and load_unet_checkpoint:
+                model_options = _unet_model_options(weight_dtype)
+
+                ckpt_path = folder_paths.get_full_path_or_raise("diffusion_models", unet_name)
+                _, ext = os.path.splitext(ckpt_path.lower())
+                if ext not in safe_exts:
+                    cstr(f"Selected UNet checkpoint '{unet_name}' uses non-preferred extension '{ext}'. Consider converting to .safetensors.").msg.print()
+
+                # Verify UNet checkpoint accessibility and fail-fast on error.
+                if not os.path.isfile(ckpt_path) or not os.access(ckpt_path, os.R_OK):
+                    msg = f"UNet checkpoint not found or not readable: {ckpt_path}"
+                    cstr(msg).error.print()
+                    raise RuntimeError(msg)
+
+                loaded_ckpt = load_diffusion_model(ckpt_path, model_options=model_options)
+                checkpoint = unet_name
+
+            else:
+                raise ValueError("Missing Input: No Checkpoint selected or wrong combination of settings.")
+
+            # VAE loading
+            if vae_name == "Baked VAE":
+                if not load_unet_checkpoint:
+                    loaded_vae = ckpt_parts[2] if ckpt_parts is not None else None
+                else:
+                    raise ValueError("Missing Input: Select a VAE File when loading a UNet checkpoint")
             else:
-                raise ValueError("Missing Input: Select a Clip Model for 'clip_name1' or set 'baked_clip' = True")
+                vae_path = folder_paths.get_full_path("vae", vae_name)
+                if not os.path.isfile(vae_path):
+                    cstr(f"Selected VAE not found: {vae_path}. Falling back to baked VAE if available.").msg.print()
+                    loaded_vae = ckpt_parts[2] if ckpt_parts is not None else None
+                else:
+                    loaded_vae = load_vae(vae_path)
+
+            # CLIP mapping
+            clip_type = _clip_type(clip_type_)
 
-            if clip_name2 not in (None, '', 'undefined', 'None'):
-                clip_path2 = folder_paths.get_full_path_or_raise("clip", clip_name2)
+            # load external CLIP modules when baked_clip is False
+            if not baked_clip:
+                if clip_name1 not in (None, '', 'undefined', 'None'):
+                    clip_path1 = folder_paths.get_full_path_or_raise("clip", clip_name1)
+                else:
+                    raise ValueError("Missing Input: Select a Clip Model for 'clip_name1' or set 'baked_clip' = True")
 
-            if clip_name3 not in (None, '', 'undefined', 'None'):
-                clip_path3 = folder_paths.get_full_path_or_raise("clip", clip_name3)
+                if clip_name2 not in (None, '', 'undefined', 'None'):
+                    clip_path2 = folder_paths.get_full_path_or_raise("clip", clip_name2)
 
-            ckpt_list = [p for p in (clip_path1, clip_path2, clip_path3) if p]
-            if ckpt_list:
-                loaded_clip = comfy.sd.load_clip(
-                    ckpt_paths=ckpt_list,
-                    embedding_directory=folder_paths.get_folder_paths("embeddings"),
-                    clip_type=clip_type,
-                )
-        else:
-            if load_unet_checkpoint:
-                raise ValueError("Missing Input: CLIP, set 'baked_clip' to False and select clip models when loading a UNet checkpoint.")
+                if clip_name3 not in (None, '', 'undefined', 'None'):
+                    clip_path3 = folder_paths.get_full_path_or_raise("clip", clip_name3)
 
-        if loaded_clip is None:
-            raise ValueError("Missing Input: CLIP")
+                ckpt_list = [p for p in (clip_path1, clip_path2, clip_path3) if p]
+                if ckpt_list:
+                    loaded_clip = load_clip(
+                        ckpt_paths=ckpt_list,
+                        embedding_directory=folder_paths.get_folder_paths("embeddings"),
+                        clip_type=clip_type,
+                    )
+            else:
+                if load_unet_checkpoint:
+                    raise ValueError("Missing Input: CLIP, set 'baked_clip' to False and select clip models when loading a UNet checkpoint.")
+
+            if loaded_clip is None:
+                raise ValueError("Missing Input: CLIP")
+        finally:
+            if prefetch is not None:
+                prefetch.finish()
 
         # Normalize into canonical dict-style pipe
         pipe = {
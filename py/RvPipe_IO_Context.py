@@ -6,6 +6,7 @@
 import comfy
 import comfy.sd
 from ..core import CATEGORY, cstr
+from ..core.context import context_fields, context_return_tuple, new_context as _new_context
 from ..core import AnyType
 
 any = AnyType("*")
@@ -79,42 +80,19 @@ def _create_context_data(input_list=None):
 
 ALL_CTX_OPTIONAL_INPUTS, ALL_CTX_OPTIONAL_OUTPUTS, ALL_CTX_RETURN_TYPES, ALL_CTX_RETURN_NAMES = _create_context_data()
 
+_CTX_FIELDS = context_fields(_all_context_input_output_data)
+
 def new_context(pipe=None, **kwargs):
     # Creates a new context from the provided data, with an optional base ctx to start.
-    # pipe can be dict or tuple
-    if isinstance(pipe, tuple):
-        # Assume it's the tuple from get_context_return_tuple, first is dict
-        context = pipe[0] if pipe else {}
-    elif isinstance(pipe, dict):
-        context = pipe
-    else:
-        context = {}
-    # Only copy known keys from pipe input, ignore unknown keys
-    new_ctx = {}
-    for key in _all_context_input_output_data:
-        if key == "pipe":
-            continue
-        if key in context:
-            new_ctx[key] = context[key]
-    # Apply kwargs overrides for known keys
-    for key in _all_context_input_output_data:
-        if key == "pipe":
-            continue
-        v = kwargs.get(key, None)
-        if v is not None:
-            new_ctx[key] = v
-    return new_ctx
+    # pipe can be dict or tuple; a Context from an upstream node is shared, not copied,
+    # when nothing is overridden. Only known keys are kept.
+    return _new_context(pipe, _CTX_FIELDS, kwargs)
 
 def get_context_return_tuple(ctx, inputs_list=None):
     # Returns a tuple for returning in the order of the inputs list.
     if inputs_list is None:
-        inputs_list = _all_context_input_output_data.keys()
-    tup_list = [ctx]
-    for key in inputs_list:
-        if key == "pipe":
-            continue
-        tup_list.append(ctx.get(key, None))
-    return tuple(tup_list)
+        return context_return_tuple(ctx, _CTX_FIELDS)
+    return context_return_tuple(ctx, context_fields(dict.fromkeys(inputs_list)))
 
 class RvPipe_IO_Context:
     # Node class for passing through a context for general workflows.
@@ -4,7 +4,8 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 from ..core import CATEGORY, cstr, purge_vram
-from typing import Any, Dict, Tuple
+from ..core.lazy import pending_input
+from typing import Any, Dict, List, Tuple
 
 class RvSwitch_ControlNet:
     CATEGORY = CATEGORY.MAIN.value + CATEGORY.SWITCHES.value
@@ -20,11 +21,15 @@ class RvSwitch_ControlNet:
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If True, purges VRAM before switching."}),
             },
             "optional": {
-                "input1": ("CONTROL_NET", {"forceInput": True, "tooltip": "First CONTROL_NET input."}),
-                "input2": ("CONTROL_NET", {"forceInput": True, "tooltip": "Second CONTROL_NET input."}),
+                "input1": ("CONTROL_NET", {"forceInput": True, "lazy": True, "tooltip": "First CONTROL_NET input."}),
+                "input2": ("CONTROL_NET", {"forceInput": True, "lazy": True, "tooltip": "Second CONTROL_NET input."}),
             }
         }
 
+    def check_lazy_status(self, Input: int, Purge_VRAM: bool = False, **kwargs) -> List[str]:
+        # Only the selected input is evaluated; the other branch never runs
+        return pending_input("input1" if Input == 1 else "input2", kwargs)
+
     def execute(self, Input: int, Purge_VRAM: bool, input1: Any = None, input2: Any = None) -> Tuple[Any]:
 
         if Purge_VRAM:
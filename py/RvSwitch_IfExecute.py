@@ -5,7 +5,7 @@
 
 from ..core import CATEGORY, cstr, purge_vram
 from ..core import AnyType
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 any = AnyType("*")
 
@@ -18,13 +18,20 @@ class RvSwitch_IfExecute:
     def INPUT_TYPES(cls) -> Dict[str, Any]:
         return {
             "required": {
-                "on_true": (any, {"tooltip": "Value to return if boolean is True."}),
-                "on_false": (any, {"tooltip": "Value to return if boolean is False."}),
+                "on_true": (any, {"lazy": True, "tooltip": "Value to return if boolean is True. Only evaluated when selected."}),
+                "on_false": (any, {"lazy": True, "tooltip": "Value to return if boolean is False. Only evaluated when selected."}),
                 "boolean": ("BOOLEAN", {"forceInput": True, "tooltip": "Condition to select on_true or on_false."}),
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If True, purges VRAM before switching."}),
             }
         }
 
+    def check_lazy_status(self, on_true: Any = None, on_false: Any = None, boolean: bool = True, Purge_VRAM: bool = False) -> List[str]:
+        # boolean is a regular input and is already evaluated here; request
+        # only the branch it selects
+        if boolean:
+            return ["on_true"] if on_true is None else []
+        return ["on_false"] if on_false is None else []
+
     def execute(self, on_true: Any, on_false: Any, boolean: bool = True, Purge_VRAM: bool = False) -> Tuple[Any]:
 
         if Purge_VRAM:
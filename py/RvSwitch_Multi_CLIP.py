@@ -5,19 +5,21 @@
 
 from __future__ import annotations
 from ..core import CATEGORY, purge_vram
+from ..core.lazy import DynamicInputs, EXECUTION_HIDDEN, first_pending_input
 
 class RvSwitch_Multi_CLIP:
     @classmethod
     def INPUT_TYPES(cls):
         return {
+            "hidden": EXECUTION_HIDDEN,
             "required": {
                 "inputcount": ("INT", {"default": 2, "min": 1, "max": 64, "step": 1, "tooltip": "Number of CLIP inputs to expose; click 'Update inputs' to add or remove inputs."}),
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If enabled, purges VRAM and unloads all models before switching. Use when swapping large models to avoid OOM."}),
             },
-            "optional": {
-                "clip_1": ("CLIP", {"tooltip": "CLIP input #1 (highest priority). Leave empty to bypass."}),
-                "clip_2": ("CLIP", {"tooltip": "CLIP input #2 (used if #1 is empty)."}),
-            }
+            "optional": DynamicInputs({
+                "clip_1": ("CLIP", {"lazy": True, "tooltip": "CLIP input #1 (highest priority). Leave empty to bypass."}),
+                "clip_2": ("CLIP", {"lazy": True, "tooltip": "CLIP input #2 (used if #1 is empty)."}),
+            }, "clip", ("CLIP", {"lazy": True, "tooltip": "Additional input (used if all lower-numbered inputs are empty)."})),
         }
 
     RETURN_TYPES = ("CLIP",)
@@ -26,26 +28,32 @@ class RvSwitch_Multi_CLIP:
     CATEGORY = CATEGORY.MAIN.value +  CATEGORY.MULTISWITCHES.value
     DESCRIPTION = "Multi-switch for CLIP inputs. Click 'Update inputs' (frontend) to add/remove clip_X inputs. The node returns the first connected/non-empty CLIP input."
 
+    @staticmethod
+    def _is_empty(v):
+        if v is None:
+            return True
+        if isinstance(v, (tuple, list)) and len(v) == 0:
+            return True
+        if isinstance(v, (tuple, list)) and all(x is None for x in v):
+            return True
+        if isinstance(v, dict) and len(v) == 0:
+            return True
+        return False
+
+    def check_lazy_status(self, inputcount, **kwargs):
+        # Only evaluate inputs up to and including the first non-empty one
+        names = [f"clip_{i}" for i in range(1, max(1, inputcount) + 1)]
+        return first_pending_input(self, names, kwargs, self._is_empty)
+
     def select(self, inputcount, **kwargs):
         Purge_VRAM = kwargs.pop("Purge_VRAM", False)
         if Purge_VRAM:
             purge_vram()
 
-        def _is_empty(v):
-            if v is None:
-                return True
-            if isinstance(v, (tuple, list)) and len(v) == 0:
-                return True
-            if isinstance(v, (tuple, list)) and all(x is None for x in v):
-                return True
-            if isinstance(v, dict) and len(v) == 0:
-                return True
-            return False
-
         for i in range(1, max(1, inputcount) + 1):
             key = f"clip_{i}"
             val = kwargs.get(key)
-            if not _is_empty(val):
+            if not self._is_empty(val):
                 return (val,)
 
         raise RuntimeError(
@@ -5,19 +5,21 @@
 
 from __future__ import annotations
 from ..core import CATEGORY, purge_vram
+from ..core.lazy import DynamicInputs, EXECUTION_HIDDEN, first_pending_input
 
 class RvSwitch_Multi_ControlNet:
     @classmethod
     def INPUT_TYPES(cls):
         return {
+            "hidden": EXECUTION_HIDDEN,
             "required": {
                 "inputcount": ("INT", {"default": 2, "min": 1, "max": 64, "step": 1, "tooltip": "Number of CONTROLNET inputs to expose; click 'Update inputs' to add or remove inputs."}),
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If enabled, purges VRAM before switching."}),
             },
-            "optional": {
-                "controlnet_1": ("CONTROL_NET", {"tooltip": "ControlNet input #1 (highest priority). Leave empty to bypass."}),
-                "controlnet_2": ("CONTROL_NET", {"tooltip": "ControlNet input #2 (used if #1 is empty)."}),
-            }
+            "optional": DynamicInputs({
+                "controlnet_1": ("CONTROL_NET", {"lazy": True, "tooltip": "ControlNet input #1 (highest priority). Leave empty to bypass."}),
+                "controlnet_2": ("CONTROL_NET", {"lazy": True, "tooltip": "ControlNet input #2 (used if #1 is empty)."}),
+            }, "controlnet", ("CONTROL_NET", {"lazy": True, "tooltip": "Additional input (used if all lower-numbered inputs are empty)."})),
         }
 
     RETURN_TYPES = ("CONTROL_NET",)
@@ -26,23 +28,29 @@ class RvSwitch_Multi_ControlNet:
     CATEGORY = CATEGORY.MAIN.value +  CATEGORY.MULTISWITCHES.value
     DESCRIPTION = "Multi-switch for CONTROL_NET inputs. Click 'Update inputs' (frontend) to add/remove controlnet_X inputs."
 
+    @staticmethod
+    def _is_empty(v):
+        if v is None:
+            return True
+        if isinstance(v, (tuple, list)) and len(v) == 0:
+            return True
+        if isinstance(v, dict) and len(v) == 0:
+            return True
+        return False
+
+    def check_lazy_status(self, inputcount, **kwargs):
+        # Only evaluate inputs up to and including the first non-empty one
+        names = [f"controlnet_{i}" for i in range(1, max(1, inputcount) + 1)]
+        return first_pending_input(self, names, kwargs, self._is_empty)
+
     def select(self, inputcount, Purge_VRAM=False, **kwargs):
         if Purge_VRAM:
             purge_vram()
 
-        def _is_empty(v):
-            if v is None:
-                return True
-            if isinstance(v, (tuple, list)) and len(v) == 0:
-                return True
-            if isinstance(v, dict) and len(v) == 0:
-                return True
-            return False
-
         for i in range(1, max(1, inputcount) + 1):
             key = f"controlnet_{i}"
             val = kwargs.get(key)
-            if not _is_empty(val):
+            if not self._is_empty(val):
                 return (val,)
 
         raise RuntimeError(f"RvSwitch_Multi_ControlNet: no controlnet found among controlnet_1..controlnet_{inputcount}.")
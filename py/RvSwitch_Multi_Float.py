@@ -4,6 +4,9 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 from ..core import CATEGORY, purge_vram
+from ..core.lazy import EXECUTION_HIDDEN, first_pending_input
+
+INPUT_NAMES = ("input1", "input2", "input3", "input4", "input5")
 
 class RvSwitch_Multi_Float:
     def __init__(self):
@@ -12,15 +15,16 @@ class RvSwitch_Multi_Float:
     @classmethod
     def INPUT_TYPES(cls):
         return {
+            "hidden": EXECUTION_HIDDEN,
             "required": {
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If enabled, purges VRAM and unloads all models before switching."}),
             },
             "optional": {
-                "input1": ("FLOAT", {"forceInput": True, "tooltip": "First input (highest priority)."}),
-                "input2": ("FLOAT", {"forceInput": True, "tooltip": "Second input (used if input1 is None)."}),
-                "input3": ("FLOAT", {"forceInput": True, "tooltip": "Third input (used if input1 and input2 are None)."}),
-                "input4": ("FLOAT", {"forceInput": True, "tooltip": "Fourth input (used if previous are None)."}),
-                "input5": ("FLOAT", {"forceInput": True, "tooltip": "Fifth input (used if previous are None)."}),
+                "input1": ("FLOAT", {"forceInput": True, "lazy": True, "tooltip": "First input (highest priority)."}),
+                "input2": ("FLOAT", {"forceInput": True, "lazy": True, "tooltip": "Second input (used if input1 is None)."}),
+                "input3": ("FLOAT", {"forceInput": True, "lazy": True, "tooltip": "Third input (used if input1 and input2 are None)."}),
+                "input4": ("FLOAT", {"forceInput": True, "lazy": True, "tooltip": "Fourth input (used if previous are None)."}),
+                "input5": ("FLOAT", {"forceInput": True, "lazy": True, "tooltip": "Fifth input (used if previous are None)."}),
             }
         }
 
@@ -30,7 +34,11 @@ class RvSwitch_Multi_Float:
 
     FUNCTION = "execute"
 
-    def execute(self, Purge_VRAM=False, input1=None, input2=None, input3=None, input4=None, input5=None):
+    def check_lazy_status(self, Purge_VRAM=False, **kwargs):
+        # Only evaluate inputs up to and including the first connected one
+        return first_pending_input(self, INPUT_NAMES, kwargs, lambda v: v is None)
+
+    def execute(self, Purge_VRAM=False, input1=None, input2=None, input3=None, input4=None, input5=None, **kwargs):
         # Passes through the first non-None FLOAT input from up to five inputs.
         # Handles None and empty input robustly.
         #
@@ -5,19 +5,21 @@
 
 from __future__ import annotations
 from ..core import CATEGORY, purge_vram
+from ..core.lazy import DynamicInputs, EXECUTION_HIDDEN, first_pending_input
 
 class RvSwitch_Multi_Image:
     @classmethod
     def INPUT_TYPES(cls):
         return {
+            "hidden": EXECUTION_HIDDEN,
             "required": {
                 "inputcount": ("INT", {"default": 2, "min": 1, "max": 64, "step": 1, "tooltip": "Number of IMAGE inputs to expose; click 'Update inputs' to add or remove inputs."}),
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If enabled, purges VRAM before switching."}),
             },
-            "optional": {
-                "image_1": ("IMAGE", {"tooltip": "IMAGE input #1 (highest priority). Leave empty to bypass."}),
-                "image_2": ("IMAGE", {"tooltip": "IMAGE input #2 (used if #1 is empty)."}),
-            }
+            "optional": DynamicInputs({
+                "image_1": ("IMAGE", {"lazy": True, "tooltip": "IMAGE input #1 (highest priority). Leave empty to bypass."}),
+                "image_2": ("IMAGE", {"lazy": True, "tooltip": "IMAGE input #2 (used if #1 is empty)."}),
+            }, "image", ("IMAGE", {"lazy": True, "tooltip": "Additional input (used if all lower-numbered inputs are empty)."})),
         }
 
     RETURN_TYPES = ("IMAGE",)
@@ -26,19 +28,25 @@ class RvSwitch_Multi_Image:
     CATEGORY = CATEGORY.MAIN.value +  CATEGORY.MULTISWITCHES.value
     DESCRIPTION = "Multi-switch for IMAGE inputs. Click 'Update inputs' (frontend) to add/remove image_X inputs."
 
+    @staticmethod
+    def _is_empty(v):
+        if v is None:
+            return True
+        return False
+
+    def check_lazy_status(self, inputcount, **kwargs):
+        # Only evaluate inputs up to and including the first non-empty one
+        names = [f"image_{i}" for i in range(1, max(1, inputcount) + 1)]
+        return first_pending_input(self, names, kwargs, self._is_empty)
+
     def select(self, inputcount, Purge_VRAM=False, **kwargs):
         if Purge_VRAM:
             purge_vram()
 
-        def _is_empty(v):
-            if v is None:
-                return True
-            return False
-
         for i in range(1, max(1, inputcount) + 1):
             key = f"image_{i}"
             val = kwargs.get(key)
-            if not _is_empty(val):
+            if not self._is_empty(val):
                 return (val,)
 
         raise RuntimeError(f"RvSwitch_Multi_Image: no image found among image_1..image_{inputcount}.")
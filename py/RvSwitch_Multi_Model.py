@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 from ..core import CATEGORY, purge_vram
+from ..core.lazy import DynamicInputs, EXECUTION_HIDDEN, first_pending_input
 
 class RvSwitch_Multi_Model:
     @classmethod
@@ -12,14 +13,15 @@ class RvSwitch_Multi_Model:
         # Only inputcount is required; model inputs are optional so validation doesn't fail
         # when some inputs are intentionally left empty or bypassed.
         return {
+            "hidden": EXECUTION_HIDDEN,
             "required": {
                 "inputcount": ("INT", {"default": 2, "min": 1, "max": 64, "step": 1, "tooltip": "Number of model inputs to expose; click 'Update inputs' to add or remove inputs."}),
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If enabled, purges VRAM and unloads all models before switching. Use when swapping large models to avoid OOM."}),
             },
-            "optional": {
-                "model_1": ("MODEL", {"tooltip": "Model input #1 (highest priority). Leave empty to bypass."}),
-                "model_2": ("MODEL", {"tooltip": "Model input #2 (used if #1 is empty)."}),
-            }
+            "optional": DynamicInputs({
+                "model_1": ("MODEL", {"lazy": True, "tooltip": "Model input #1 (highest priority). Leave empty to bypass."}),
+                "model_2": ("MODEL", {"lazy": True, "tooltip": "Model input #2 (used if #1 is empty)."}),
+            }, "model", ("MODEL", {"lazy": True, "tooltip": "Additional input (used if all lower-numbered inputs are empty)."})),
         }
 
     RETURN_TYPES = ("MODEL",)
@@ -29,30 +31,36 @@ class RvSwitch_Multi_Model:
     DESCRIPTION = "Multi-switch for MODEL inputs. Click 'Update inputs' (frontend) to add/remove model_X inputs. The node returns the first connected/non-None model in numeric order."
 
 
-    def select(self, inputcount, Purge_VRAM=False, **kwargs):
-        # Helper to detect empty/bypassed values commonly produced by ComfyUI flows
-        def _is_empty(v):
-            # None is empty
-            if v is None:
-                return True
-            # Empty tuple/list is empty
-            if isinstance(v, (tuple, list)) and len(v) == 0:
-                return True
-            # Tuple/list of only Nones is empty
-            if isinstance(v, (tuple, list)) and all(x is None for x in v):
-                return True
-            # Empty dict-like
-            if isinstance(v, dict) and len(v) == 0:
-                return True
-            # Empty or whitespace-only string
-            if isinstance(v, str) and v.strip() == "":
-                return True
-            # If it's a container where all elements are falsy, treat as empty
-            if isinstance(v, (tuple, list, set)) and all(not bool(x) for x in v):
-                return True
-            # Otherwise consider it non-empty
-            return False
+    # Helper to detect empty/bypassed values commonly produced by ComfyUI flows
+    @staticmethod
+    def _is_empty(v):
+        # None is empty
+        if v is None:
+            return True
+        # Empty tuple/list is empty
+        if isinstance(v, (tuple, list)) and len(v) == 0:
+            return True
+        # Tuple/list of only Nones is empty
+        if isinstance(v, (tuple, list)) and all(x is None for x in v):
+            return True
+        # Empty dict-like
+        if isinstance(v, dict) and len(v) == 0:
+            return True
+        # Empty or whitespace-only string
+        if isinstance(v, str) and v.strip() == "":
+            return True
+        # If it's a container where all elements are falsy, treat as empty
+        if isinstance(v, (tuple, list, set)) and all(not bool(x) for x in v):
+            return True
+        # Otherwise consider it non-empty
+        return False
+
+    def check_lazy_status(self, inputcount, **kwargs):
+        # Only evaluate inputs up to and including the first non-empty one
+        names = [f"model_{i}" for i in range(1, max(1, inputcount) + 1)]
+        return first_pending_input(self, names, kwargs, self._is_empty)
 
+    def select(self, inputcount, Purge_VRAM=False, **kwargs):
         # Optionally purge VRAM before switching
         if Purge_VRAM:
             purge_vram()
@@ -61,7 +69,7 @@ class RvSwitch_Multi_Model:
         for i in range(1, max(1, inputcount) + 1):
             key = f"model_{i}"
             val = kwargs.get(key)
-            if not _is_empty(val):
+            if not self._is_empty(val):
                 return (val,)
 
         # Nothing provided — raise a clear error so the user can fix the workflow
@@ -4,7 +4,8 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 from ..core import CATEGORY, cstr, purge_vram
-from typing import Any, Dict, Tuple
+from ..core.lazy import pending_input
+from typing import Any, Dict, List, Tuple
 
 class RvSwitch_Pipe:
     CATEGORY = CATEGORY.MAIN.value + CATEGORY.SWITCHES.value
@@ -19,11 +20,15 @@ class RvSwitch_Pipe:
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If True, purges VRAM before switching."}),
             },
             "optional": {
-                "pipe1": ("pipe", {"tooltip": "First pipe input."}),
-                "pipe2": ("pipe", {"tooltip": "Second pipe input."}),
+                "pipe1": ("pipe", {"lazy": True, "tooltip": "First pipe input."}),
+                "pipe2": ("pipe", {"lazy": True, "tooltip": "Second pipe input."}),
             }
         }
 
+    def check_lazy_status(self, Input: int, Purge_VRAM: bool = False, **kwargs) -> List[str]:
+        # Only the selected input is evaluated; the other branch never runs
+        return pending_input("pipe1" if Input == 1 else "pipe2", kwargs)
+
     def execute(self, Input: int, Purge_VRAM: bool, pipe1: Any = None, pipe2: Any = None) -> Tuple[Any]:
         if Purge_VRAM:
             purge_vram()
@@ -5,8 +5,9 @@
 
 import comfy
 from ..core import CATEGORY, cstr, purge_vram
+from ..core.lazy import pending_input
 from ..core import AnyType
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 any = AnyType("*")
 
@@ -24,11 +25,15 @@ class RvSwitch_Sampler:
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If True, purges VRAM before switching."}),
             },
             "optional": {
-                "input1": (any, {"default": [], "forceInput": True, "tooltip": "First sampler input."}),
-                "input2": (any, {"default": [], "forceInput": True, "tooltip": "Second sampler input."}),
+                "input1": (any, {"default": [], "forceInput": True, "lazy": True, "tooltip": "First sampler input."}),
+                "input2": (any, {"default": [], "forceInput": True, "lazy": True, "tooltip": "Second sampler input."}),
             }
         }
 
+    def check_lazy_status(self, Input: int, Purge_VRAM: bool = False, **kwargs) -> List[str]:
+        # Only the selected input is evaluated; the other branch never runs
+        return pending_input("input1" if Input == 1 else "input2", kwargs)
+
     def execute(self, Input: int, Purge_VRAM: bool, input1: Any = None, input2: Any = None) -> Tuple[Any]:
         if Purge_VRAM:
             purge_vram()    
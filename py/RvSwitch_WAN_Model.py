@@ -4,7 +4,8 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 from ..core import CATEGORY, cstr, purge_vram
-from typing import Any, Dict, Tuple
+from ..core.lazy import pending_input
+from typing import Any, Dict, List, Tuple
 
 class RvSwitch_WAN_Model:
 
@@ -16,8 +17,8 @@ class RvSwitch_WAN_Model:
                 "Purge_VRAM": ("BOOLEAN", {"default": False, "tooltip": "If True, purges VRAM before switching."}),
             },
             "optional": {
-                "input1": ("WANVIDEOMODEL", {"forceInput": True, "tooltip": "First WANVIDEOMODEL input."}),
-                "input2": ("WANVIDEOMODEL", {"forceInput": True, "tooltip": "Second WANVIDEOMODEL input."}),
+                "input1": ("WANVIDEOMODEL", {"forceInput": True, "lazy": True, "tooltip": "First WANVIDEOMODEL input."}),
+                "input2": ("WANVIDEOMODEL", {"forceInput": True, "lazy": True, "tooltip": "Second WANVIDEOMODEL input."}),
             }
         }
 
@@ -26,6 +27,10 @@ class RvSwitch_WAN_Model:
     RETURN_NAMES = ("model",)
     FUNCTION = "execute"
 
+    def check_lazy_status(self, Input: int, Purge_VRAM: bool = False, **kwargs) -> List[str]:
+        # Only the selected input is evaluated; the other branch never runs
+        return pending_input("input1" if Input == 1 else "input2", kwargs)
+
     def execute(self, Input: int, Purge_VRAM: bool, input1: Any = None, input2: Any = None) -> Tuple[Any]:
         if Purge_VRAM:
             purge_vram()
@@ -4,11 +4,10 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 import os
-import cv2
-import numpy as np
 import torch
-from PIL import Image
 from ..core import CATEGORY, cstr
+from ..core.fingerprint import files_fingerprint
+from ..core.video import FrameSegment, load_segments, load_video_frames
 
 FPS = float(30.0)
 
@@ -28,57 +27,33 @@ class RvVideo_CombineVideoClips:
             "optional": {
                 "video_filelist": ("STRING", {"default": "", "multiline": False, "display": "text", "tooltip": "Comma-separated list of video file paths."}),
                 "joined_filelist": ("STRING", {"default": "", "multiline": False, "display": "text", "tooltip": "Comma-separated list of join file paths."}),
+                "decode_workers": ("INT", {"default": 1, "min": 1, "max": 32, "step": 1, "tooltip": "Number of clips decoded in parallel. Output order is unchanged."}),
             }
         }
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):
-        return float("NaN")
+        # Re-run only when one of the listed clips changes on disk
+        paths = []
+        for filelist in (kwargs.get("video_filelist"), kwargs.get("joined_filelist"),):
+            if filelist not in (None, '', 'undefined', 'none'):
+                paths.extend(str(p).strip() for p in filelist.split(', '))
+        return files_fingerprint(paths)
 
     @classmethod
     def VALIDATE_INPUTS(cls, **kwargs):
         return True
 
-    def load_video_frames(self, video_path: str, max_frames: int = None) -> list[np.ndarray]:
-        if not os.path.exists(video_path):
-            raise ValueError(f"Video file not found: {video_path}")
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            cap.release()
-            raise ValueError(f"Could not open video file: {video_path}")
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        cstr(f"Video {video_path}: {total_frames} frames, {fps} fps").msg.print()
-        frames = []
-        frame_count = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames.append(frame_rgb)
-            frame_count += 1
-            if max_frames and frame_count >= max_frames:
-                break
-        cap.release()
-        if not frames:
-            raise ValueError(f"No frames could be loaded from video: {video_path}")
-        cstr(f"Successfully loaded {len(frames)} frames from {video_path}").msg.print()
-        return frames
-
-    def frames_to_tensor(self, frames_list: list[np.ndarray]) -> torch.Tensor:
-        if not frames_list:
-            raise ValueError("Empty frames list provided")
-        tensor_frames = [(frame.astype(np.float32) / 255.0) for frame in frames_list]
-        tensor_output = torch.from_numpy(np.stack(tensor_frames, axis=0))
-        return tensor_output
+    def load_video_frames(self, video_path: str, max_frames: int = None) -> torch.Tensor:
+        return load_video_frames(video_path, max_frames)
 
     def combine_videos(
         self,
         frame_load_cap: int,
         simple_combine: bool,
         video_filelist: str = None,
-        joined_filelist: str = None
+        joined_filelist: str = None,
+        decode_workers: int = 1
     ) -> tuple[torch.Tensor, float]:
         videos = None
         joined = None
@@ -87,89 +62,56 @@ class RvVideo_CombineVideoClips:
         if joined_filelist not in (None, '', 'undefined', 'none'):
             joined = joined_filelist.split(', ')
 
-        output_images_list: list[np.ndarray] = []
-        video_1_start_idx = 0
-        video_1_end_idx = 0
+        # Plan which frame ranges of which clips end up in the output, then
+        # decode them straight into one preallocated tensor.
+        segments: list[FrameSegment] = []
+
+        def add_video_1(video_1: str, start_idx: int, end_idx: int):
+            cstr(f"Adding Frames video_1 [{start_idx}:{end_idx}]").msg.print()
+            segments.append(FrameSegment(video_1, start_idx, end_idx - start_idx))
 
         if videos and not simple_combine:
             last_was_join = False
             for i in range(len(videos)):
-                video_1_list = []
-                video_join_list = []
-                video_1_exists = False
-                join_exists = False
                 video_1 = str(videos[i]).strip()
                 video_1_exists = os.path.exists(video_1)
+                video_join = str(joined[i]).strip() if joined else ''
+                join_exists = bool(video_join) and os.path.exists(video_join)
                 if last_was_join:
-                    if joined:
-                        video_join = str(joined[i]).strip()
-                    join_exists = os.path.exists(video_join)
                     if join_exists:
-                        video_join_list.extend(self.load_video_frames(video_join))
-                        if video_join_list:
-                            output_images_list.extend(video_join_list)
+                        cstr(f"Adding Frames video_join: {video_join}").msg.print()
+                        segments.append(FrameSegment(video_join))
                     else:
                         last_was_join = False
                         if video_1_exists:
-                            video_1_list = self.load_video_frames(video_1, frame_load_cap)
-                        if video_1_list:
-                            video_1_start_idx = frame_load_cap // 2
-                            video_1_start_idx = min(video_1_start_idx, len(video_1_list))
-                            video_1_end_idx = frame_load_cap
-                            video_1_end_idx = min(video_1_end_idx, len(video_1_list))
-                            cstr(f"Adding Frames video_1 [{video_1_start_idx}:{video_1_end_idx}]").msg.print()
-                            for idx in range(video_1_start_idx, video_1_end_idx):
-                                if idx < len(video_1_list):
-                                    output_images_list.append(video_1_list[idx])
+                            add_video_1(video_1, frame_load_cap // 2, frame_load_cap)
                 else:
-                    if video_1_exists:
-                        video_1_list = self.load_video_frames(video_1, frame_load_cap)
-                    if joined:
-                        video_join = str(joined[i]).strip()
-                    join_exists = os.path.exists(video_join)
                     if join_exists:
-                        video_join_list.extend(self.load_video_frames(video_join))
-                        if video_1_list:
-                            video_1_start_idx = 0
-                            video_1_end_idx = frame_load_cap // 2
-                            video_1_end_idx = min(video_1_end_idx, len(video_1_list))
-                            cstr(f"Adding Frames video_1 [{video_1_start_idx}:{video_1_end_idx}]").msg.print()
-                            for idx in range(video_1_start_idx, video_1_end_idx):
-                                if idx < len(video_1_list):
-                                    output_images_list.append(video_1_list[idx])
-                        if video_join_list:
-                            cstr(f"Adding Frames video_join: {len(video_join_list)}").msg.print()
-                            output_images_list.extend(video_join_list)
-                            last_was_join = True
-                    else:
-                        if video_1_list:
-                            video_1_start_idx = 0
-                            video_1_end_idx = frame_load_cap
-                            video_1_end_idx = min(video_1_end_idx, len(video_1_list))
-                            cstr(f"Adding Frames video_1 [{video_1_start_idx}:{video_1_end_idx}]").msg.print()
-                            for idx in range(video_1_start_idx, video_1_end_idx):
-                                if idx < len(video_1_list):
-                                    output_images_list.append(video_1_list[idx])
+                        if video_1_exists:
+                            add_video_1(video_1, 0, frame_load_cap // 2)
+                        cstr(f"Adding Frames video_join: {video_join}").msg.print()
+                        segments.append(FrameSegment(video_join))
+                        last_was_join = True
+                    elif video_1_exists:
+                        add_video_1(video_1, 0, frame_load_cap)
         elif videos and simple_combine:
             for i in range(len(videos)):
                 video = str(videos[i]).strip()
                 if os.path.exists(video):
-                    try:
-                        output_images_list.extend(self.load_video_frames(video))
-                    except Exception as e:
-                        cstr(f"Error loading video frames: {str(e)}").error.print()
-                        raise ValueError(f"Error loading video frames: {str(e)}")
-        if not output_images_list:
+                    segments.append(FrameSegment(video))
+        if not segments:
             raise ValueError("No output images generated")
-        cstr(f"Generated {len(output_images_list)} total output images").msg.print()
         try:
-            image_tensor = self.frames_to_tensor(output_images_list)
-            cstr(f"Image tensor shape: {image_tensor.shape}").msg.print()
-            cstr(f"Video combination completed successfully").msg.print()
-            return (image_tensor, FPS)
+            image_tensor = load_segments(segments, decode_workers)
         except Exception as e:
-            cstr(f"Error creating tensor: {str(e)}").msg.print()
-            raise ValueError(f"Error creating output tensor: {str(e)}")
+            cstr(f"Error loading video frames: {str(e)}").error.print()
+            raise ValueError(f"Error loading video frames: {str(e)}")
+        if image_tensor.shape[0] == 0:
+            raise ValueError("No output images generated")
+        cstr(f"Generated {image_tensor.shape[0]} total output images").msg.print()
+        cstr(f"Image tensor shape: {image_tensor.shape}").msg.print()
+        cstr(f"Video combination completed successfully").msg.print()
+        return (image_tensor, FPS)
 
 NODE_NAME = 'Combine Video Clips [RvTools-X]'
 NODE_DESC = 'Combine Video Clips'
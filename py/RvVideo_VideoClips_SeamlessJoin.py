@@ -4,15 +4,14 @@
 # See LICENSE file or <https://www.gnu.org/licenses/> for details.
 
 import os
-import cv2
-import numpy as np
 import torch
-from PIL import Image
-import folder_paths
 
 from ..core import CATEGORY, cstr
+from ..core.fingerprint import files_fingerprint
+from ..core.video import FrameSegment, load_segments, load_video_frames
 
 FPS = float(30.0)
+GREY = 0x7F / 255.0  # transition frame color, #7F7F7F
 
 class RvVideo_SeamlessJoinVideoClips:
     CATEGORY = CATEGORY.MAIN.value + CATEGORY.VIDEO.value
@@ -39,52 +38,18 @@ class RvVideo_SeamlessJoinVideoClips:
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):
-        return float("NaN")
+        # Re-run only when one of the listed clips changes on disk
+        filelist = kwargs.get("video_filelist")
+        if filelist in (None, '', 'undefined', 'none'):
+            return ""
+        return files_fingerprint(str(p).strip() for p in filelist.split(', '))
 
     @classmethod
     def VALIDATE_INPUTS(cls, **kwargs):
         return True
 
-    def load_video_frames(self, video_path: str, max_frames: int = None) -> list[np.ndarray]:
-        if not os.path.exists(video_path):
-            raise ValueError(f"Video file not found: {video_path}")
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            cap.release()
-            raise ValueError(f"Could not open video file: {video_path}")
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        cstr(f"Video {video_path}: {total_frames} frames, {fps} fps").msg.print()
-        frames = []
-        frame_count = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames.append(frame_rgb)
-            frame_count += 1
-            if max_frames and frame_count >= max_frames:
-                break
-        cap.release()
-        if not frames:
-            raise ValueError(f"No frames could be loaded from video: {video_path}")
-        cstr(f"Successfully loaded {len(frames)} frames from {video_path}").msg.print()
-        return frames
-
-    def create_solid_color_image(self, reference_frame: np.ndarray, color_hex: str) -> np.ndarray:
-        height, width = reference_frame.shape[:2]
-        color_hex = color_hex.lstrip('#')
-        r, g, b = tuple(int(color_hex[i:i+2], 16) for i in (0, 2, 4))
-        solid_image = np.full((height, width, 3), [r, g, b], dtype=np.uint8)
-        return solid_image
-
-    def frames_to_tensor(self, frames_list: list[np.ndarray]) -> torch.Tensor:
-        if not frames_list:
-            raise ValueError("Empty frames list provided")
-        tensor_frames = [(frame.astype(np.float32) / 255.0) for frame in frames_list]
-        tensor_output = torch.from_numpy(np.stack(tensor_frames, axis=0))
-        return tensor_output
+    def load_video_frames(self, video_path: str, max_frames: int = None) -> torch.Tensor:
+        return load_video_frames(video_path, max_frames)
 
     def process_videos(
         self,
@@ -110,69 +75,41 @@ class RvVideo_SeamlessJoinVideoClips:
             if not os.path.exists(video_second):
                 raise ValueError(f"Last video file not found: {video_second}")
             cstr(f"Both video files found, loading frames...").msg.print()
-            try:
-                first_images_list = self.load_video_frames(video_first, frame_load_cap * 2)
-                second_images_list = self.load_video_frames(video_second, frame_load_cap * 2)
-                cstr(f"Loaded {len(first_images_list)} frames from first video").msg.print()
-                cstr(f"Loaded {len(second_images_list)} frames from second video").msg.print()
-            except Exception as e:
-                cstr(f"Error loading video frames: {str(e)}").error.print()
-                raise ValueError(f"Error loading video frames: {str(e)}")
-            if not first_images_list or not second_images_list:
-                raise ValueError("Could not load frames from one or both videos")
-            reference_frame = first_images_list[0]
-            output_images_list: list[np.ndarray] = []
+
+            # Tail of the first clip, grey transition frames, head of the second clip
             first_images_start_index = frame_load_cap // 2
             first_images_end_index = frame_load_cap - mask_last_frames
-            first_images_start_index = max(0, min(first_images_start_index, len(first_images_list)))
-            first_images_end_index = max(first_images_start_index, min(first_images_end_index, len(first_images_list)))
-            for idx in range(first_images_start_index, first_images_end_index):
-                if idx < len(first_images_list):
-                    output_images_list.append(first_images_list[idx])
-            total_mask_count = mask_last_frames + mask_first_frames
-            grey_image = self.create_solid_color_image(reference_frame, "#7F7F7F")
-            for _ in range(total_mask_count):
-                output_images_list.append(grey_image.copy())
             second_images_start_index = mask_first_frames
             second_images_end_index = frame_load_cap // 2
-            second_images_start_index = max(0, min(second_images_start_index, len(second_images_list)))
-            second_images_end_index = max(second_images_start_index, min(second_images_end_index, len(second_images_list)))
-            for idx in range(second_images_start_index, second_images_end_index):
-                if idx < len(second_images_list):
-                    output_images_list.append(second_images_list[idx])
-            output_mask_list: list[np.ndarray] = []
-            first_mask_start_index = frame_load_cap // 2
-            first_mask_end_index = frame_load_cap - mask_last_frames
-            black_image = self.create_solid_color_image(reference_frame, "#000000")
-            white_image = self.create_solid_color_image(reference_frame, "#FFFFFF")
-            first_mask_count = first_mask_end_index - first_mask_start_index
-            first_mask_count = max(0, first_mask_count)
-            for _ in range(first_mask_count):
-                output_mask_list.append(black_image.copy())
-            for _ in range(total_mask_count):
-                output_mask_list.append(white_image.copy())
-            second_mask_start_index = mask_first_frames
-            second_mask_end_index = frame_load_cap // 2
-            second_mask_count = second_mask_end_index - second_mask_start_index
-            second_mask_count = max(0, second_mask_count)
-            for _ in range(second_mask_count):
-                output_mask_list.append(black_image.copy())
-            if not output_images_list:
-                raise ValueError("No output images generated")
-            if not output_mask_list:
-                raise ValueError("No output masks generated")
-            cstr(f"[WanVideo] Generated {len(output_images_list)} output images").msg.print()
-            cstr(f"[WanVideo] Generated {len(output_mask_list)} output masks").msg.print()
+            total_mask_count = mask_last_frames + mask_first_frames
+            segments = [
+                FrameSegment(video_first, first_images_start_index, first_images_end_index - first_images_start_index),
+                FrameSegment(None, count=total_mask_count, fill=GREY),
+                FrameSegment(video_second, second_images_start_index, second_images_end_index - second_images_start_index),
+            ]
             try:
-                image_tensor = self.frames_to_tensor(output_images_list)
-                mask_tensor = self.frames_to_tensor(output_mask_list)
-                cstr(f"[WanVideo] Image tensor shape: {image_tensor.shape}").msg.print()
-                cstr(f"[WanVideo] Mask tensor shape: {mask_tensor.shape}").msg.print()
-                cstr(f"[WanVideo] Processing completed successfully").msg.print()
-                return (image_tensor, mask_tensor)
+                image_tensor = load_segments(segments)
             except Exception as e:
-                cstr(f"[WanVideo] Error creating tensors: {str(e)}").error.print()
-                raise ValueError(f"Error creating output tensors: {str(e)}")
+                cstr(f"Error loading video frames: {str(e)}").error.print()
+                raise ValueError(f"Error loading video frames: {str(e)}")
+
+            # Mask: black where frames are kept, white over the transition
+            first_mask_count = max(0, first_images_end_index - first_images_start_index)
+            second_mask_count = max(0, second_images_end_index - second_images_start_index)
+            height, width = image_tensor.shape[1], image_tensor.shape[2]
+            mask_tensor = torch.zeros((first_mask_count + total_mask_count + second_mask_count, height, width, 3), dtype=torch.float32)
+            mask_tensor[first_mask_count:first_mask_count + total_mask_count] = 1.0
+
+            if image_tensor.shape[0] == 0:
+                raise ValueError("No output images generated")
+            if mask_tensor.shape[0] == 0:
+                raise ValueError("No output masks generated")
+            cstr(f"[WanVideo] Generated {image_tensor.shape[0]} output images").msg.print()
+            cstr(f"[WanVideo] Generated {mask_tensor.shape[0]} output masks").msg.print()
+            cstr(f"[WanVideo] Image tensor shape: {image_tensor.shape}").msg.print()
+            cstr(f"[WanVideo] Mask tensor shape: {mask_tensor.shape}").msg.print()
+            cstr(f"[WanVideo] Processing completed successfully").msg.print()
+            return (image_tensor, mask_tensor)
 
 NODE_NAME = 'Seamless Join Video Clips [RvTools-X]'
 NODE_DESC = 'Seamless Join Video Clips'
@@ -0,0 +1,36 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import importlib
+import sys
+import types
+
+from pathlib import Path
+
+import pytest
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "core"
+
+
+def _load_core(name: str):
+    # Import core/<name>.py as rvtools_core.<name> without running
+    # core/__init__.py, so helpers that don't need ComfyUI can be tested on
+    # their own. Modules that import comfy still need it installed.
+    if "rvtools_core" not in sys.modules:
+        package = types.ModuleType("rvtools_core")
+        package.__path__ = [str(CORE_DIR)]
+        sys.modules["rvtools_core"] = package
+    module = importlib.import_module(f"rvtools_core.{name}")
+    common = sys.modules.get("rvtools_core.common")
+    if common is not None and not hasattr(common.cstr.color, "DEBUG"):
+        # Log prefixes normally registered by the package __init__.py
+        for code in ("msg", "warning", "debug", "error"):
+            common.cstr.color.add_code(code, f"RvTools-X {code}: ")
+    return module
+
+
+@pytest.fixture(scope="session")
+def load_core():
+    return _load_core
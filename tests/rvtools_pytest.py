@@ -0,0 +1,21 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+from pathlib import Path
+
+import pytest
+
+# pytest plugin (enabled in pyproject.toml). The repository root is the
+# ComfyUI custom node package and its __init__.py registers every node, which
+# needs a running ComfyUI, so the root is collected as a plain directory
+# instead of being imported as a package.
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def pytest_collect_directory(path, parent):
+    if path == ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,71 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import pytest
+
+NAMES = ("input1", "input2", "input3")
+
+
+@pytest.fixture
+def lazy(load_core):
+    return load_core("lazy")
+
+
+class Switch:
+    def __init__(self, lazy):
+        self.lazy = lazy
+
+    def check_lazy_status(self, **kwargs):
+        return self.lazy.first_pending_input(self, NAMES, kwargs, lambda v: v is None)
+
+
+def test_stops_at_first_value(lazy):
+    node = Switch(lazy)
+    assert node.check_lazy_status(input1=None, input2=None) == ["input1"]
+    assert node.check_lazy_status(input1="a", input2=None) == []
+
+
+def test_falls_through_input_that_evaluated_to_none(lazy):
+    node = Switch(lazy)
+    # First pass: nothing evaluated yet
+    assert node.check_lazy_status(input1=None, input2=None, input3=None) == ["input1"]
+    # Second pass: input1 was evaluated and returned None
+    assert node.check_lazy_status(input1=None, input2=None, input3=None) == ["input2"]
+    assert node.check_lazy_status(input1=None, input2="b", input3=None) == []
+
+
+def test_all_none_finishes_and_resets(lazy):
+    node = Switch(lazy)
+    assert node.check_lazy_status(input1=None, input3=None) == ["input1"]
+    assert node.check_lazy_status(input1=None, input3=None) == ["input3"]
+    assert node.check_lazy_status(input1=None, input3=None) == []
+    # Next run starts from the top again
+    assert node.check_lazy_status(input1=None, input3=None) == ["input1"]
+
+
+def test_interrupted_run_does_not_leak_into_next_prompt(lazy):
+    node = Switch(lazy)
+    first, second = {}, {}
+    assert node.check_lazy_status(prompt=first, input1=None, input2=None) == ["input1"]
+    # The first prompt was cancelled before input1 came back; a new prompt
+    # must request input1 again instead of skipping it
+    assert node.check_lazy_status(prompt=second, input1=None, input2=None) == ["input1"]
+    assert node.check_lazy_status(prompt=second, input1="a", input2=None) == []
+
+
+def test_empty_values_fall_through(lazy):
+    node = Switch(lazy)
+    is_empty = lambda v: v is None or v == ""
+    assert lazy.first_pending_input(node, NAMES, {"input1": "", "input2": None}, is_empty) == ["input2"]
+
+
+def test_pending_input_skips_unconnected(lazy):
+    assert lazy.pending_input("input1", {}) == []
+    assert lazy.pending_input("input1", {"input2": None}) == []
+
+
+def test_pending_input_requests_connected_unevaluated(lazy):
+    assert lazy.pending_input("input1", {"input1": None}) == ["input1"]
+    assert lazy.pending_input("input1", {"input1": "value"}) == []
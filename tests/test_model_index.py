@@ -0,0 +1,45 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import os
+
+import pytest
+
+folder_paths = pytest.importorskip("folder_paths")
+
+
+@pytest.fixture
+def model_index(load_core, monkeypatch, tmp_path):
+    module = load_core("model_index")
+    root = tmp_path / "checkpoints"
+    (root / "empty" / "nested").mkdir(parents=True)
+    (root / "sd15").mkdir()
+    (root / "sd15" / "a.safetensors").touch()
+
+    def get_filename_list(folder_type):
+        return sorted(
+            os.path.relpath(os.path.join(d, f), root).replace(os.sep, "/")
+            for d, _, files in os.walk(root) for f in files
+        )
+
+    monkeypatch.setattr(folder_paths, "get_folder_paths", lambda folder_type: [str(root)])
+    monkeypatch.setattr(folder_paths, "get_filename_list", get_filename_list)
+    monkeypatch.setattr(module, "VALIDATE_INTERVAL", 0.0)
+    return module.ModelFileIndex(), root
+
+
+def test_file_added_to_empty_subfolder_is_listed(model_index):
+    index, root = model_index
+    assert index.filenames("checkpoints") == ["sd15/a.safetensors"]
+    (root / "empty" / "nested" / "b.safetensors").touch()
+    assert "empty/nested/b.safetensors" in index.filenames("checkpoints")
+
+
+def test_file_added_to_new_subfolder_is_listed(model_index):
+    index, root = model_index
+    index.filenames("checkpoints")
+    (root / "sd15" / "new").mkdir()
+    (root / "sd15" / "new" / "c.safetensors").touch()
+    assert "sd15/new/c.safetensors" in index.filenames("checkpoints")
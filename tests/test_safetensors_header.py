@@ -0,0 +1,91 @@
+# License: GNU General Public License v3.0
+#
+# This file is part of ComfyUI-RvTools-X and is licensed under the GNU General Public License v3.0.
+# See LICENSE file or <https://www.gnu.org/licenses/> for details.
+
+import json
+import struct
+
+import pytest
+
+pytest.importorskip("comfy")
+
+
+@pytest.fixture
+def sth(load_core):
+    return load_core("safetensors_header")
+
+
+def write_safetensors(path, tensors):
+    # Header-only file: {name: shape}, each tensor 2 bytes of data
+    header, offset = {}, 0
+    for name, shape in tensors.items():
+        header[name] = {"dtype": "F16", "shape": shape, "data_offsets": [offset, offset + 2]}
+        offset += 2
+    raw = json.dumps(header).encode()
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(raw)) + raw + b"\0" * offset)
+    return str(path)
+
+
+SD_VAE = {"decoder.conv_in.weight": [512, 4, 3, 3]}
+FLUX_VAE = {"decoder.conv_in.weight": [512, 16, 3, 3]}
+WIDE_VAE = {"decoder.conv_in.weight": [512, 32, 3, 3]}
+
+
+def test_unknown_all_in_one_checkpoint_with_baked_vae(sth, tmp_path):
+    # LTXV style: unknown model family plus a baked causal-conv VAE
+    ckpt = write_safetensors(tmp_path / "ltxv.safetensors", {
+        "model.diffusion_model.transformer_blocks.0.attn1.to_q.weight": [2048, 2048],
+        "vae.decoder.conv_in.conv.weight": [1024, 128, 3, 3, 3],
+    })
+    assert ckpt in sth.preflight(checkpoint=ckpt)
+
+
+def test_unknown_all_in_one_checkpoint_with_llm_text_encoder(sth, tmp_path):
+    # Lumina2 style: unknown model family, gemma text encoder and VAE
+    ckpt = write_safetensors(tmp_path / "lumina2.safetensors", {
+        "model.diffusion_model.layers.0.attention.qkv.weight": [6912, 2304],
+        "text_encoders.gemma2_2b.transformer.model.layers.0.self_attn.q_proj.weight": [2048, 2304],
+        "vae.decoder.conv_in.weight": [512, 16, 3, 3],
+    })
+    assert ckpt in sth.preflight(checkpoint=ckpt)
+
+
+def test_flux_keyed_model_with_other_vae(sth, tmp_path):
+    unet = write_safetensors(tmp_path / "flux_like.safetensors", {"double_blocks.0.img_attn.qkv.weight": [9216, 3072]})
+    vae = write_safetensors(tmp_path / "vae32.safetensors", WIDE_VAE)
+    assert set(sth.preflight(unet=unet, vae=vae)) == {unet, vae}
+
+
+def test_rejects_vae_selected_as_checkpoint(sth, tmp_path):
+    vae = write_safetensors(tmp_path / "vae.safetensors", SD_VAE)
+    with pytest.raises(ValueError, match="is a VAE, not a diffusion model"):
+        sth.preflight(checkpoint=vae)
+
+
+def test_rejects_lora_selected_as_checkpoint(sth, tmp_path):
+    lora = write_safetensors(tmp_path / "lora.safetensors", {
+        "diffusion_model.double_blocks.0.img_attn.qkv.lora_A.weight": [16, 3072],
+        "diffusion_model.double_blocks.0.img_attn.qkv.lora_B.weight": [9216, 16],
+    })
+    with pytest.raises(ValueError, match="is a LoRA"):
+        sth.preflight(checkpoint=lora)
+
+
+def test_rejects_vae_channel_mismatch_for_fixed_family(sth, tmp_path):
+    ckpt = write_safetensors(tmp_path / "sdxl.safetensors", {
+        "model.diffusion_model.input_blocks.0.0.weight": [320, 4, 3, 3],
+        "model.diffusion_model.label_emb.0.0.weight": [1280, 2816],
+    })
+    vae = write_safetensors(tmp_path / "flux_vae.safetensors", FLUX_VAE)
+    with pytest.raises(ValueError, match="16 latent channels"):
+        sth.preflight(checkpoint=ckpt, vae=vae)
+
+
+def test_rejects_truncated_file(sth, tmp_path):
+    path = write_safetensors(tmp_path / "cut.safetensors", SD_VAE)
+    with open(path, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 1)
+    with pytest.raises(ValueError, match="truncated"):
+        sth.preflight(vae=path)